@@ -0,0 +1,248 @@
+import json
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Iterable, Set
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+from db.changes import COMPANIES, INVESTORS, BIDS, APPROVALS, RESULTS
+from db.async_session import run_in_session
+from db.concurrency import CONFLICT_MESSAGE
+from logic.async_game_coordinator import AsyncGameCoordinator
+from services.game_service import GameService
+from logic.status_manager import StatusManager
+from utils.read_cache import VersionedCache
+from .versions import DataVersions, ALL_CHANNELS
+from config import Config
+
+status_manager = StatusManager()
+game_service = GameService()
+
+versions = DataVersions(Config.api.version_poll_interval)
+
+# Rendered bodies keyed by path and ETag, so many clients polling after one change cost one load
+response_cache = VersionedCache(Config.cache.read_cache_size)
+
+# Numeric payload fields and the JSON types they accept; JSON true/false would pass as int, so bool is refused
+NUMBER_FIELDS = {
+    "price": (int, float),
+    "shares": int,
+    "version": int,
+    "investor_id": int,
+    "company_id": int,
+}
+
+# Games are never deleted, so each id that exists is looked up once per process
+known_games: Set[int] = set()
+
+@lru_cache(maxsize=1024)
+def game_services(game_id: int) -> AsyncGameCoordinator:
+    """The async coordinator for a game; it also carries that game's company, investor and approval services."""
+    return AsyncGameCoordinator(game_id)
+
+async def conditional_get(request: Request, channels: Iterable[str],
+                          load: Callable[[AsyncGameCoordinator], Awaitable[object]],
+                          not_found: str = "Not found") -> Response:
+    game_id = await _require_game(request)
+    etag = versions.etag(game_id, channels)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    
+    if etag in _if_none_match(request):
+        return Response(status_code=304, headers=headers)
+    
+    body = response_cache.get(request.url.path, etag)
+    if body is None:
+        result = await load(game_services(game_id))
+        if result is None:
+            raise HTTPException(404, not_found)
+        body = json.dumps(result).encode()
+        response_cache.put(request.url.path, etag, body)
+    
+    return Response(body, media_type="application/json", headers=headers)
+
+async def _require_game(request: Request) -> int:
+    game_id = request.path_params["game_id"]
+    if game_id not in known_games:
+        if not await run_in_session(None, game_service.game_exists, game_id):
+            raise HTTPException(404, f"Game {game_id} not found")
+        known_games.add(game_id)
+    return game_id
+
+def _if_none_match(request: Request) -> set:
+    header = request.headers.get("if-none-match", "")
+    return {tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()}
+
+async def list_games(request: Request) -> Response:
+    return JSONResponse(await run_in_session(None, game_service.get_all_games))
+
+async def create_game(request: Request) -> Response:
+    payload = await _read_payload(request, "name")
+    if not isinstance(payload["name"], str):
+        raise HTTPException(400, "name must be a string")
+    game_id = await run_in_session(None, game_service.create_game, payload["name"])
+    if game_id is None:
+        return JSONResponse({"success": False, "message": "Game name must be non-empty and unique"}, status_code=400)
+    return JSONResponse({"success": True, "game_id": game_id}, status_code=201)
+
+async def overview(request: Request) -> Response:
+    return await conditional_get(request, ALL_CHANNELS, lambda game: game.get_overview())
+
+async def game_status(request: Request) -> Response:
+    return await conditional_get(request, ALL_CHANNELS, lambda game: game.get_game_status())
+
+async def companies(request: Request) -> Response:
+    return await conditional_get(
+        request, [COMPANIES, APPROVALS], lambda game: game.company_service.get_all_companies()
+    )
+
+async def bid_matrix(request: Request) -> Response:
+    return await conditional_get(
+        request, [COMPANIES, INVESTORS, BIDS], lambda game: game.investor_service.get_bid_matrix()
+    )
+
+async def approvals(request: Request) -> Response:
+    return await conditional_get(request, [APPROVALS], lambda game: game.get_approval_summary())
+
+async def results(request: Request) -> Response:
+    # Only serves a frozen round; freezing writes, so it is a POST
+    return await conditional_get(
+        request, ALL_CHANNELS, lambda game: game.get_frozen_results(),
+        not_found="No frozen results for the current data yet"
+    )
+
+async def freeze_results(request: Request) -> Response:
+    game_id = await _require_game(request)
+    results = await game_services(game_id).freeze_results()
+    if results is None:
+        return JSONResponse(
+            {"success": False, "message": "Cannot freeze results until all data is approved"}, status_code=409
+        )
+    await versions.refresh(game_id)
+    return JSONResponse(results)
+
+async def live_outputs(request: Request) -> Response:
+    # Bid totals while bidding is open, from the output rows every bid and company write maintains
+    return await conditional_get(
+        request, [COMPANIES, BIDS], lambda game: game.calculation_engine.get_company_outputs()
+    )
+
+async def result_rounds(request: Request) -> Response:
+    return await conditional_get(request, [RESULTS], lambda game: game.get_result_rounds())
+
+async def round_results(request: Request) -> Response:
+    # Frozen rounds never change; the RESULTS sequence only matters until the round exists
+    return await conditional_get(
+        request, [RESULTS], lambda game: game.get_round_results(request.path_params["round"])
+    )
+
+async def update_company(request: Request) -> Response:
+    game_id = await _require_game(request)
+    payload = await _read_payload(request)
+    game = game_services(game_id)
+    success, message = await game.validate_and_update_company(
+        request.path_params["company_id"], payload.get("price"), payload.get("shares"), payload.get("version")
+    )
+    return await _write_response(game_id, success, message)
+
+async def update_bid(request: Request) -> Response:
+    game_id = await _require_game(request)
+    payload = await _read_payload(request, "investor_id", "company_id", "shares")
+    game = game_services(game_id)
+    success, message = await game.validate_and_update_bid(
+        payload["investor_id"], payload["company_id"], payload["shares"], payload.get("version")
+    )
+    return await _write_response(game_id, success, message)
+
+async def set_approvals(request: Request) -> Response:
+    game_id = await _require_game(request)
+    payload = await _read_payload(request, "field_names", "team")
+    field_names, team, status = payload["field_names"], payload["team"], payload.get("status", "OK")
+    versions = payload.get("versions")
+    if not isinstance(field_names, list) or not all(isinstance(name, str) for name in field_names):
+        raise HTTPException(400, "field_names must be a list of strings")
+    if versions is not None and (
+        not isinstance(versions, list)
+        or not all(isinstance(version, int) and not isinstance(version, bool) for version in versions)
+    ):
+        raise HTTPException(400, "versions must be a list of integers")
+    if team not in ("team1", "team2"):
+        return await _write_response(game_id, False, "Invalid team. Use 'team1' or 'team2'")
+    status = status_manager.string_to_status(status) if isinstance(status, str) else None
+    if status is None:
+        return await _write_response(game_id, False, "Invalid approval status. Use 'TBD' or 'OK'")
+    
+    game = game_services(game_id)
+    success, message = await game.approval_manager.set_many(field_names, team, status, versions=versions)
+    if success:
+        await game.freeze_results()
+    return await _write_response(game_id, success, message)
+
+async def _read_payload(request: Request, *required: str) -> Dict:
+    try:
+        payload = await request.json()
+    except ValueError:
+        raise HTTPException(400, "Request body must be JSON")
+    
+    if not isinstance(payload, dict):
+        raise HTTPException(400, "Request body must be a JSON object")
+    missing = [field for field in required if field not in payload]
+    if missing:
+        raise HTTPException(400, f"Missing fields: {', '.join(missing)}")
+    
+    for field, kinds in NUMBER_FIELDS.items():
+        value = payload.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, kinds)):
+            raise HTTPException(400, f"{field} must be {'a number' if kinds is not int else 'an integer'}")
+    return payload
+
+async def _write_response(game_id: int, success: bool, message: str) -> Response:
+    if success:
+        # Our own write must show up in the next GET without waiting for the watcher
+        await versions.refresh(game_id)
+    status_code = 200 if success else 409 if message == CONFLICT_MESSAGE else 400
+    return JSONResponse({"success": success, "message": message}, status_code=status_code)
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    await versions.start()
+    try:
+        yield
+    finally:
+        await versions.stop()
+
+GAME = "/api/games/{game_id:int}"
+
+routes = [
+    Route("/api/games", list_games, methods=["GET"]),
+    Route("/api/games", create_game, methods=["POST"]),
+    Route(f"{GAME}/overview", overview, methods=["GET"]),
+    Route(f"{GAME}/status", game_status, methods=["GET"]),
+    Route(f"{GAME}/companies", companies, methods=["GET"]),
+    Route(f"{GAME}/companies/{{company_id:int}}", update_company, methods=["PUT"]),
+    Route(f"{GAME}/bids", bid_matrix, methods=["GET"]),
+    Route(f"{GAME}/bids", update_bid, methods=["PUT"]),
+    Route(f"{GAME}/approvals", approvals, methods=["GET"]),
+    Route(f"{GAME}/approvals", set_approvals, methods=["POST"]),
+    Route(f"{GAME}/results", results, methods=["GET"]),
+    Route(f"{GAME}/results", freeze_results, methods=["POST"]),
+    Route(f"{GAME}/outputs", live_outputs, methods=["GET"]),
+    Route(f"{GAME}/results/rounds", result_rounds, methods=["GET"]),
+    Route(f"{GAME}/results/{{round:int}}", round_results, methods=["GET"]),
+]
+
+# The React frontend is served from its own origin; it sends If-None-Match and reads ETag
+middleware = [
+    Middleware(
+        CORSMiddleware,
+        allow_origins=list(Config.api.cors_origins),
+        allow_methods=["GET", "POST", "PUT"],
+        allow_headers=["Content-Type", "If-None-Match"],
+        expose_headers=["ETag"]
+    )
+]
+
+app = Starlette(routes=routes, middleware=middleware, lifespan=lifespan)
@@ -0,0 +1,63 @@
+import asyncio
+import contextlib
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+from db.async_session import run_in_session
+from db.changes import ChangeListener, get_change_sequences, get_all_change_sequences, COMPANIES, INVESTORS, BIDS, APPROVALS, RESULTS
+
+logger = logging.getLogger(__name__)
+
+ALL_CHANNELS = (COMPANIES, INVESTORS, BIDS, APPROVALS, RESULTS)
+
+class DataVersions:
+    """In-memory copy of every game's change sequences, kept current by one watcher for the whole process.
+    
+    ETags are computed from this copy, so answering a conditional GET needs no database work.
+    """
+    
+    def __init__(self, poll_interval: float):
+        self.poll_interval = poll_interval
+        self.sequences: Dict[Tuple[int, str], int] = {}
+        self._task: Optional[asyncio.Task] = None
+    
+    def etag(self, game_id: int, channels: Iterable[str]) -> str:
+        parts = [f"g{game_id}"]
+        parts.extend(f"{channel}.{self.sequences.get((game_id, channel), 0)}" for channel in sorted(channels))
+        return '"' + "-".join(parts) + '"'
+    
+    async def refresh(self, game_id: Optional[int] = None) -> None:
+        """Reload every game's sequences, or only game_id's after a write to that game."""
+        if game_id is None:
+            self.sequences = await run_in_session(None, get_all_change_sequences, channels=ALL_CHANNELS)
+            return
+        
+        sequences = await run_in_session(None, get_change_sequences, game_id=game_id, channels=ALL_CHANNELS)
+        self.sequences.update(((game_id, channel), seq) for channel, seq in sequences.items())
+    
+    async def start(self) -> None:
+        await self.refresh()
+        self._task = asyncio.create_task(self._watch())
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            # Let a refresh cut short by the cancel give its connection back before the loop closes
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+    
+    async def _watch(self) -> None:
+        # LISTEN/NOTIFY on Postgres, change_sequence polling elsewhere; the blocking wait runs in a thread
+        listener = ChangeListener(ALL_CHANNELS)
+        try:
+            while True:
+                try:
+                    if await asyncio.to_thread(listener.poll, self.poll_interval):
+                        await self.refresh()
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.exception("Change watcher failed; retrying")
+                    await asyncio.sleep(self.poll_interval)
+        finally:
+            listener.close()
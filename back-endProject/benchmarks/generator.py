@@ -0,0 +1,112 @@
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from db.schema import Company, Investor, Bid, ApprovalToggle
+from db.upsert import UPSERT_BATCH_SIZE
+from services.game_service import GameService
+from db.changes import notify_change, COMPANIES, INVESTORS, BIDS, APPROVALS
+from config import Config, ApprovalStatus, ApprovalEntity
+
+@dataclass(frozen=True)
+class GameSize:
+    name: str
+    companies: int
+    investors: int
+    bids_per_investor: int
+
+SIZES: Dict[str, GameSize] = {
+    size.name: size for size in [
+        GameSize("tiny", companies=5, investors=5, bids_per_investor=5),
+        GameSize("small", companies=100, investors=100, bids_per_investor=10),
+        GameSize("medium", companies=1000, investors=1000, bids_per_investor=10),
+        GameSize("large", companies=10000, investors=10000, bids_per_investor=10),
+    ]
+}
+
+class GameGenerator:
+    """Fill an empty database with a reproducible game of the given size."""
+    
+    def __init__(self, seed: int = 0, approved_ratio: float = 0.9):
+        self.seed = seed
+        self.approved_ratio = approved_ratio
+        self.config = Config.game
+    
+    def generate(self, db: Session, size: GameSize, game_id: Optional[int] = None) -> Dict[str, int]:
+        """Create the game (if needed) and its rows; ids start at 1, so use one game per empty database."""
+        game_id = game_id if game_id is not None else Config.game.game_id
+        GameService().ensure_game(game_id, db)
+        rng = random.Random(f"{self.seed}:{size.name}")
+        
+        companies = self._company_rows(rng, size)
+        investors = [{"id": i, "name": f"Investor {i:05d}"} for i in range(1, size.investors + 1)]
+        bids = self._bid_rows(rng, size, companies)
+        toggles = self._toggle_rows(rng, companies, bids)
+        for rows in (companies, investors, bids, toggles):
+            for row in rows:
+                row["game_id"] = game_id
+        
+        self._insert(db, Company, companies)
+        self._insert(db, Investor, investors)
+        self._insert(db, Bid, bids)
+        self._insert(db, ApprovalToggle, toggles)
+        notify_change(db, game_id, COMPANIES, INVESTORS, BIDS, APPROVALS)
+        
+        return {
+            "companies": len(companies),
+            "investors": len(investors),
+            "bids": len(bids),
+            "approvals": len(toggles)
+        }
+    
+    def _company_rows(self, rng: random.Random, size: GameSize) -> List[Dict]:
+        return [
+            {
+                "id": i,
+                "name": f"Company {i:05d}",
+                "price": round(rng.uniform(self.config.min_price, self.config.max_price), 2),
+                "shares": rng.randint(1, self.config.max_shares)
+            }
+            for i in range(1, size.companies + 1)
+        ]
+    
+    def _bid_rows(self, rng: random.Random, size: GameSize, companies: List[Dict]) -> List[Dict]:
+        bids_per_investor = min(size.bids_per_investor, size.companies)
+        company_shares = {company["id"]: company["shares"] for company in companies}
+        
+        rows = []
+        for investor_id in range(1, size.investors + 1):
+            # Each investor bids on a random subset of companies, so the book stays sparse
+            for company_id in rng.sample(range(1, size.companies + 1), bids_per_investor):
+                rows.append({
+                    "id": len(rows) + 1,
+                    "investor_id": investor_id,
+                    "company_id": company_id,
+                    "shares_bid": rng.randint(0, company_shares[company_id] // bids_per_investor + 1)
+                })
+        return rows
+    
+    def _toggle_rows(self, rng: random.Random, companies: List[Dict], bids: List[Dict]) -> List[Dict]:
+        keys = [(ApprovalEntity.COMPANY.value, company["id"], None) for company in companies]
+        keys.extend((ApprovalEntity.BID.value, bid["company_id"], bid["investor_id"]) for bid in bids)
+        
+        return [
+            {
+                "id": i,
+                "entity_type": entity_type,
+                "company_id": company_id,
+                "investor_id": investor_id,
+                "team1_status": int(self._random_status(rng)),
+                "team2_status": int(self._random_status(rng))
+            }
+            for i, (entity_type, company_id, investor_id) in enumerate(keys, start=1)
+        ]
+    
+    def _random_status(self, rng: random.Random) -> ApprovalStatus:
+        return ApprovalStatus.OK if rng.random() < self.approved_ratio else ApprovalStatus.TBD
+    
+    def _insert(self, db: Session, model, rows: List[Dict]) -> None:
+        # executemany in batches; ids are preassigned so no RETURNING round trip is needed
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            db.execute(insert(model), rows[start:start + UPSERT_BATCH_SIZE])
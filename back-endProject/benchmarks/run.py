@@ -0,0 +1,166 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+import sqlalchemy
+from sqlalchemy.engine import make_url
+from db.schema import Base, configure_engine, get_engine
+from db.session import get_session
+from db.instrumentation import track_operation
+from logic.approval_manager import ApprovalManager
+from logic.calculation_engine import CalculationEngine
+from logic.game_coordinator import GameCoordinator
+from services.company_service import CompanyService, company_cache
+from services.investor_service import InvestorService
+from utils.display import (
+    format_company_table, format_investor_table, format_results_table, format_approval_status,
+    render_company_table, render_investor_table, render_approval_status
+)
+from .generator import GameGenerator, GameSize, SIZES
+
+# Investor table cells above which rendering is skipped; 10k x 10k would be 10^8 cells
+MAX_RENDER_CELLS = 1_000_000
+
+class BenchmarkRunner:
+    def __init__(self, repeat: int = 5, seed: int = 0):
+        self.repeat = repeat
+        self.generator = GameGenerator(seed=seed)
+        self.calculation_engine = CalculationEngine()
+        self.approval_manager = ApprovalManager()
+        self.game_coordinator = GameCoordinator()
+        self.company_service = CompanyService()
+        self.investor_service = InvestorService()
+    
+    def run(self, size: GameSize, url: str) -> List[Dict]:
+        """Build a fresh game of the given size at url and time every hot path against it."""
+        engine = configure_engine(url)
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        
+        # Change sequences restart with every fresh database, so cached reads from the last size look current
+        company_cache.clear()
+        with get_session() as db:
+            counts = self.generator.generate(db, size)
+        
+        results = []
+        for operation, func in self._operations(size).items():
+            result = {"size": size.name, **counts, "operation": operation}
+            if func is None:
+                result["skipped"] = True
+            else:
+                result.update(self._time(operation, func))
+            results.append(result)
+        return results
+    
+    def _operations(self, size: GameSize) -> Dict[str, Optional[Callable[[], object]]]:
+        companies = self.company_service.get_all_companies()
+        investors = self.investor_service.get_all_investors_with_bids()
+        approvals = self.approval_manager.get_pending_approvals()
+        with get_session() as db:
+            results = self.calculation_engine.calculate_company_outputs(db)
+        company_names = [company["name"] for company in companies]
+        
+        render_investors = rerender_investors = None
+        if size.companies * size.investors <= MAX_RENDER_CELLS:
+            render_investors = lambda: format_investor_table(investors, company_names)
+            # Repeat renders of unchanged data hit the render cache, as a CLI refresh does
+            rerender_investors = lambda: render_investor_table(investors, company_names)
+        
+        return {
+            "calculate_company_outputs": self._in_session(self.calculation_engine.calculate_company_outputs),
+            "calculate_market_statistics": self._in_session(self.calculation_engine.calculate_market_statistics),
+            "calculate_allocations": self._in_session(self.calculation_engine.calculate_allocations),
+            "get_game_status": self.game_coordinator.get_game_status,
+            "get_all_companies": self.company_service.get_all_companies,
+            "get_all_investors_with_bids": self.investor_service.get_all_investors_with_bids,
+            "check_all_approved": self.approval_manager.check_all_approved,
+            "get_pending_approvals": self.approval_manager.get_pending_approvals,
+            "render_company_table": lambda: format_company_table(companies),
+            "render_investor_table": render_investors,
+            "render_results_table": lambda: format_results_table(results),
+            "render_approval_status": lambda: format_approval_status(approvals),
+            "rerender_company_table": lambda: render_company_table(companies),
+            "rerender_investor_table": rerender_investors,
+            "rerender_approval_status": lambda: render_approval_status(approvals),
+        }
+    
+    def _in_session(self, func: Callable) -> Callable[[], object]:
+        def call():
+            with get_session() as db:
+                return func(db)
+        return call
+    
+    def _time(self, operation: str, func: Callable[[], object]) -> Dict:
+        timings = []
+        for _ in range(self.repeat):
+            with track_operation(operation) as stats:
+                start = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - start) * 1000)
+        
+        return {
+            "repeat": self.repeat,
+            "statements": stats.statements,
+            "db_time_ms": round(stats.db_time_ms, 3),
+            "min_ms": round(min(timings), 3),
+            "median_ms": round(statistics.median(timings), 3),
+            "mean_ms": round(statistics.fmean(timings), 3),
+            "max_ms": round(max(timings), 3)
+        }
+
+def run_benchmarks(sizes: List[GameSize], url: Optional[str] = None, repeat: int = 5, seed: int = 0) -> Dict:
+    """Run every size and return a JSON-serialisable report."""
+    runner = BenchmarkRunner(repeat=repeat, seed=seed)
+    results = []
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            # Without an explicit URL each size gets its own throwaway SQLite file
+            size_url = url or f"sqlite:///{os.path.join(workdir, size.name)}.db"
+            results.extend(runner.run(size, size_url))
+        get_engine().dispose()
+    
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "dialect": make_url(url).get_backend_name() if url else "sqlite",
+        "seed": seed,
+        "results": results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the simulation's hot paths on synthetic games")
+    parser.add_argument(
+        "--size",
+        action="append",
+        choices=list(SIZES),
+        help="Game size to run; repeat for several (default: tiny, small, medium)"
+    )
+    parser.add_argument(
+        "--url",
+        help="Database URL to benchmark against; ALL TABLES ARE DROPPED (default: temporary SQLite files)"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per operation")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the data generator")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    
+    sizes = [SIZES[name] for name in args.size or ["tiny", "small", "medium"]]
+    report = run_benchmarks(sizes, url=args.url, repeat=args.repeat, seed=args.seed)
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+if __name__ == "__main__":
+    main()
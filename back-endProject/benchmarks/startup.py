@@ -0,0 +1,119 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Median wall-clock budget per main.py invocation, about twice the medians measured with --repeat 20
+# on SQLite (67.5 ms for help, 516.6 ms for init); scripted runs launch the CLI thousands of times
+STARTUP_BUDGETS_MS = {
+    "help": 150,
+    "init": 1000,
+}
+
+# Top-level imports listed per command, slowest first
+REPORTED_IMPORTS = 10
+
+class StartupBenchmark:
+    """Time main.py from process start to exit, and attribute its import time with -X importtime."""
+    
+    def __init__(self, repeat: int = 10):
+        self.repeat = repeat
+    
+    def run(self, command: str, workdir: str) -> Dict:
+        timings = []
+        for attempt in range(self.repeat):
+            start = time.perf_counter()
+            process = self._launch(command, workdir, attempt)
+            timings.append((time.perf_counter() - start) * 1000)
+            if process.returncode != 0:
+                # main.py reports its own failures on stdout, tracebacks go to stderr
+                output = (process.stdout + process.stderr).strip().splitlines()
+                return {"command": command, "error": output[-1] if output else f"exit status {process.returncode}"}
+        
+        imports = self._imports(self._launch(command, workdir, self.repeat, "-X", "importtime").stderr)
+        top_level = sorted(
+            ((name, ms) for name, ms in imports if not name.startswith(" ")), key=lambda item: item[1], reverse=True
+        )
+        budget = STARTUP_BUDGETS_MS[command]
+        median = statistics.median(timings)
+        return {
+            "command": command,
+            "repeat": self.repeat,
+            "min_ms": round(min(timings), 3),
+            "median_ms": round(median, 3),
+            "max_ms": round(max(timings), 3),
+            "budget_ms": budget,
+            "within_budget": median <= budget,
+            "modules_imported": len(imports),
+            "import_ms": round(sum(ms for _, ms in top_level), 3),
+            "slowest_imports": [
+                {"module": name, "cumulative_ms": round(ms, 3)} for name, ms in top_level[:REPORTED_IMPORTS]
+            ]
+        }
+    
+    def _launch(self, command: str, workdir: str, attempt: int, *options: str) -> subprocess.CompletedProcess:
+        # Every run gets a database of its own, so --init always creates and seeds from scratch
+        env = dict(os.environ, DB_URL=f"sqlite:///{os.path.join(workdir, f'startup_{attempt}')}.db")
+        return subprocess.run(
+            [sys.executable, *options, "main.py", f"--{command}"],
+            cwd=PROJECT_DIR, env=env, capture_output=True, text=True
+        )
+    
+    def _imports(self, stderr: str) -> List[Tuple[str, float]]:
+        # "import time: self [us] | cumulative | package", nested imports indented under their importer
+        imports = []
+        for line in stderr.splitlines():
+            if not line.startswith("import time:") or "imported package" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            imports.append((name[1:].rstrip(), int(cumulative) / 1000))
+        return imports
+
+def run_startup_benchmarks(commands: List[str], repeat: int = 10) -> Dict:
+    """Time every command and return a JSON-serialisable report."""
+    benchmark = StartupBenchmark(repeat=repeat)
+    with tempfile.TemporaryDirectory() as workdir:
+        results = [benchmark.run(command, workdir) for command in commands]
+    
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "results": results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Time main.py startup against its budgets")
+    parser.add_argument(
+        "--command",
+        action="append",
+        choices=list(STARTUP_BUDGETS_MS),
+        help="main.py option to time, without its dashes; repeat for several (default: all)"
+    )
+    parser.add_argument("--repeat", type=int, default=10, help="Timed launches per command")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    
+    report = run_startup_benchmarks(args.command or list(STARTUP_BUDGETS_MS), repeat=args.repeat)
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    
+    # Non-zero when a command failed or went over budget, so scripts and CI can gate on it
+    if not all(result.get("within_budget") for result in report["results"]):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,50 +1,64 @@
-import time
 from typing import Optional
-from ..services.company_service import CompanyService
-from ..logic.calculator import recalculate_outputs
-from ..logic.toggle_handler import check_all_ok, get_pending_approvals
-from ..utils.display import (
-    format_company_table, format_results_table, format_approval_status,
+from services.company_service import CompanyService
+from logic.calculator import get_round_results, get_calculated_outputs
+from logic.toggle_handler import check_all_ok, get_pending_approvals
+from logic.approval_manager import ApprovalKey
+from utils.display import (
+    render_company_table, render_approval_status, format_results_table, format_approval_status,
     print_error, print_success, print_warning, print_info
 )
+from utils.screen import LiveScreen
+from db.instrumentation import track_operation
+from db.changes import ChangeListener, COMPANIES, APPROVALS
 from config import Config
 
 class Team1CLI:
     def __init__(self):
         self.company_service = CompanyService()
         self.config = Config.display
+        self.change_listener = ChangeListener([COMPANIES, APPROVALS], Config.game.game_id)
+        self.screen = LiveScreen()
     
     def run(self):
         print_info("\n=== Simulation Game - Team 1 Interface ===")
         print_info("You are responsible for managing company data and pricing.")
         
-        while True:
-            self._display_current_state()
-            self._display_menu()
-            
-            try:
-                choice = input("\nEnter your choice (1-7): ").strip()
-                self._handle_choice(choice)
-            except KeyboardInterrupt:
-                print_info("\nExiting...")
-                break
-            except Exception as e:
-                print_error(f"An error occurred: {str(e)}")
-            
-            time.sleep(self.config.refresh_interval)
+        redraw = self.change_listener.poll()
+        try:
+            while True:
+                if redraw:
+                    with track_operation("team1_cli.display_current_state"):
+                        self._display_current_state()
+                self._display_menu()
+                
+                try:
+                    choice = input("\nEnter your choice (1-7): ").strip()
+                    with track_operation(f"team1_cli.choice_{choice}"):
+                        self._handle_choice(choice)
+                except KeyboardInterrupt:
+                    print_info("\nExiting...")
+                    break
+                except Exception as e:
+                    print_error(f"An error occurred: {str(e)}")
+                
+                # Re-fetch and redraw only after a relevant write, here or in another terminal
+                redraw = self.change_listener.poll(self.config.refresh_interval)
+        finally:
+            # Also on exit(0) from the menu, so the terminal gets its scrolling back
+            self.screen.close()
+            self.change_listener.close()
     
     def _display_current_state(self):
         companies = self.company_service.get_all_companies()
-        print("\n" + "="*60)
-        print("CURRENT COMPANY DATA:")
-        print("="*60)
-        print(format_company_table(companies))
+        lines = ["=" * 60, "CURRENT COMPANY DATA:", "=" * 60]
+        lines.extend(render_company_table(companies))
         
         approvals = get_pending_approvals()
         if approvals:
-            print("\nAPPROVAL STATUS:")
-            print("="*60)
-            print(format_approval_status(approvals))
+            lines.extend(["", "APPROVAL STATUS:", "=" * 60])
+            lines.extend(render_approval_status(approvals))
+        
+        self.screen.render(lines)
     
     def _display_menu(self):
         print("\n" + "="*60)
@@ -82,11 +96,12 @@ class Team1CLI:
             company_id = int(input("Enter company ID: "))
             price = float(input(f"Enter new price (${Config.game.min_price}-${Config.game.max_price}): "))
             
-            if self.company_service.update_company(company_id, price=price):
+            success, message = self.company_service.update_company(company_id, price=price)
+            if success:
                 print_success("Price updated successfully!")
-                print_warning("Team 2 approvals have been reset to TBD.")
+                print_warning("Company approvals and Team 2's approvals of its bids have been reset to TBD.")
             else:
-                print_error("Failed to update price. Check company ID and price range.")
+                print_error(f"Failed to update price: {message}")
         except ValueError:
             print_error("Invalid input. Please enter valid numbers.")
     
@@ -95,11 +110,12 @@ class Team1CLI:
             company_id = int(input("Enter company ID: "))
             shares = int(input(f"Enter new shares (1-{Config.game.max_shares}): "))
             
-            if self.company_service.update_company(company_id, shares=shares):
+            success, message = self.company_service.update_company(company_id, shares=shares)
+            if success:
                 print_success("Shares updated successfully!")
-                print_warning("Team 2 approvals have been reset to TBD.")
+                print_warning("Company approvals and Team 2's approvals of its bids have been reset to TBD.")
             else:
-                print_error("Failed to update shares. Check company ID and shares range.")
+                print_error(f"Failed to update shares: {message}")
         except ValueError:
             print_error("Invalid input. Please enter valid numbers.")
     
@@ -112,8 +128,8 @@ class Team1CLI:
                 print_error("Company not found.")
                 return
             
-            from ..logic.toggle_handler import set_toggle
-            if set_toggle(f"company_{company_id}", "team1", "OK"):
+            from logic.toggle_handler import set_toggle
+            if set_toggle(ApprovalKey.for_company(company_id), "team1", "OK"):
                 print_success(f"Company '{company['name']}' marked as final.")
             else:
                 print_error("Failed to mark company as final.")
@@ -129,15 +145,17 @@ class Team1CLI:
             print(format_approval_status(approvals))
     
     def _view_results(self):
-        if check_all_ok():
-            results = recalculate_outputs()
+        results = get_round_results()
+        if results is not None:
             print("\n" + "="*80)
-            print("SIMULATION RESULTS:")
+            print(f"SIMULATION RESULTS (ROUND {results['round']}):")
             print("="*80)
-            print(format_results_table(results))
+            print(format_results_table(results["company_results"]))
         else:
             print_error("Cannot view results until all data is finalized.")
             print_warning("Please ensure all companies and bids are approved by both teams.")
+            print("\nLIVE BID TOTALS (not final):")
+            print(format_results_table(get_calculated_outputs()))
     
     def _add_new_company(self):
         try:
@@ -1,13 +1,15 @@
-import time
 from typing import Optional
-from ..services.investor_service import InvestorService
-from ..services.company_service import CompanyService
-from ..logic.calculator import recalculate_outputs
-from ..logic.toggle_handler import check_all_ok, get_pending_approvals
-from ..utils.display import (
-    format_company_table, format_investor_table, format_results_table, 
-    format_approval_status, print_error, print_success, print_warning, print_info
+from services.investor_service import InvestorService
+from services.company_service import CompanyService
+from logic.calculator import get_round_results, get_calculated_outputs
+from logic.toggle_handler import check_all_ok, get_pending_approvals
+from utils.display import (
+    render_company_table, render_investor_table, render_approval_status,
+    format_results_table, format_approval_status, print_error, print_success, print_warning, print_info
 )
+from utils.screen import LiveScreen
+from db.instrumentation import track_operation
+from db.changes import ChangeListener, COMPANIES, INVESTORS, BIDS, APPROVALS
 from config import Config
 
 class Team2CLI:
@@ -15,45 +17,54 @@ class Team2CLI:
         self.investor_service = InvestorService()
         self.company_service = CompanyService()
         self.config = Config.display
+        self.change_listener = ChangeListener([COMPANIES, INVESTORS, BIDS, APPROVALS], Config.game.game_id)
+        self.screen = LiveScreen()
     
     def run(self):
         print_info("\n=== Simulation Game - Team 2 Interface ===")
         print_info("You are responsible for managing investor bids and approvals.")
         
-        while True:
-            self._display_current_state()
-            self._display_menu()
-            
-            try:
-                choice = input("\nEnter your choice (1-7): ").strip()
-                self._handle_choice(choice)
-            except KeyboardInterrupt:
-                print_info("\nExiting...")
-                break
-            except Exception as e:
-                print_error(f"An error occurred: {str(e)}")
-            
-            time.sleep(self.config.refresh_interval)
+        redraw = self.change_listener.poll()
+        try:
+            while True:
+                if redraw:
+                    with track_operation("team2_cli.display_current_state"):
+                        self._display_current_state()
+                self._display_menu()
+                
+                try:
+                    choice = input("\nEnter your choice (1-7): ").strip()
+                    with track_operation(f"team2_cli.choice_{choice}"):
+                        self._handle_choice(choice)
+                except KeyboardInterrupt:
+                    print_info("\nExiting...")
+                    break
+                except Exception as e:
+                    print_error(f"An error occurred: {str(e)}")
+                
+                # Re-fetch and redraw only after a relevant write, here or in another terminal
+                redraw = self.change_listener.poll(self.config.refresh_interval)
+        finally:
+            # Also on exit(0) from the menu, so the terminal gets its scrolling back
+            self.screen.close()
+            self.change_listener.close()
     
     def _display_current_state(self):
         companies = self.company_service.get_all_companies()
         investors = self.investor_service.get_all_investors_with_bids()
         
-        print("\n" + "="*60)
-        print("CURRENT COMPANY DATA:")
-        print("="*60)
-        print(format_company_table(companies))
+        lines = ["=" * 60, "CURRENT COMPANY DATA:", "=" * 60]
+        lines.extend(render_company_table(companies))
         
-        print("\n" + "="*60)
-        print("CURRENT INVESTOR BIDS:")
-        print("="*60)
-        print(format_investor_table(investors))
+        lines.extend(["", "=" * 60, "CURRENT INVESTOR BIDS:", "=" * 60])
+        lines.extend(render_investor_table(investors, [company["name"] for company in companies]))
         
         approvals = get_pending_approvals()
         if approvals:
-            print("\nAPPROVAL STATUS:")
-            print("="*60)
-            print(format_approval_status(approvals))
+            lines.extend(["", "APPROVAL STATUS:", "=" * 60])
+            lines.extend(render_approval_status(approvals))
+        
+        self.screen.render(lines)
     
     def _display_menu(self):
         print("\n" + "="*60)
@@ -92,11 +103,12 @@ class Team2CLI:
             company_id = int(input("Enter company ID: "))
             shares = int(input("Enter shares to bid: "))
             
-            if self.investor_service.update_bid(investor_id, company_id, shares):
+            success, message = self.investor_service.update_bid(investor_id, company_id, shares)
+            if success:
                 print_success("Bid updated successfully!")
                 print_warning("Bid status reset to TBD.")
             else:
-                print_error("Failed to update bid. Check investor ID, company ID, and shares.")
+                print_error(f"Failed to update bid: {message}")
         except ValueError:
             print_error("Invalid input. Please enter valid numbers.")
     
@@ -128,15 +140,17 @@ class Team2CLI:
             print(format_approval_status(approvals))
     
     def _view_results(self):
-        if check_all_ok():
-            results = recalculate_outputs()
+        results = get_round_results()
+        if results is not None:
             print("\n" + "="*80)
-            print("SIMULATION RESULTS:")
+            print(f"SIMULATION RESULTS (ROUND {results['round']}):")
             print("="*80)
-            print(format_results_table(results))
+            print(format_results_table(results["company_results"]))
         else:
             print_error("Cannot view results until all data is finalized.")
             print_warning("Please ensure all companies and bids are approved by both teams.")
+            print("\nLIVE BID TOTALS (not final):")
+            print(format_results_table(get_calculated_outputs()))
     
     def _add_new_investor(self):
         try:
@@ -178,6 +192,14 @@ class Team2CLI:
             if bid_amount > 0:
                 total_value = bid_amount * company['price']
                 print(f"Total Bid Value: ${total_value:,.2f}")
+            
+            allocated = next((
+                allocation["shares_allocated"]
+                for allocation in self.investor_service.get_investor_allocations(investor_id)
+                if allocation["company_name"] == company["name"]
+            ), None)
+            if allocated is not None:
+                print(f"Shares Allocated (last results): {allocated:,}")
         except ValueError:
             print_error("Invalid investor ID or company ID.")
 
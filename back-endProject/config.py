@@ -1,5 +1,5 @@
 import os
-from enum import IntEnum
+from enum import Enum, IntEnum
 from dataclasses import dataclass
 from typing import List, Dict
 from dotenv import load_dotenv
@@ -10,6 +10,10 @@ class ApprovalStatus(IntEnum):
     TBD = 0
     OK = 1
 
+class ApprovalEntity(str, Enum):
+    COMPANY = "company"
+    BID = "bid"
+
 class SimulationType(Enum):
     GAME_1 = "game_1"
     GAME_2 = "game_2"
@@ -21,18 +25,33 @@ class DatabaseConfig:
     host: str = os.getenv("DB_HOST", "localhost")
     port: str = os.getenv("DB_PORT", "5432")
     name: str = os.getenv("DB_NAME", "simulation_game")
+    database_url: str = os.getenv("DB_URL", "")
+    pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    statement_timeout_ms: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    slow_statement_ms: float = float(os.getenv("DB_SLOW_STATEMENT_MS", "200"))
+    partition_by_game: str = os.getenv("DB_PARTITION_BY_GAME", "").lower()
+    game_partitions: int = int(os.getenv("DB_GAME_PARTITIONS", "16"))
+    conflict_retries: int = int(os.getenv("DB_CONFLICT_RETRIES", "3"))
     
     @property
     def url(self) -> str:
+        if self.database_url:
+            return self.database_url
         return f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}"
 
 @dataclass
 class GameConfig:
+    game_id: int = int(os.getenv("GAME_ID", "1"))
     max_companies: int = 5
     max_investors: int = 5
     max_shares: int = 10000
     max_price: float = 1000.0
     min_price: float = 1.0
+    # Oversubscribed offerings are allocated in whole lots of this many shares
+    allocation_lot_size: int = int(os.getenv("ALLOCATION_LOT_SIZE", "1"))
 
 @dataclass
 class DisplayConfig:
@@ -40,10 +59,24 @@ class DisplayConfig:
     max_name_length: int = 50
     refresh_interval: float = 0.5
 
+@dataclass
+class ApiConfig:
+    version_poll_interval: float = float(os.getenv("API_VERSION_POLL_INTERVAL", "0.5"))
+    # Browser origins allowed to call the API, comma-separated; the default is Vite's dev server
+    cors_origins: tuple = tuple(
+        origin.strip() for origin in os.getenv("API_CORS_ORIGINS", "http://localhost:5173").split(",") if origin.strip()
+    )
+
+@dataclass
+class CacheConfig:
+    read_cache_size: int = int(os.getenv("READ_CACHE_SIZE", "256"))
+
 class Config:
     db = DatabaseConfig()
     game = GameConfig()
     display = DisplayConfig()
+    cache = CacheConfig()
+    api = ApiConfig()
     
     sample_companies: List[Dict] = [
         {"name": "TechCorp", "price": 10.0, "shares": 1000},
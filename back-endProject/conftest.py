@@ -0,0 +1,39 @@
+import gc
+import os
+import tempfile
+
+# The suite runs against a throwaway SQLite file; set before config reads the environment
+_DB_DIR = tempfile.mkdtemp(prefix="simulation_game_tests_")
+os.environ["DB_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+# The API's change watcher finishes its current poll when a test client shuts down
+os.environ["API_VERSION_POLL_INTERVAL"] = "0.05"
+
+import pytest
+
+# test_setup.py is a manual check against the configured database, run as a script
+collect_ignore = ["test_setup.py"]
+
+@pytest.fixture
+def engine():
+    """Fresh tables for one test, dropped afterwards."""
+    from db.schema import Base, init_db
+    from services.company_service import company_cache
+    engine = init_db()
+    yield engine
+    # Handles the API's event loop left behind at shutdown are only closed when collected; until
+    # then their SQLite read lock would block DROP TABLE
+    gc.collect()
+    Base.metadata.drop_all(bind=engine)
+    # Change sequences start over with the tables, so cached reads would match the next test's versions
+    company_cache.clear()
+
+@pytest.fixture
+def db(engine):
+    """Session on the configured game, which exists but has no data."""
+    from config import Config
+    from db.schema import SessionLocal
+    from services.game_service import GameService
+    with SessionLocal() as session:
+        GameService().ensure_game(Config.game.game_id, session)
+        session.commit()
+        yield session
@@ -0,0 +1,93 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, Callable, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from config import Config, DatabaseConfig
+from .schema import engine_options
+from .instrumentation import instrument_engine
+
+# Async drivers used in place of the sync ones named in the configured URL
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+_async_engine: Optional[AsyncEngine] = None
+
+def get_async_engine() -> AsyncEngine:
+    """Return the process-wide async engine, building it on first use."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = _build_async_engine(Config.db)
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+async def configure_async_engine(url: Optional[str] = None) -> AsyncEngine:
+    """Drop the current async engine and rebuild it, optionally against a different URL."""
+    global _async_engine
+    if url is not None:
+        Config.db.database_url = url
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+    return get_async_engine()
+
+def async_url(url: str) -> URL:
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+def _build_async_engine(db_config: DatabaseConfig) -> AsyncEngine:
+    url = async_url(db_config.url)
+    options = engine_options(db_config, url)
+    if db_config.statement_timeout_ms and url.get_backend_name() == "postgresql":
+        options["connect_args"] = {"server_settings": {"statement_timeout": str(db_config.statement_timeout_ms)}}
+    
+    engine = create_async_engine(url, **options)
+    instrument_engine(engine.sync_engine, db_config.slow_statement_ms)
+    return engine
+
+@asynccontextmanager
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    session = AsyncSessionLocal(bind=get_async_engine())
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+@asynccontextmanager
+async def use_async_session(db: Optional[AsyncSession] = None) -> AsyncGenerator[AsyncSession, None]:
+    """Join the caller's session if one is given, otherwise run in a new one."""
+    if db is not None:
+        yield db
+        return
+    
+    async with get_async_session() as session:
+        yield session
+
+@asynccontextmanager
+async def read_only_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Async counterpart of db.session.read_only_session."""
+    engine = get_async_engine()
+    async with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            await connection.execution_options(isolation_level="REPEATABLE READ", postgresql_readonly=True)
+        
+        session = AsyncSessionLocal(bind=connection)
+        try:
+            if engine.dialect.name == "sqlite":
+                await session.execute(text("BEGIN"))
+            yield session
+        finally:
+            await session.close()
+
+async def run_in_session(db: Optional[AsyncSession], func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a sync, session-taking function on an async session; its queries are awaited, not blocking."""
+    async with use_async_session(db) as session:
+        return await session.run_sync(lambda sync_session: func(*args, db=sync_session, **kwargs))
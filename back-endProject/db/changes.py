@@ -0,0 +1,158 @@
+import select
+import time
+from typing import Dict, Iterable, Optional, Set, Tuple
+from sqlalchemy import event, func, text
+from sqlalchemy.orm import Session, SessionTransaction
+from .schema import ChangeSequence, get_engine
+from .session import get_session
+from .upsert import dialect_insert
+
+NOTIFY_CHANNEL = "simulation_changes"
+
+COMPANIES = "companies"
+INVESTORS = "investors"
+BIDS = "bids"
+APPROVALS = "approvals"
+RESULTS = "results"
+
+# Session.info key of the (game_id, channel) pairs written in the session's open transaction
+PENDING_CHANGES = "pending_changes"
+
+def notify_change(db: Session, game_id: int, *channels: str) -> None:
+    """Bump the game's change sequence for each channel; listeners see it once the transaction commits."""
+    rows = [{"game_id": game_id, "channel": channel, "seq": 1} for channel in dict.fromkeys(channels)]
+    if not rows:
+        return
+    
+    db.info.setdefault(PENDING_CHANGES, set()).update((game_id, row["channel"]) for row in rows)
+    stmt = dialect_insert(db, ChangeSequence).values(rows)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[ChangeSequence.game_id, ChangeSequence.channel],
+        set_={"seq": ChangeSequence.seq + 1, "updated_at": func.now()}
+    ))
+    
+    if db.get_bind().dialect.name == "postgresql":
+        for row in rows:
+            db.execute(
+                text("SELECT pg_notify(:name, :payload)"),
+                {"name": NOTIFY_CHANNEL, "payload": f"{game_id}:{row['channel']}"}
+            )
+
+def has_pending_changes(db: Session, game_id: int, channels: Iterable[str]) -> bool:
+    """True if the session's open transaction wrote any of the channels, so what it reads may yet roll back."""
+    pending = db.info.get(PENDING_CHANGES, ())
+    return any((game_id, channel) in pending for channel in channels)
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_pending_changes(session: Session, transaction: SessionTransaction) -> None:
+    # Savepoints end inside the outer transaction, whose writes are still uncommitted
+    if transaction.parent is None:
+        session.info.pop(PENDING_CHANGES, None)
+
+def get_change_sequences(db: Session, game_id: int,
+                         channels: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    query = db.query(ChangeSequence.channel, ChangeSequence.seq).filter(ChangeSequence.game_id == game_id)
+    if channels is not None:
+        query = query.filter(ChangeSequence.channel.in_(list(channels)))
+    return dict(query.all())
+
+def get_all_change_sequences(db: Session,
+                             channels: Optional[Iterable[str]] = None) -> Dict[Tuple[int, str], int]:
+    """Sequences of every game, keyed by (game_id, channel)."""
+    query = db.query(ChangeSequence.game_id, ChangeSequence.channel, ChangeSequence.seq)
+    if channels is not None:
+        query = query.filter(ChangeSequence.channel.in_(list(channels)))
+    return {(game_id, channel): seq for game_id, channel, seq in query}
+
+def get_data_version(db: Session, game_id: int, channels: Iterable[str]) -> Tuple[Tuple[str, int], ...]:
+    """A value that changes whenever any of the game's channels is written; usable as a cache version."""
+    return tuple(sorted(get_change_sequences(db, game_id, channels).items()))
+
+class ChangeListener:
+    """Tells a client whether watched channels changed, via LISTEN/NOTIFY or by polling change_sequence.
+    
+    Watches one game, or every game when game_id is None.
+    """
+    
+    def __init__(self, channels: Iterable[str], game_id: Optional[int] = None):
+        self.channels: Set[str] = set(channels)
+        self.game_id = game_id
+        self._seen: Optional[Dict] = None
+        self._connection = None
+        self._started = False
+    
+    def poll(self, timeout: float = 0) -> bool:
+        """Return True if a watched channel changed since the last poll (always True the first time)."""
+        if not self._started:
+            self._start()
+            return True
+        
+        if self._connection is not None:
+            return self._poll_notifications(timeout)
+        return self._poll_sequences(timeout)
+    
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+    
+    def _start(self) -> None:
+        self._started = True
+        engine = get_engine()
+        
+        if engine.dialect.name == "postgresql":
+            try:
+                raw = engine.raw_connection()
+                # Keep the LISTEN connection out of the pool for the life of the listener
+                raw.detach()
+                connection = raw.driver_connection
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                self._connection = connection
+                return
+            except Exception:
+                self._connection = None
+        
+        self._seen = self._read_sequences()
+    
+    def _poll_notifications(self, timeout: float) -> bool:
+        if self._drain_notifications():
+            return True
+        
+        if timeout > 0:
+            ready, _, _ = select.select([self._connection], [], [], timeout)
+            if ready:
+                return self._drain_notifications()
+        return False
+    
+    def _drain_notifications(self) -> bool:
+        self._connection.poll()
+        changed = False
+        while self._connection.notifies:
+            notification = self._connection.notifies.pop(0)
+            game_id, _, channel = notification.payload.partition(":")
+            if channel in self.channels and (self.game_id is None or game_id == str(self.game_id)):
+                changed = True
+        return changed
+    
+    def _poll_sequences(self, timeout: float) -> bool:
+        if self._sequences_changed():
+            return True
+        
+        if timeout > 0:
+            time.sleep(timeout)
+            return self._sequences_changed()
+        return False
+    
+    def _sequences_changed(self) -> bool:
+        current = self._read_sequences()
+        changed = current != self._seen
+        self._seen = current
+        return changed
+    
+    def _read_sequences(self) -> Dict:
+        with get_session() as db:
+            if self.game_id is None:
+                return get_all_change_sequences(db, self.channels)
+            return get_change_sequences(db, self.game_id, self.channels)
@@ -0,0 +1,70 @@
+import inspect
+import logging
+from functools import wraps
+from typing import Any, Callable, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+CONFLICT_MESSAGE = "Changed by someone else since it was read; reload and try again"
+
+def take_write_lock(db: Session) -> None:
+    """On SQLite, hold the database write lock from now on, so the reads that follow can't go stale.
+    
+    pysqlite only issues BEGIN at the first write, so reads before it see no lock at all. Postgres
+    needs nothing here; it locks the rows a SELECT ... FOR UPDATE reads.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return
+    # Once a transaction has begun, an earlier write in it already holds the lock
+    if not db.connection().connection.driver_connection.in_transaction:
+        db.execute(text("BEGIN IMMEDIATE"))
+
+def retry_on_conflict(conflict_result: Any, attempts: Optional[int] = None) -> Callable:
+    """Decorator for session-taking service methods (sync or async): rerun the call when a versioned
+    write loses a race.
+    
+    Each attempt runs in a fresh session, so it re-reads the row and re-validates. Only calls that
+    open their own session are retried; inside a caller's session the StaleDataError propagates,
+    since that transaction is the caller's to roll back. After the last attempt conflict_result
+    is returned.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        
+        def owns_session(args, kwargs) -> bool:
+            return signature.bind_partial(*args, **kwargs).arguments.get("db") is None
+        
+        def tries() -> int:
+            return attempts if attempts is not None else Config.db.conflict_retries
+        
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not owns_session(args, kwargs):
+                    return await func(*args, **kwargs)
+                
+                for attempt in range(1, tries() + 1):
+                    try:
+                        return await func(*args, **kwargs)
+                    except StaleDataError:
+                        logger.info("%s: concurrent update, attempt %d of %d", func.__qualname__, attempt, tries())
+                return conflict_result
+            return async_wrapper
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not owns_session(args, kwargs):
+                return func(*args, **kwargs)
+            
+            for attempt in range(1, tries() + 1):
+                try:
+                    return func(*args, **kwargs)
+                except StaleDataError:
+                    logger.info("%s: concurrent update, attempt %d of %d", func.__qualname__, attempt, tries())
+            return conflict_result
+        return wrapper
+    return decorator
@@ -0,0 +1,103 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Callable, Dict, Generator, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class OperationStats:
+    name: str
+    statements: int = 0
+    rows: int = 0
+    db_time_ms: float = 0.0
+    statement_counts: Dict[str, int] = field(default_factory=dict)
+    
+    def record(self, statement: str, rows: int, elapsed_ms: float) -> None:
+        self.statements += 1
+        self.rows += rows
+        self.db_time_ms += elapsed_ms
+        self.statement_counts[statement] = self.statement_counts.get(statement, 0) + 1
+    
+    def repeated_statements(self, threshold: int = 2) -> Dict[str, int]:
+        """Statements issued at least threshold times, the usual sign of an N+1 loop."""
+        return {sql: count for sql, count in self.statement_counts.items() if count >= threshold}
+    
+    def as_dict(self) -> Dict:
+        return {
+            "operation": self.name,
+            "statements": self.statements,
+            "rows": self.rows,
+            "db_time_ms": round(self.db_time_ms, 3)
+        }
+
+# Operations currently open in this context, outermost first; a statement counts toward all of them
+_active_operations: ContextVar[Tuple[OperationStats, ...]] = ContextVar("active_operations", default=())
+
+_slow_statement_ms: float = 0.0
+
+@contextmanager
+def track_operation(name: str) -> Generator[OperationStats, None, None]:
+    """Attribute every statement run inside the block, in this context, to the named operation."""
+    stats = OperationStats(name)
+    token = _active_operations.set(_active_operations.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active_operations.reset(token)
+        logger.debug(
+            "%s: %d statements, %d rows, %.1f ms in database",
+            stats.name, stats.statements, stats.rows, stats.db_time_ms
+        )
+        for statement, count in stats.repeated_statements().items():
+            logger.debug("%s: statement ran %d times: %s", stats.name, count, statement)
+
+def instrumented(name: Optional[str] = None) -> Callable:
+    """Decorator form of track_operation; defaults to the function's qualified name."""
+    def decorator(func: Callable) -> Callable:
+        operation = name or func.__qualname__
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with track_operation(operation):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def instrument_engine(engine: Engine, slow_statement_ms: float = 0.0) -> None:
+    """Register statement timing hooks on the engine; slow_statement_ms of 0 disables slow logging."""
+    global _slow_statement_ms
+    _slow_statement_ms = slow_statement_ms
+    
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the statement's own execution context, so a statement that fails leaves nothing behind
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_query_start", None)
+    if start is None:
+        return
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    # Drivers report -1 when they don't know the row count (e.g. SQLite SELECTs)
+    rows = max(cursor.rowcount, 0)
+    
+    operations = _active_operations.get()
+    for stats in operations:
+        stats.record(statement, rows, elapsed_ms)
+    
+    if _slow_statement_ms and elapsed_ms >= _slow_statement_ms:
+        logger.warning(
+            "Slow statement (%.1f ms) in %s: %s",
+            elapsed_ms, operations[-1].name if operations else "<no operation>", statement
+        )
@@ -0,0 +1,34 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from config import Config
+from .schema import GAME_TABLES, PARTITION_BY_GAME
+
+def create_partitions(engine: Engine) -> None:
+    """Create the fixed partitions: N hash buckets, or the DEFAULT partition for list partitioning."""
+    with engine.begin() as connection:
+        for model in GAME_TABLES:
+            table = model.__tablename__
+            if PARTITION_BY_GAME == "hash":
+                modulus = Config.db.game_partitions
+                for remainder in range(modulus):
+                    connection.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS {table}_p{remainder} PARTITION OF {table} "
+                        f"FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder})"
+                    ))
+            elif PARTITION_BY_GAME == "list":
+                connection.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"
+                ))
+
+def create_game_partitions(db: Session, game_id: int) -> None:
+    """With list partitioning, give a new game its own partition of every game table."""
+    if PARTITION_BY_GAME != "list":
+        return
+    
+    for model in GAME_TABLES:
+        table = model.__tablename__
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {table}_g{int(game_id)} PARTITION OF {table} "
+            f"FOR VALUES IN ({int(game_id)})"
+        ))
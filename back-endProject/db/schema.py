@@ -1,78 +1,208 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, CheckConstraint
+from sqlalchemy import (
+    create_engine, inspect, text, Column, Integer, String, Float, ForeignKey, ForeignKeyConstraint,
+    CheckConstraint, UniqueConstraint, Index, LargeBinary, or_
+)
+from sqlalchemy.schema import CreateColumn
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from sqlalchemy.sql import func
 from sqlalchemy import DateTime
-from config import Config, ApprovalStatus
+from sqlalchemy.engine import Engine, URL, make_url
+from typing import List, Optional
+from config import Config, ApprovalStatus, ApprovalEntity, DatabaseConfig
+from .instrumentation import instrument_engine
 
 Base = declarative_base()
-engine = create_engine(Config.db.url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
-class Company(Base):
-    __tablename__ = "companies"
+_engine: Optional[Engine] = None
+
+def get_engine() -> Engine:
+    """Return the process-wide engine, building it on first use."""
+    global _engine
+    if _engine is None:
+        _engine = _build_engine(Config.db)
+        SessionLocal.configure(bind=_engine)
+    return _engine
+
+def configure_engine(url: Optional[str] = None) -> Engine:
+    """Drop the current engine and rebuild it, optionally against a different URL."""
+    global _engine
+    if url is not None:
+        Config.db.database_url = url
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+    return get_engine()
+
+def _build_engine(db_config: DatabaseConfig) -> Engine:
+    url = make_url(db_config.url)
+    options = engine_options(db_config, url)
+    if db_config.statement_timeout_ms and url.get_backend_name() == "postgresql":
+        options["connect_args"] = {"options": f"-c statement_timeout={db_config.statement_timeout_ms}"}
+    
+    engine = create_engine(url, **options)
+    instrument_engine(engine, db_config.slow_statement_ms)
+    return engine
+
+def engine_options(db_config: DatabaseConfig, url: URL) -> dict:
+    """create_engine keyword arguments shared by the sync and async engines."""
+    options = {"pool_pre_ping": db_config.pool_pre_ping}
+    
+    # SQLite is for local files and tests; pool sizing and timeouts only apply to servers
+    if url.get_backend_name() != "sqlite":
+        options.update(
+            pool_size=db_config.pool_size,
+            max_overflow=db_config.max_overflow,
+            pool_recycle=db_config.pool_recycle
+        )
+    return options
+
+# Postgres declarative partitioning by game, fixed when the models are defined; "" disables it
+PARTITION_BY_GAME = (
+    Config.db.partition_by_game if make_url(Config.db.url).get_backend_name() == "postgresql" else ""
+)
+
+def _game_id_column() -> Column:
+    # Postgres requires the partition key in every unique constraint, so it joins the primary key
+    return Column(Integer, ForeignKey("games.id"), nullable=False, primary_key=bool(PARTITION_BY_GAME))
+
+def _partitioned(*args) -> tuple:
+    if not PARTITION_BY_GAME:
+        return args
+    return args + ({"postgresql_partition_by": f"{PARTITION_BY_GAME.upper()} (game_id)"},)
+
+class Game(Base):
+    __tablename__ = "games"
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False, unique=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class Company(Base):
+    __tablename__ = "companies"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    game_id = _game_id_column()
+    name = Column(String(100), nullable=False)
     price = Column(Float, nullable=False)
     shares = Column(Integer, nullable=False)
+    version = Column(Integer, nullable=False, server_default="1")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
-    bids = relationship("Bid", back_populates="company", cascade="all, delete-orphan")
+    # ORM updates only apply if nobody else changed the row since it was read
+    __mapper_args__ = {"version_id_col": version}
+    
+    bids = relationship("Bid", back_populates="company", cascade="all, delete-orphan", overlaps="bids")
     outputs = relationship("CalculatedOutput", back_populates="company", uselist=False)
     
-    __table_args__ = (
+    __table_args__ = _partitioned(
         CheckConstraint('price > 0', name='positive_price'),
         CheckConstraint('shares > 0', name='positive_shares'),
+        UniqueConstraint('game_id', 'name', name='uq_companies_game_name'),
+        # Target of the game-scoped foreign keys below
+        UniqueConstraint('game_id', 'id', name='uq_companies_game_id'),
     )
 
 class Investor(Base):
     __tablename__ = "investors"
     
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(100), nullable=False, unique=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    game_id = _game_id_column()
+    name = Column(String(100), nullable=False)
+    # Oversubscribed offerings fill lower tiers completely before the next tier gets any shares
+    priority_tier = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
-    bids = relationship("Bid", back_populates="investor", cascade="all, delete-orphan")
+    bids = relationship("Bid", back_populates="investor", cascade="all, delete-orphan", overlaps="bids")
+    
+    __table_args__ = _partitioned(
+        UniqueConstraint('game_id', 'name', name='uq_investors_game_name'),
+        UniqueConstraint('game_id', 'id', name='uq_investors_game_id'),
+    )
 
 class Bid(Base):
     __tablename__ = "bids"
     
-    id = Column(Integer, primary_key=True, index=True)
-    investor_id = Column(Integer, ForeignKey("investors.id"), nullable=False)
-    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    game_id = _game_id_column()
+    investor_id = Column(Integer, nullable=False)
+    company_id = Column(Integer, nullable=False)
     shares_bid = Column(Integer, nullable=False)
+    version = Column(Integer, nullable=False, server_default="1")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
-    investor = relationship("Investor", back_populates="bids")
-    company = relationship("Company", back_populates="bids")
+    __mapper_args__ = {"version_id_col": version}
+    
+    investor = relationship("Investor", back_populates="bids", overlaps="bids,company")
+    company = relationship("Company", back_populates="bids", overlaps="bids,investor")
     
-    __table_args__ = (
+    __table_args__ = _partitioned(
         CheckConstraint('shares_bid >= 0', name='non_negative_bid'),
+        # Composite keys keep a bid's investor and company inside the bid's own game
+        ForeignKeyConstraint(['game_id', 'investor_id'], ['investors.game_id', 'investors.id']),
+        ForeignKeyConstraint(['game_id', 'company_id'], ['companies.game_id', 'companies.id']),
+        # One bid per investor and company; also serves lookups by investor
+        UniqueConstraint('game_id', 'investor_id', 'company_id', name='uq_bids_game_investor_company'),
+        Index('ix_bids_game_company', 'game_id', 'company_id'),
     )
 
 class ApprovalToggle(Base):
     __tablename__ = "approval_toggles"
     
-    id = Column(Integer, primary_key=True, index=True)
-    field_name = Column(String(100), nullable=False, unique=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    game_id = _game_id_column()
+    # What is being approved: a company, or one investor's bid on a company
+    entity_type = Column(String(10), nullable=False)
+    company_id = Column(Integer, nullable=False)
+    investor_id = Column(Integer, nullable=True)
     team1_status = Column(Integer, default=ApprovalStatus.TBD, nullable=False)
     team2_status = Column(Integer, default=ApprovalStatus.TBD, nullable=False)
+    version = Column(Integer, nullable=False, server_default="1")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
-    __table_args__ = (
+    __mapper_args__ = {"version_id_col": version}
+    
+    __table_args__ = _partitioned(
         CheckConstraint('team1_status IN (0, 1)', name='valid_team1_status'),
         CheckConstraint('team2_status IN (0, 1)', name='valid_team2_status'),
+        CheckConstraint(
+            f"(entity_type = '{ApprovalEntity.COMPANY.value}' AND investor_id IS NULL) OR "
+            f"(entity_type = '{ApprovalEntity.BID.value}' AND investor_id IS NOT NULL)",
+            name='valid_approval_entity'
+        ),
+        ForeignKeyConstraint(['game_id', 'company_id'], ['companies.game_id', 'companies.id']),
+        ForeignKeyConstraint(['game_id', 'investor_id'], ['investors.game_id', 'investors.id']),
+        # One toggle per company and one per bid; the upserts in ApprovalManager target these
+        Index(
+            'uq_approval_toggles_company', 'game_id', 'company_id', unique=True,
+            postgresql_where=entity_type == ApprovalEntity.COMPANY.value,
+            sqlite_where=entity_type == ApprovalEntity.COMPANY.value,
+        ),
+        Index(
+            'uq_approval_toggles_bid', 'game_id', 'investor_id', 'company_id', unique=True,
+            postgresql_where=entity_type == ApprovalEntity.BID.value,
+            sqlite_where=entity_type == ApprovalEntity.BID.value,
+        ),
+        # A company's own toggle and all bid toggles on it, as one range
+        Index('ix_approval_toggles_game_company', 'game_id', 'company_id'),
+        # Partial index over not-yet-approved rows so readiness is an EXISTS probe
+        Index(
+            'ix_approval_toggles_pending', 'game_id',
+            postgresql_where=or_(team1_status != int(ApprovalStatus.OK), team2_status != int(ApprovalStatus.OK)),
+            sqlite_where=or_(team1_status != int(ApprovalStatus.OK), team2_status != int(ApprovalStatus.OK)),
+        ),
     )
 
 class CalculatedOutput(Base):
     __tablename__ = "calculated_outputs"
     
-    id = Column(Integer, primary_key=True, index=True)
-    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False, unique=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    game_id = _game_id_column()
+    company_id = Column(Integer, nullable=False)
     total_bid = Column(Integer, nullable=False, default=0)
     capital_raised = Column(Float, nullable=False, default=0.0)
     subscription_status = Column(String(20), nullable=False)
@@ -80,17 +210,111 @@ class CalculatedOutput(Base):
     
     company = relationship("Company", back_populates="outputs")
     
-    __table_args__ = (
+    __table_args__ = _partitioned(
         CheckConstraint('total_bid >= 0', name='non_negative_total_bid'),
         CheckConstraint('capital_raised >= 0', name='non_negative_capital'),
+        ForeignKeyConstraint(['game_id', 'company_id'], ['companies.game_id', 'companies.id']),
+        UniqueConstraint('game_id', 'company_id', name='uq_calculated_outputs_game_company'),
+    )
+
+class Allocation(Base):
+    """Shares each bid actually receives, replaced in bulk whenever the allocation is recalculated."""
+    __tablename__ = "allocations"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    game_id = _game_id_column()
+    investor_id = Column(Integer, nullable=False)
+    company_id = Column(Integer, nullable=False)
+    shares_allocated = Column(Integer, nullable=False)
+    calculated_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = _partitioned(
+        CheckConstraint('shares_allocated >= 0', name='non_negative_allocation'),
+        ForeignKeyConstraint(['game_id', 'investor_id'], ['investors.game_id', 'investors.id']),
+        ForeignKeyConstraint(['game_id', 'company_id'], ['companies.game_id', 'companies.id']),
+        # Leads with the investor, so one investor's fills are a single range
+        UniqueConstraint('game_id', 'investor_id', 'company_id', name='uq_allocations_game_investor_company'),
+    )
+
+class ChangeSequence(Base):
+    __tablename__ = "change_sequence"
+    
+    game_id = Column(Integer, ForeignKey("games.id"), primary_key=True)
+    channel = Column(String(50), primary_key=True)
+    seq = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = _partitioned()
+
+class ResultSnapshot(Base):
+    """Frozen results of one approved round; rows are only ever inserted, never updated."""
+    __tablename__ = "result_snapshots"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    game_id = _game_id_column()
+    round = Column(Integer, nullable=False)
+    # Change sequences of the data the results were computed from
+    data_version = Column(String(200), nullable=False)
+    # zlib-compressed JSON of company results, investor summary and market statistics
+    payload = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = _partitioned(
+        CheckConstraint('round > 0', name='positive_round'),
+        UniqueConstraint('game_id', 'round', name='uq_result_snapshots_game_round'),
     )
 
+# Tables carrying game_id, in creation order
+GAME_TABLES = [
+    Company, Investor, Bid, ApprovalToggle, CalculatedOutput, Allocation, ChangeSequence, ResultSnapshot
+]
+
 def init_db():
+    engine = get_engine()
     Base.metadata.create_all(bind=engine)
+    add_missing_columns(engine)
+    if PARTITION_BY_GAME:
+        from .partitions import create_partitions
+        create_partitions(engine)
     return engine
 
+def reset_db():
+    """Drop every table and create them again; every game's data is lost."""
+    engine = get_engine()
+    Base.metadata.drop_all(bind=engine)
+    return init_db()
+
+def add_missing_columns(engine: Engine) -> List[str]:
+    """Add the columns models gained after their tables were created; returns them as table.column.
+    
+    create_all never alters an existing table. A missing column that is part of the primary key, or
+    NOT NULL without a server default, can't be added to rows that already exist; then nothing is
+    changed and a RuntimeError asks for reset_db (main.py --reset-db).
+    """
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        missing = []
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            missing.extend(column for column in table.columns if column.name not in existing)
+        blocking = [
+            f"{column.table.name}.{column.name}" for column in missing
+            if column.primary_key or (not column.nullable and column.server_default is None)
+        ]
+        if blocking:
+            raise RuntimeError(
+                f"The database predates columns that can't be added in place ({', '.join(blocking)}); "
+                "back up anything you need and run python main.py --reset-db"
+            )
+        
+        for column in missing:
+            connection.execute(text(
+                f"ALTER TABLE {column.table.name} ADD COLUMN {CreateColumn(column).compile(dialect=engine.dialect)}"
+            ))
+    return [f"{column.table.name}.{column.name}" for column in missing]
+
 def get_db():
-    db = SessionLocal()
+    db = SessionLocal(bind=get_engine())
     try:
         yield db
     finally:
@@ -1,11 +1,12 @@
 from contextlib import contextmanager
-from typing import Generator
+from typing import Generator, Optional
+from sqlalchemy import text
 from sqlalchemy.orm import Session
-from .schema import SessionLocal
+from .schema import SessionLocal, get_engine
 
 @contextmanager
 def get_session() -> Generator[Session, None, None]:
-    session = SessionLocal()
+    session = SessionLocal(bind=get_engine())
     try:
         yield session
         session.commit()
@@ -15,8 +16,35 @@ def get_session() -> Generator[Session, None, None]:
     finally:
         session.close()
 
+@contextmanager
+def use_session(db: Optional[Session] = None) -> Generator[Session, None, None]:
+    """Join the caller's session if one is given, otherwise run in a new one."""
+    if db is not None:
+        yield db
+        return
+    
+    with get_session() as session:
+        yield session
+
+@contextmanager
+def read_only_session() -> Generator[Session, None, None]:
+    """A session whose reads all see one snapshot of the database; it is rolled back, never committed."""
+    engine = get_engine()
+    with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            connection.execution_options(isolation_level="REPEATABLE READ", postgresql_readonly=True)
+        
+        session = SessionLocal(bind=connection)
+        try:
+            # pysqlite defers BEGIN until the first write; start the read transaction explicitly
+            if engine.dialect.name == "sqlite":
+                session.execute(text("BEGIN"))
+            yield session
+        finally:
+            session.close()
+
 def get_db_session() -> Session:
-    return SessionLocal()
+    return SessionLocal(bind=get_engine())
 
 # Quick test - remove later
 if __name__ == "__main__":
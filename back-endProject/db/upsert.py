@@ -0,0 +1,103 @@
+import csv
+import io
+from typing import Iterable, List, Optional, Sequence
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.dialects import postgresql, sqlite
+from .schema import Bid
+from .concurrency import take_write_lock
+
+# Rows per multi-VALUES statement; keeps bind parameters under SQLite's 32k limit
+UPSERT_BATCH_SIZE = 1000
+
+# Rows buffered per COPY / executemany in bulk_insert; input is streamed, never held whole
+BULK_INSERT_ROWS = 10000
+
+def dialect_insert(db: Session, model):
+    """Return an INSERT construct that supports ON CONFLICT for the session's dialect."""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(model)
+    return postgresql.insert(model)
+
+def upsert_bid(db: Session, game_id: int, investor_id: int, company_id: int, shares: int,
+               version: Optional[int] = None) -> Optional[int]:
+    """Insert or overwrite one bid; returns the shares it replaced (0 if new).
+    
+    With version, the write only happens if the bid is still at that version (0: doesn't exist
+    yet), and None is returned otherwise. The old value is read under the lock the write takes, so
+    concurrent writers to one bid each replace what the previous one wrote. On Postgres one UPDATE
+    locks the row in a FOR UPDATE subquery and returns its old shares; on SQLite the database
+    write lock is taken before the old value is read.
+    """
+    key = (Bid.game_id == game_id, Bid.investor_id == investor_id, Bid.company_id == company_id)
+    stmt = dialect_insert(db, Bid).values(
+        game_id=game_id, investor_id=investor_id, company_id=company_id, shares_bid=shares
+    )
+    conflict_target = [Bid.game_id, Bid.investor_id, Bid.company_id]
+    
+    if db.get_bind().dialect.name == "sqlite":
+        take_write_lock(db)
+        previous_shares, previous_version = db.execute(
+            select(Bid.shares_bid, Bid.version).where(*key)
+        ).one_or_none() or (0, 0)
+        if version is not None and version != previous_version:
+            return None
+        db.execute(stmt.on_conflict_do_update(index_elements=conflict_target, set_={
+            "shares_bid": stmt.excluded.shares_bid, "version": Bid.version + 1, "updated_at": func.now()
+        }))
+        return previous_shares
+    
+    locked = select(Bid.id, Bid.shares_bid).where(*key)
+    if version:
+        # Checked again on the latest row once a concurrent writer's lock is released
+        locked = locked.where(Bid.version == version)
+    old = aliased(Bid, locked.with_for_update().subquery())
+    overwrite = update(Bid).where(Bid.id == old.id).values(
+        shares_bid=shares, version=Bid.version + 1, updated_at=func.now()
+    ).returning(old.shares_bid)
+    
+    if version != 0:
+        previous = db.execute(overwrite).scalar_one_or_none()
+        if previous is not None or version is not None:
+            return previous
+    inserted = db.execute(
+        stmt.on_conflict_do_nothing(index_elements=conflict_target).returning(Bid.id)
+    ).scalar_one_or_none()
+    if inserted is not None:
+        return 0
+    if version is not None:
+        return None
+    # A concurrent writer created the bid after our UPDATE found none; overwrite theirs
+    return db.execute(overwrite).scalar_one()
+
+def bulk_insert(db: Session, model, columns: List[str], rows: Iterable[Sequence],
+                chunk_rows: int = BULK_INSERT_ROWS) -> int:
+    """Insert rows (tuples in columns order) chunk by chunk; returns how many were written."""
+    count = 0
+    chunk: List[Sequence] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            count += _insert_chunk(db, model, columns, chunk)
+            chunk = []
+    if chunk:
+        count += _insert_chunk(db, model, columns, chunk)
+    return count
+
+def _insert_chunk(db: Session, model, columns: List[str], chunk: List[Sequence]) -> int:
+    bind = db.get_bind()
+    if bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg2":
+        # COPY streams the chunk as one CSV payload, far cheaper than any INSERT
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(chunk)
+        buffer.seek(0)
+        cursor = db.connection().connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {model.__tablename__} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+        finally:
+            cursor.close()
+    else:
+        db.execute(insert(model), [dict(zip(columns, row)) for row in chunk])
+    return len(chunk)
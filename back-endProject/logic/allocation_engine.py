@@ -0,0 +1,95 @@
+from typing import List, Dict, Optional
+import numpy as np
+from sqlalchemy import and_, delete
+from sqlalchemy.orm import Session
+from db.schema import Allocation, Company
+from db.upsert import bulk_insert
+from config import Config
+from .book_snapshot import BookSnapshot
+
+class AllocationEngine:
+    """Shares each bid receives, computed over the whole bid book at once.
+    
+    Bids are filled in whole lots of lot_size shares. Within a company, priority tiers are served in
+    order: a tier whose demand fits in what is left is filled completely, the first one that does not
+    fit shares the rest pro rata, and later tiers get nothing. Pro-rata quotas are rounded down and the
+    lots left over go one each to the largest remainders (ties to the lower investor id), so a
+    rationed offering always hands out every whole lot.
+    """
+    
+    def __init__(self, game_id: Optional[int] = None, lot_size: Optional[int] = None):
+        self.game_id = game_id if game_id is not None else Config.game.game_id
+        self.lot_size = lot_size if lot_size is not None else Config.game.allocation_lot_size
+    
+    def allocate(self, snapshot: BookSnapshot) -> np.ndarray:
+        """Shares allocated to each bid, in the snapshot's bid order."""
+        requested = snapshot.bid_shares // self.lot_size
+        supply = snapshot.shares // self.lot_size
+        if snapshot.num_bids == 0:
+            return requested * self.lot_size
+        
+        # One group per (company, tier), tiers numbered densely in priority order
+        tier_values, tier_rank = np.unique(snapshot.bid_tier, return_inverse=True)
+        num_tiers = tier_values.size
+        num_groups = snapshot.num_companies * num_tiers
+        group = snapshot.bid_company_index * num_tiers + tier_rank
+        
+        demand = np.bincount(group, weights=requested, minlength=num_groups).astype(np.int64)
+        demand = demand.reshape(snapshot.num_companies, num_tiers)
+        served_before = np.cumsum(demand, axis=1) - demand
+        available = np.clip(supply[:, np.newaxis] - served_before, 0, demand).ravel()
+        demand = demand.ravel()
+        
+        fills = requested.copy()
+        rationed = np.flatnonzero(available[group] < demand[group])
+        if rationed.size == 0:
+            return fills * self.lot_size
+        
+        rationed_group = group[rationed]
+        fills[rationed], remainder = np.divmod(
+            requested[rationed] * available[rationed_group], demand[rationed_group]
+        )
+        leftover = available - np.bincount(group, weights=fills, minlength=num_groups).astype(np.int64)
+        
+        order = rationed[self._remainder_order(rationed_group, remainder, demand[rationed_group],
+                                               snapshot.bid_investor_ids[rationed])]
+        ordered_group = group[order]
+        group_starts = np.flatnonzero(np.r_[True, ordered_group[1:] != ordered_group[:-1]])
+        rank = np.arange(order.size) - np.repeat(group_starts, np.diff(np.r_[group_starts, order.size]))
+        fills[order[rank < leftover[ordered_group]]] += 1
+        
+        return fills * self.lot_size
+    
+    def save(self, db: Session, snapshot: BookSnapshot, allocated: np.ndarray) -> int:
+        """Replace the game's stored allocation with one row per bid."""
+        db.execute(delete(Allocation).where(Allocation.game_id == self.game_id))
+        return bulk_insert(db, Allocation, ["game_id", "investor_id", "company_id", "shares_allocated"], zip(
+            [self.game_id] * snapshot.num_bids,
+            snapshot.bid_investor_ids.tolist(),
+            snapshot.bid_company_ids.tolist(),
+            allocated.tolist()
+        ))
+    
+    def get_investor_allocations(self, db: Session, investor_id: int) -> List[Dict]:
+        """One investor's stored fills, as of the last closed round."""
+        rows = db.query(Company.name, Allocation.shares_allocated).join(
+            Company, and_(Company.game_id == Allocation.game_id, Company.id == Allocation.company_id)
+        ).filter(
+            Allocation.game_id == self.game_id, Allocation.investor_id == investor_id
+        ).order_by(Company.id)
+        return [
+            {"company_name": company_name, "shares_allocated": shares_allocated}
+            for company_name, shares_allocated in rows
+        ]
+    
+    def _remainder_order(self, group: np.ndarray, remainder: np.ndarray, demand: np.ndarray,
+                         investor_ids: np.ndarray) -> np.ndarray:
+        # Sort by group, then largest remainder, then investor id. Packed into one int64 key when the
+        # three fit, which sorts several times faster than lexsort over a million bids.
+        group_bits = int(group.max()).bit_length()
+        remainder_bits = int(demand.max()).bit_length()
+        investor_bits = int(investor_ids.max()).bit_length()
+        if group_bits + remainder_bits + investor_bits <= 63:
+            key = (group << (remainder_bits + investor_bits)) | ((demand - 1 - remainder) << investor_bits)
+            return np.argsort(key | investor_ids)
+        return np.lexsort((investor_ids, -remainder, group))
@@ -1,79 +1,242 @@
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, NamedTuple, Optional, Sequence, Tuple, Union
 from sqlalchemy.orm import Session
-from ..db.schema import ApprovalToggle
-from ..db.session import get_session
-from config import ApprovalStatus
+from sqlalchemy import exists, or_, and_, func, tuple_
+from db.schema import ApprovalToggle
+from db.session import use_session
+from db.concurrency import take_write_lock, CONFLICT_MESSAGE
+from db.upsert import dialect_insert, UPSERT_BATCH_SIZE
+from db.changes import notify_change, APPROVALS
+from config import Config, ApprovalStatus, ApprovalEntity
+
+class ApprovalKey(NamedTuple):
+    """What a toggle approves: a company, or one investor's bid on a company."""
+    entity_type: ApprovalEntity
+    company_id: int
+    investor_id: Optional[int] = None
+    
+    @classmethod
+    def for_company(cls, company_id: int) -> "ApprovalKey":
+        return cls(ApprovalEntity.COMPANY, company_id)
+    
+    @classmethod
+    def for_bid(cls, investor_id: int, company_id: int) -> "ApprovalKey":
+        return cls(ApprovalEntity.BID, company_id, investor_id)
+    
+    @classmethod
+    def parse(cls, label: str) -> Optional["ApprovalKey"]:
+        """Read a label such as 'company_3' or 'bid_2_3' (investor, company) back into a key."""
+        parts = label.split("_")
+        try:
+            if parts[0] == ApprovalEntity.COMPANY.value and len(parts) == 2:
+                return cls.for_company(int(parts[1]))
+            if parts[0] == ApprovalEntity.BID.value and len(parts) == 3:
+                return cls.for_bid(int(parts[1]), int(parts[2]))
+        except ValueError:
+            pass
+        return None
+    
+    @property
+    def label(self) -> str:
+        """The display form shown to teams and accepted from them."""
+        if self.entity_type == ApprovalEntity.COMPANY:
+            return f"company_{self.company_id}"
+        return f"bid_{self.investor_id}_{self.company_id}"
+
+# Approval methods take keys, or labels from the CLI and API
+FieldKey = Union[ApprovalKey, str]
 
 class ApprovalManager:
-    def __init__(self):
+    def __init__(self, game_id: Optional[int] = None):
         self.status_enum = ApprovalStatus
+        self.game_id = game_id if game_id is not None else Config.game.game_id
+    
+    def set_approval_status(self, field: FieldKey, team: str, status: ApprovalStatus,
+                            db: Optional[Session] = None) -> bool:
+        return self.set_many([field], team, status, db)[0]
     
-    def set_approval_status(self, field_name: str, team: str, status: ApprovalStatus) -> bool:
+    def set_many(self, fields: Sequence[FieldKey], team: str, status: ApprovalStatus,
+                 db: Optional[Session] = None,
+                 versions: Optional[Sequence[int]] = None) -> Tuple[bool, str]:
+        """Set a team's status on existing toggles; changes nothing if any field has none.
+        
+        With versions, one per field as get_pending_approvals reports them, the toggles are only
+        written if none changed since; the message is CONFLICT_MESSAGE only when one did.
+        """
         if team not in ["team1", "team2"]:
-            return False
+            return False, "Invalid team. Use 'team1' or 'team2'"
+        if versions is not None and len(versions) != len(fields):
+            return False, "Give one version per field"
         
-        with get_session() as db:
-            toggle = db.query(ApprovalToggle).filter(
-                ApprovalToggle.field_name == field_name
-            ).first()
-            
-            if not toggle:
-                toggle = ApprovalToggle(
-                    field_name=field_name,
-                    team1_status=ApprovalStatus.TBD,
-                    team2_status=ApprovalStatus.TBD
-                )
-                db.add(toggle)
-            
-            if team == "team1":
-                toggle.team1_status = status
-            else:
-                toggle.team2_status = status
+        keys = [self._to_key(field) for field in fields]
+        status_column = getattr(ApprovalToggle, f"{team}_status")
+        with use_session(db) as session:
+            if versions is not None:
+                # Versions are compared first and written after, so nobody may write in between
+                take_write_lock(session)
+            current = self._current_versions(session, [key for key in keys if key is not None],
+                                             lock=versions is not None)
+            unknown = [self._label(field) for field, key in zip(fields, keys) if key not in current]
+            if unknown:
+                return False, f"Unknown fields: {', '.join(unknown)}"
+            if versions is not None and any(current[key] != version for key, version in zip(keys, versions)):
+                return False, CONFLICT_MESSAGE
             
-            return True
+            for clause in self._keys_clauses(list(current)):
+                session.query(ApprovalToggle).filter(ApprovalToggle.game_id == self.game_id, clause).update({
+                    status_column: int(status),
+                    ApprovalToggle.version: ApprovalToggle.version + 1,
+                    ApprovalToggle.updated_at: func.now()
+                }, synchronize_session=False)
+            notify_change(session, self.game_id, APPROVALS)
+        
+        return True, "Approvals updated"
+    
+    def unknown_fields(self, fields: Sequence[FieldKey], db: Optional[Session] = None) -> List[str]:
+        """Labels of the fields that don't name a company or bid, or that have no toggle in this game."""
+        keys = [self._to_key(field) for field in fields]
+        with use_session(db) as session:
+            current = self._current_versions(session, [key for key in keys if key is not None])
+        return [self._label(field) for field, key in zip(fields, keys) if key not in current]
+    
+    def reset_approval(self, field: FieldKey, team: str, db: Optional[Session] = None) -> None:
+        """Send a team's approval of a company or bid that was just written back to TBD.
+        
+        Unlike set_many this creates the toggle when it is missing, as it is for a bid the write created.
+        """
+        keys = self._to_keys([field])
+        if team not in ["team1", "team2"] or keys is None:
+            return
+        
+        with use_session(db) as session:
+            self._upsert_toggles(session, [{
+                **self._key_columns(keys[0]),
+                "team1_status": int(ApprovalStatus.TBD),
+                "team2_status": int(ApprovalStatus.TBD)
+            }], [f"{team}_status"])
+            notify_change(session, self.game_id, APPROVALS)
+    
+    def create_approvals(self, fields: Sequence[FieldKey], db: Optional[Session] = None) -> None:
+        rows = [
+            {
+                **self._key_columns(key),
+                "team1_status": int(ApprovalStatus.TBD),
+                "team2_status": int(ApprovalStatus.TBD)
+            }
+            for key in dict.fromkeys(self._to_keys(fields) or [])
+        ]
+        
+        with use_session(db) as session:
+            self._upsert_toggles(session, rows, ["team1_status", "team2_status"])
+            notify_change(session, self.game_id, APPROVALS)
     
-    def reset_team2_approvals(self) -> None:
-        with get_session() as db:
-            db.query(ApprovalToggle).update({
-                ApprovalToggle.team2_status: ApprovalStatus.TBD
+    def set_investor_bids(self, investor_id: int, team: str, status: ApprovalStatus,
+                          db: Optional[Session] = None) -> bool:
+        """Set the status of every bid approval of one investor in a single indexed UPDATE."""
+        if team not in ["team1", "team2"]:
+            return False
+        
+        with use_session(db) as db:
+            db.query(ApprovalToggle).filter(
+                ApprovalToggle.game_id == self.game_id,
+                ApprovalToggle.entity_type == ApprovalEntity.BID.value,
+                ApprovalToggle.investor_id == investor_id
+            ).update({
+                getattr(ApprovalToggle, f"{team}_status"): int(status),
+                ApprovalToggle.version: ApprovalToggle.version + 1,
+                ApprovalToggle.updated_at: func.now()
+            }, synchronize_session=False)
+            notify_change(db, self.game_id, APPROVALS)
+        
+        return True
+    
+    def invalidate_dependents(self, changed: FieldKey, team: str, db: Optional[Session] = None) -> int:
+        """Send the team's approvals of everything that depends on a changed company or bid back to TBD.
+        
+        A company's own toggle and every bid on it depend on the company; a bid only on itself.
+        Returns how many toggles were reset.
+        """
+        keys = self._to_keys([changed])
+        if team not in ["team1", "team2"] or keys is None:
+            return 0
+        
+        status_column = getattr(ApprovalToggle, f"{team}_status")
+        with use_session(db) as db:
+            # Rows already at TBD are left alone, so only approved dependents are written and locked
+            reset = db.query(ApprovalToggle).filter(
+                ApprovalToggle.game_id == self.game_id,
+                self._dependents_clause(keys[0]),
+                status_column != int(ApprovalStatus.TBD)
+            ).update({
+                status_column: int(ApprovalStatus.TBD),
+                ApprovalToggle.version: ApprovalToggle.version + 1,
+                ApprovalToggle.updated_at: func.now()
+            }, synchronize_session=False)
+            if reset:
+                notify_change(db, self.game_id, APPROVALS)
+            return reset
+    
+    def reset_team2_approvals(self, db: Optional[Session] = None) -> None:
+        with use_session(db) as db:
+            db.query(ApprovalToggle).filter(ApprovalToggle.game_id == self.game_id).update({
+                ApprovalToggle.team2_status: ApprovalStatus.TBD,
+                ApprovalToggle.version: ApprovalToggle.version + 1,
+                ApprovalToggle.updated_at: func.now()
             })
+            notify_change(db, self.game_id, APPROVALS)
     
-    def check_all_approved(self) -> bool:
-        with get_session() as db:
-            toggles = db.query(ApprovalToggle).all()
-            return all(
-                toggle.team1_status == ApprovalStatus.OK and 
-                toggle.team2_status == ApprovalStatus.OK
-                for toggle in toggles
-            )
+    def check_all_approved(self, db: Optional[Session] = None) -> bool:
+        with use_session(db) as db:
+            return not db.query(exists().where(
+                ApprovalToggle.game_id == self.game_id, self._pending_clause()
+            )).scalar()
     
-    def get_pending_approvals(self) -> List[Dict]:
-        with get_session() as db:
-            toggles = db.query(ApprovalToggle).all()
+    def get_pending_approvals(self, db: Optional[Session] = None, company_id: Optional[int] = None,
+                              investor_id: Optional[int] = None) -> List[Dict]:
+        """Every approval of the game, or only those of one company (its own and its bids) or one investor."""
+        with use_session(db) as db:
+            query = db.query(
+                ApprovalToggle.entity_type, ApprovalToggle.company_id, ApprovalToggle.investor_id,
+                ApprovalToggle.team1_status, ApprovalToggle.team2_status, ApprovalToggle.version
+            ).filter(ApprovalToggle.game_id == self.game_id)
+            if company_id is not None:
+                query = query.filter(ApprovalToggle.company_id == company_id)
+            if investor_id is not None:
+                query = query.filter(
+                    ApprovalToggle.entity_type == ApprovalEntity.BID.value,
+                    ApprovalToggle.investor_id == investor_id
+                )
+            
             return [
                 {
-                    "field_name": toggle.field_name,
-                    "team1_status": self._status_to_string(toggle.team1_status),
-                    "team2_status": self._status_to_string(toggle.team2_status)
+                    "field_name": ApprovalKey(ApprovalEntity(entity_type), toggle_company_id, toggle_investor_id).label,
+                    "team1_status": self._status_to_string(team1_status),
+                    "team2_status": self._status_to_string(team2_status),
+                    "version": version
                 }
-                for toggle in toggles
+                for entity_type, toggle_company_id, toggle_investor_id, team1_status, team2_status, version in query
             ]
     
-    def create_company_approval(self, company_id: int) -> None:
-        field_name = f"company_{company_id}"
-        self.set_approval_status(field_name, "team1", ApprovalStatus.TBD)
-        self.set_approval_status(field_name, "team2", ApprovalStatus.TBD)
-    
-    def create_bid_approval(self, investor_id: int, company_id: int) -> None:
-        field_name = f"bid_{investor_id}_{company_id}"
-        self.set_approval_status(field_name, "team1", ApprovalStatus.TBD)
-        self.set_approval_status(field_name, "team2", ApprovalStatus.TBD)
-    
-    def get_field_status(self, field_name: str) -> Dict[str, int]:
-        with get_session() as db:
-            toggle = db.query(ApprovalToggle).filter(
-                ApprovalToggle.field_name == field_name
-            ).first()
+    def all_approved(self, approvals: List[Dict]) -> bool:
+        """Readiness from an already loaded get_pending_approvals() list."""
+        return all(
+            approval["team1_status"] == "OK" and approval["team2_status"] == "OK"
+            for approval in approvals
+        )
+    
+    def create_company_approval(self, company_id: int, db: Optional[Session] = None) -> None:
+        self.create_approvals([ApprovalKey.for_company(company_id)], db)
+    
+    def create_bid_approval(self, investor_id: int, company_id: int, db: Optional[Session] = None) -> None:
+        self.create_approvals([ApprovalKey.for_bid(investor_id, company_id)], db)
+    
+    def get_field_status(self, field: FieldKey, db: Optional[Session] = None) -> Dict[str, int]:
+        keys = self._to_keys([field])
+        with use_session(db) as db:
+            toggle = None
+            if keys is not None:
+                toggle = db.query(ApprovalToggle.team1_status, ApprovalToggle.team2_status).filter(
+                    ApprovalToggle.game_id == self.game_id, self._key_clause(keys[0])
+                ).first()
             
             if not toggle:
                 return {
@@ -86,5 +249,102 @@ class ApprovalManager:
                 "team2_status": toggle.team2_status
             }
     
+    def _to_keys(self, fields: Sequence[FieldKey]) -> Optional[List[ApprovalKey]]:
+        # None if any label doesn't name a company or bid
+        keys = [self._to_key(field) for field in fields]
+        return None if any(key is None for key in keys) else keys
+    
+    def _to_key(self, field: FieldKey) -> Optional[ApprovalKey]:
+        if isinstance(field, ApprovalKey):
+            return field
+        return ApprovalKey.parse(field) if isinstance(field, str) else None
+    
+    def _label(self, field: FieldKey) -> str:
+        return field.label if isinstance(field, ApprovalKey) else str(field)
+    
+    def _current_versions(self, db: Session, keys: Sequence[ApprovalKey],
+                          lock: bool = False) -> Dict[ApprovalKey, int]:
+        # Version of each key that has a toggle; with lock, the rows stay locked until commit (Postgres)
+        current = {}
+        for clause in self._keys_clauses(list(dict.fromkeys(keys))):
+            query = db.query(
+                ApprovalToggle.entity_type, ApprovalToggle.company_id, ApprovalToggle.investor_id,
+                ApprovalToggle.version
+            ).filter(ApprovalToggle.game_id == self.game_id, clause)
+            if lock:
+                query = query.with_for_update()
+            current.update(
+                (ApprovalKey(ApprovalEntity(entity_type), company_id, investor_id), version)
+                for entity_type, company_id, investor_id, version in query
+            )
+        return current
+    
+    def _keys_clauses(self, keys: Sequence[ApprovalKey]) -> Iterator:
+        # One IN list per entity type and batch, each a range scan of the type's unique index
+        company_ids = [key.company_id for key in keys if key.entity_type == ApprovalEntity.COMPANY]
+        bids = [(key.investor_id, key.company_id) for key in keys if key.entity_type == ApprovalEntity.BID]
+        for start in range(0, len(company_ids), UPSERT_BATCH_SIZE):
+            yield and_(
+                ApprovalToggle.entity_type == ApprovalEntity.COMPANY.value,
+                ApprovalToggle.company_id.in_(company_ids[start:start + UPSERT_BATCH_SIZE])
+            )
+        for start in range(0, len(bids), UPSERT_BATCH_SIZE):
+            yield and_(
+                ApprovalToggle.entity_type == ApprovalEntity.BID.value,
+                tuple_(ApprovalToggle.investor_id, ApprovalToggle.company_id).in_(bids[start:start + UPSERT_BATCH_SIZE])
+            )
+    
+    def _key_columns(self, key: ApprovalKey) -> Dict:
+        return {
+            "game_id": self.game_id,
+            "entity_type": key.entity_type.value,
+            "company_id": key.company_id,
+            "investor_id": key.investor_id
+        }
+    
+    def _key_clause(self, key: ApprovalKey):
+        if key.entity_type == ApprovalEntity.COMPANY:
+            return and_(
+                ApprovalToggle.entity_type == ApprovalEntity.COMPANY.value,
+                ApprovalToggle.company_id == key.company_id
+            )
+        return and_(
+            ApprovalToggle.entity_type == ApprovalEntity.BID.value,
+            ApprovalToggle.investor_id == key.investor_id,
+            ApprovalToggle.company_id == key.company_id
+        )
+    
+    def _dependents_clause(self, key: ApprovalKey):
+        if key.entity_type == ApprovalEntity.COMPANY:
+            # The company's toggle and its bids' toggles: one range of ix_approval_toggles_game_company
+            return ApprovalToggle.company_id == key.company_id
+        return self._key_clause(key)
+    
+    def _upsert_toggles(self, db: Session, rows: List[Dict], update_columns: List[str]) -> None:
+        # Company and bid toggles are unique on different partial indexes, so each kind gets its own
+        # INSERT ... ON CONFLICT DO UPDATE per batch
+        for entity_type, index_elements in (
+            (ApprovalEntity.COMPANY, [ApprovalToggle.game_id, ApprovalToggle.company_id]),
+            (ApprovalEntity.BID, [ApprovalToggle.game_id, ApprovalToggle.investor_id, ApprovalToggle.company_id]),
+        ):
+            entity_rows = [row for row in rows if row["entity_type"] == entity_type.value]
+            for start in range(0, len(entity_rows), UPSERT_BATCH_SIZE):
+                stmt = dialect_insert(db, ApprovalToggle).values(entity_rows[start:start + UPSERT_BATCH_SIZE])
+                set_ = {column: stmt.excluded[column] for column in update_columns}
+                set_["version"] = ApprovalToggle.version + 1
+                set_["updated_at"] = func.now()
+                db.execute(stmt.on_conflict_do_update(
+                    index_elements=index_elements,
+                    index_where=ApprovalToggle.entity_type == entity_type.value,
+                    set_=set_
+                ))
+    
+    def _pending_clause(self):
+        # Must match the ix_approval_toggles_pending predicate for the index to be used
+        return or_(
+            ApprovalToggle.team1_status != int(ApprovalStatus.OK),
+            ApprovalToggle.team2_status != int(ApprovalStatus.OK)
+        )
+    
     def _status_to_string(self, status: int) -> str:
-        return "OK" if status == ApprovalStatus.OK else "TBD" 
\ No newline at end of file
+        return "OK" if status == ApprovalStatus.OK else "TBD"
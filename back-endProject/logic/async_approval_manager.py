@@ -0,0 +1,52 @@
+from typing import List, Dict, Optional, Sequence, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from .approval_manager import ApprovalManager, FieldKey
+from db.async_session import run_in_session
+from config import ApprovalStatus
+
+class AsyncApprovalManager:
+    """ApprovalManager on AsyncSession; each call reuses the sync statements through run_sync."""
+    
+    def __init__(self, game_id: Optional[int] = None):
+        self.approval_manager = ApprovalManager(game_id)
+    
+    async def set_approval_status(self, field: FieldKey, team: str, status: ApprovalStatus,
+                                  db: Optional[AsyncSession] = None) -> bool:
+        return await run_in_session(db, self.approval_manager.set_approval_status, field, team, status)
+    
+    async def set_many(self, fields: Sequence[FieldKey], team: str, status: ApprovalStatus,
+                       db: Optional[AsyncSession] = None,
+                       versions: Optional[Sequence[int]] = None) -> Tuple[bool, str]:
+        return await run_in_session(db, self.approval_manager.set_many, fields, team, status, versions=versions)
+    
+    async def unknown_fields(self, fields: Sequence[FieldKey], db: Optional[AsyncSession] = None) -> List[str]:
+        return await run_in_session(db, self.approval_manager.unknown_fields, fields)
+    
+    async def reset_approval(self, field: FieldKey, team: str, db: Optional[AsyncSession] = None) -> None:
+        await run_in_session(db, self.approval_manager.reset_approval, field, team)
+    
+    async def create_approvals(self, fields: Sequence[FieldKey], db: Optional[AsyncSession] = None) -> None:
+        await run_in_session(db, self.approval_manager.create_approvals, fields)
+    
+    async def set_investor_bids(self, investor_id: int, team: str, status: ApprovalStatus,
+                                db: Optional[AsyncSession] = None) -> bool:
+        return await run_in_session(db, self.approval_manager.set_investor_bids, investor_id, team, status)
+    
+    async def invalidate_dependents(self, changed: FieldKey, team: str,
+                                    db: Optional[AsyncSession] = None) -> int:
+        return await run_in_session(db, self.approval_manager.invalidate_dependents, changed, team)
+    
+    async def reset_team2_approvals(self, db: Optional[AsyncSession] = None) -> None:
+        await run_in_session(db, self.approval_manager.reset_team2_approvals)
+    
+    async def check_all_approved(self, db: Optional[AsyncSession] = None) -> bool:
+        return await run_in_session(db, self.approval_manager.check_all_approved)
+    
+    async def get_pending_approvals(self, db: Optional[AsyncSession] = None, company_id: Optional[int] = None,
+                                    investor_id: Optional[int] = None) -> List[Dict]:
+        return await run_in_session(
+            db, self.approval_manager.get_pending_approvals, company_id=company_id, investor_id=investor_id
+        )
+    
+    async def get_field_status(self, field: FieldKey, db: Optional[AsyncSession] = None) -> Dict[str, int]:
+        return await run_in_session(db, self.approval_manager.get_field_status, field)
@@ -0,0 +1,33 @@
+from typing import List, Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from .calculation_engine import CalculationEngine
+from .book_snapshot import BookSnapshot
+from db.async_session import run_in_session
+
+class AsyncCalculationEngine:
+    """CalculationEngine on AsyncSession; each call reuses the sync statements through run_sync."""
+    
+    def __init__(self, game_id: Optional[int] = None):
+        self.calculation_engine = CalculationEngine(game_id)
+        self.game_id = self.calculation_engine.game_id
+    
+    async def calculate_company_outputs(self, db: Optional[AsyncSession] = None,
+                                        snapshot: Optional[BookSnapshot] = None) -> List[Dict]:
+        return await run_in_session(db, self.calculation_engine.calculate_company_outputs, snapshot=snapshot)
+    
+    async def calculate_investor_summary(self, db: Optional[AsyncSession] = None,
+                                         snapshot: Optional[BookSnapshot] = None) -> List[Dict]:
+        return await run_in_session(db, self.calculation_engine.calculate_investor_summary, snapshot=snapshot)
+    
+    async def calculate_market_statistics(self, db: Optional[AsyncSession] = None,
+                                          snapshot: Optional[BookSnapshot] = None) -> Dict:
+        return await run_in_session(db, self.calculation_engine.calculate_market_statistics, snapshot=snapshot)
+    
+    async def get_company_outputs(self, db: Optional[AsyncSession] = None) -> List[Dict]:
+        return await run_in_session(db, self.calculation_engine.get_company_outputs)
+    
+    async def get_investor_allocations(self, investor_id: int, db: Optional[AsyncSession] = None) -> List[Dict]:
+        return await run_in_session(db, self.calculation_engine.get_investor_allocations, investor_id=investor_id)
+    
+    async def load_snapshot(self, db: Optional[AsyncSession] = None) -> BookSnapshot:
+        return await run_in_session(db, BookSnapshot.load, game_id=self.game_id)
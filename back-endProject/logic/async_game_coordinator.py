@@ -0,0 +1,78 @@
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from .game_coordinator import GameCoordinator
+from .async_approval_manager import AsyncApprovalManager
+from .async_calculation_engine import AsyncCalculationEngine
+from services.async_company_service import AsyncCompanyService
+from services.async_investor_service import AsyncInvestorService
+from db.async_session import run_in_session, read_only_async_session
+from db.concurrency import retry_on_conflict, CONFLICT_MESSAGE
+
+class AsyncGameCoordinator:
+    """GameCoordinator on AsyncSession, plus a status screen whose independent reads run concurrently."""
+    
+    def __init__(self, game_id: Optional[int] = None):
+        self.game_coordinator = GameCoordinator(game_id)
+        self.game_id = self.game_coordinator.game_id
+        self.approval_manager = AsyncApprovalManager(self.game_id)
+        self.calculation_engine = AsyncCalculationEngine(self.game_id)
+        self.company_service = AsyncCompanyService(self.game_id)
+        self.investor_service = AsyncInvestorService(self.game_id)
+    
+    async def get_game_status(self) -> Dict:
+        async with read_only_async_session() as db:
+            return await db.run_sync(self.game_coordinator.get_game_status)
+    
+    async def get_overview(self) -> Dict:
+        """Everything a status screen shows; each read runs concurrently on its own connection."""
+        status, companies, bid_matrix, approvals = await asyncio.gather(
+            self.get_game_status(),
+            self.company_service.get_all_companies(),
+            self.investor_service.get_bid_matrix(),
+            self.approval_manager.get_pending_approvals()
+        )
+        
+        return {
+            "status": status,
+            "companies": companies,
+            "bid_matrix": bid_matrix,
+            "approvals": approvals
+        }
+    
+    @retry_on_conflict(conflict_result=(False, CONFLICT_MESSAGE))
+    async def validate_and_update_company(self, company_id: int, price: Optional[float] = None,
+                                          shares: Optional[int] = None, version: Optional[int] = None,
+                                          db: Optional[AsyncSession] = None) -> Tuple[bool, str]:
+        return await run_in_session(
+            db, self.game_coordinator.validate_and_update_company, company_id, price, shares, version
+        )
+    
+    async def validate_and_update_bid(self, investor_id: int, company_id: int, shares: int,
+                                      version: Optional[int] = None,
+                                      db: Optional[AsyncSession] = None) -> Tuple[bool, str]:
+        return await run_in_session(
+            db, self.game_coordinator.validate_and_update_bid, investor_id, company_id, shares, version
+        )
+    
+    async def approve_field(self, field_name: str, team: str,
+                            db: Optional[AsyncSession] = None) -> Tuple[bool, str]:
+        return await run_in_session(db, self.game_coordinator.approve_field, field_name, team)
+    
+    async def get_simulation_results(self, db: Optional[AsyncSession] = None) -> Dict:
+        return await run_in_session(db, self.game_coordinator.get_simulation_results)
+    
+    async def get_frozen_results(self, db: Optional[AsyncSession] = None) -> Optional[Dict]:
+        return await run_in_session(db, self.game_coordinator.get_frozen_results)
+    
+    async def freeze_results(self, db: Optional[AsyncSession] = None) -> Optional[Dict]:
+        return await run_in_session(db, self.game_coordinator.freeze_results)
+    
+    async def get_round_results(self, round_number: int, db: Optional[AsyncSession] = None) -> Optional[Dict]:
+        return await run_in_session(db, self.game_coordinator.get_round_results, round_number)
+    
+    async def get_result_rounds(self, db: Optional[AsyncSession] = None) -> List[Dict]:
+        return await run_in_session(db, self.game_coordinator.get_result_rounds)
+    
+    async def get_approval_summary(self, db: Optional[AsyncSession] = None) -> Dict:
+        return await run_in_session(db, self.game_coordinator.get_approval_summary)
@@ -0,0 +1,171 @@
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import List, Dict, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from db.schema import Company, Investor, Bid
+
+def _empty_ids() -> np.ndarray:
+    return np.zeros(0, dtype=np.int64)
+
+@dataclass(frozen=True)
+class BookSnapshot:
+    """Column-oriented, DB-free view of companies (sorted by id) and the bid book."""
+    company_ids: np.ndarray
+    company_names: Tuple[str, ...]
+    prices: np.ndarray
+    shares: np.ndarray
+    bid_investor_ids: np.ndarray
+    bid_company_ids: np.ndarray
+    bid_shares: np.ndarray
+    # Investors outside the default priority tier 0, sorted by id; usually none
+    tiered_investor_ids: np.ndarray = field(default_factory=_empty_ids)
+    investor_tiers: np.ndarray = field(default_factory=_empty_ids)
+    
+    @classmethod
+    def load(cls, db: Session, game_id: int) -> "BookSnapshot":
+        """Load a game's snapshot with one query per table."""
+        companies = db.execute(
+            select(Company.id, Company.name, Company.price, Company.shares).where(
+                Company.game_id == game_id
+            ).order_by(Company.id)
+        ).all()
+        bids = db.execute(
+            select(Bid.investor_id, Bid.company_id, Bid.shares_bid).where(Bid.game_id == game_id)
+        ).all()
+        tiers = db.execute(
+            select(Investor.id, Investor.priority_tier).where(
+                Investor.game_id == game_id, Investor.priority_tier != 0
+            ).order_by(Investor.id)
+        ).all()
+        return cls.from_rows(companies, bids, tiers)
+    
+    @classmethod
+    def from_rows(cls, companies: Sequence[Tuple], bids: Sequence[Tuple],
+                  tiers: Sequence[Tuple] = ()) -> "BookSnapshot":
+        """Build a snapshot from (id, name, price, shares), (investor_id, company_id, shares_bid) and
+        (investor_id, priority_tier) rows; investors without a tier row are in tier 0."""
+        companies = sorted(companies, key=lambda row: row[0])
+        company_ids, company_names, prices, shares = (
+            zip(*companies) if companies else ((), (), (), ())
+        )
+        bid_investor_ids, bid_company_ids, bid_shares = zip(*bids) if bids else ((), (), ())
+        tiered_investor_ids, investor_tiers = zip(*sorted(tiers)) if tiers else ((), ())
+        
+        return cls(
+            company_ids=np.array(company_ids, dtype=np.int64),
+            company_names=tuple(company_names),
+            prices=np.array(prices, dtype=np.float64),
+            shares=np.array(shares, dtype=np.int64),
+            bid_investor_ids=np.array(bid_investor_ids, dtype=np.int64),
+            bid_company_ids=np.array(bid_company_ids, dtype=np.int64),
+            bid_shares=np.array(bid_shares, dtype=np.int64),
+            tiered_investor_ids=np.array(tiered_investor_ids, dtype=np.int64),
+            investor_tiers=np.array(investor_tiers, dtype=np.int64)
+        )
+    
+    @property
+    def num_companies(self) -> int:
+        return len(self.company_ids)
+    
+    @property
+    def num_bids(self) -> int:
+        return len(self.bid_shares)
+    
+    @cached_property
+    def bid_company_index(self) -> np.ndarray:
+        """Position of each bid's company in the company arrays."""
+        return np.searchsorted(self.company_ids, self.bid_company_ids)
+    
+    @cached_property
+    def bid_tier(self) -> np.ndarray:
+        """Priority tier of each bid's investor."""
+        tiers = np.zeros(self.num_bids, dtype=np.int64)
+        if self.tiered_investor_ids.size:
+            position = np.searchsorted(self.tiered_investor_ids, self.bid_investor_ids)
+            position = np.minimum(position, self.tiered_investor_ids.size - 1)
+            tiered = self.tiered_investor_ids[position] == self.bid_investor_ids
+            tiers[tiered] = self.investor_tiers[position[tiered]]
+        return tiers
+    
+    @cached_property
+    def total_bid(self) -> np.ndarray:
+        return np.bincount(
+            self.bid_company_index, weights=self.bid_shares, minlength=self.num_companies
+        ).astype(np.int64)
+    
+    @cached_property
+    def bid_count(self) -> np.ndarray:
+        return np.bincount(self.bid_company_index, minlength=self.num_companies)
+    
+    @cached_property
+    def capital_raised(self) -> np.ndarray:
+        return self.prices * np.minimum(self.total_bid, self.shares)
+    
+    @cached_property
+    def subscription_status(self) -> np.ndarray:
+        return np.select(
+            [self.total_bid > self.shares, self.total_bid == self.shares],
+            ["Over-subscribed", "Fully-subscribed"],
+            default="Under-subscribed"
+        )
+    
+    def company_outputs(self) -> List[Dict]:
+        return [
+            {
+                "company_id": int(self.company_ids[i]),
+                "company_name": self.company_names[i],
+                "total_bid": int(self.total_bid[i]),
+                "capital_raised": float(self.capital_raised[i]),
+                "subscription_status": str(self.subscription_status[i]),
+                "price": float(self.prices[i]),
+                "shares_offered": int(self.shares[i])
+            }
+            for i in range(self.num_companies)
+        ]
+    
+    def investor_summary(self, allocated: Optional[np.ndarray] = None) -> List[Dict]:
+        """Per-company bid statistics; with allocated (shares per bid, in bid order) also what was filled."""
+        distinct_investors = self._distinct_investors_per_company()
+        summary = [
+            {
+                "company_name": self.company_names[i],
+                "total_investors": int(distinct_investors[i]),
+                "average_bid": float(self.total_bid[i] / self.bid_count[i]),
+                "total_bids": int(self.bid_count[i])
+            }
+            for i in np.flatnonzero(self.bid_count)
+        ]
+        if allocated is None:
+            return summary
+        
+        shares_allocated = np.bincount(self.bid_company_index, weights=allocated, minlength=self.num_companies)
+        investors_allocated = np.bincount(self.bid_company_index[allocated > 0], minlength=self.num_companies)
+        for entry, i in zip(summary, np.flatnonzero(self.bid_count)):
+            entry["shares_allocated"] = int(shares_allocated[i])
+            entry["investors_allocated"] = int(investors_allocated[i])
+            entry["fill_ratio"] = float(shares_allocated[i] / self.total_bid[i]) if self.total_bid[i] else 1.0
+        return summary
+    
+    def market_statistics(self) -> Dict:
+        total_capital_offered = float(np.dot(self.prices, self.shares))
+        total_bid_value = float(np.dot(self.bid_shares, self.prices[self.bid_company_index]))
+        
+        return {
+            "total_companies": self.num_companies,
+            "total_investors": int(np.unique(self.bid_investor_ids).size),
+            "total_bids": self.num_bids,
+            "total_capital_offered": total_capital_offered,
+            "total_bid_value": total_bid_value,
+            "market_oversubscription": total_bid_value > total_capital_offered
+        }
+    
+    def _distinct_investors_per_company(self) -> np.ndarray:
+        if self.num_bids == 0:
+            return np.zeros(self.num_companies, dtype=np.int64)
+        
+        # Encode (company, investor) pairs as one key so np.unique drops duplicates
+        stride = int(self.bid_investor_ids.max()) + 1
+        unique_pairs = np.unique(self.bid_company_index * stride + self.bid_investor_ids)
+        return np.bincount(unique_pairs // stride, minlength=self.num_companies)
@@ -1,71 +1,166 @@
 from typing import List, Dict, Optional
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from ..db.schema import Company, Bid, CalculatedOutput
-from ..db.session import get_session
+from sqlalchemy import func, update, case, select, distinct, and_
+from db.schema import Company, Bid, CalculatedOutput
+from db.upsert import dialect_insert, UPSERT_BATCH_SIZE
 from config import Config
+from .book_snapshot import BookSnapshot
+from .allocation_engine import AllocationEngine
 
 class CalculationEngine:
-    def __init__(self):
+    def __init__(self, game_id: Optional[int] = None):
         self.config = Config.game
+        self.game_id = game_id if game_id is not None else Config.game.game_id
+        self.allocation_engine = AllocationEngine(self.game_id)
     
-    def calculate_company_outputs(self, db: Session) -> List[Dict]:
-        companies = db.query(Company).all()
-        results = []
+    def calculate_company_outputs(self, db: Session, snapshot: Optional[BookSnapshot] = None) -> List[Dict]:
+        if snapshot is None:
+            snapshot = BookSnapshot.load(db, self.game_id)
         
-        for company in companies:
-            total_bid = db.query(func.sum(Bid.shares_bid)).filter(
-                Bid.company_id == company.id
-            ).scalar() or 0
-            
-            capital_raised = company.price * min(total_bid, company.shares)
-            subscription_status = self._determine_subscription_status(total_bid, company.shares)
-            
-            self._update_or_create_output(db, company.id, total_bid, capital_raised, subscription_status)
-            
-            results.append({
-                "company_name": company.name,
-                "total_bid": total_bid,
-                "capital_raised": capital_raised,
-                "subscription_status": subscription_status,
-                "price": company.price,
-                "shares_offered": company.shares
-            })
+        results = snapshot.company_outputs()
+        self._upsert_outputs(db, [
+            {
+                "game_id": self.game_id,
+                "company_id": result.pop("company_id"),
+                "total_bid": result["total_bid"],
+                "capital_raised": result["capital_raised"],
+                "subscription_status": result["subscription_status"]
+            }
+            for result in results
+        ])
         
         return results
     
-    def calculate_investor_summary(self, db: Session) -> List[Dict]:
-        companies = db.query(Company).join(Bid).group_by(Company.id).all()
-        summary = []
+    def calculate_investor_summary(self, db: Session, snapshot: Optional[BookSnapshot] = None,
+                                   allocated: Optional[np.ndarray] = None) -> List[Dict]:
+        """Per-investor totals with their fills; allocates in memory unless given the fills."""
+        if snapshot is None:
+            snapshot = BookSnapshot.load(db, self.game_id)
+        if allocated is None:
+            allocated = self.allocation_engine.allocate(snapshot)
+        return snapshot.investor_summary(allocated)
+    
+    def calculate_allocations(self, db: Session, snapshot: Optional[BookSnapshot] = None) -> np.ndarray:
+        """Allocate every offering over the bid book and store the fills; returns shares per bid.
         
-        for company in companies:
-            bids = db.query(Bid).filter(Bid.company_id == company.id).all()
-            total_investors = len(set(bid.investor_id for bid in bids))
-            avg_bid = sum(bid.shares_bid for bid in bids) / len(bids) if bids else 0
-            
-            summary.append({
+        Only closing a round calls this, so reads never rewrite the allocations table.
+        """
+        if snapshot is None:
+            snapshot = BookSnapshot.load(db, self.game_id)
+        
+        allocated = self.allocation_engine.allocate(snapshot)
+        self.allocation_engine.save(db, snapshot, allocated)
+        return allocated
+    
+    def get_investor_allocations(self, db: Session, investor_id: int) -> List[Dict]:
+        return self.allocation_engine.get_investor_allocations(db, investor_id)
+    
+    def calculate_market_statistics(self, db: Session, snapshot: Optional[BookSnapshot] = None) -> Dict:
+        if snapshot is None:
+            # Six totals don't need the whole book in memory; let the database aggregate them
+            return self._aggregate_market_statistics(db)
+        return snapshot.market_statistics()
+    
+    def get_company_outputs(self, db: Session) -> List[Dict]:
+        """Live outputs in one indexed join; bid and company writes keep the rows current."""
+        rows = db.query(Company, CalculatedOutput).outerjoin(
+            CalculatedOutput, and_(
+                CalculatedOutput.game_id == Company.game_id, CalculatedOutput.company_id == Company.id
+            )
+        ).filter(Company.game_id == self.game_id).order_by(Company.id).all()
+        
+        # Companies written outside the maintained paths (e.g. seed data) have no row yet
+        if any(output is None for _, output in rows):
+            return self.calculate_company_outputs(db)
+        
+        return [
+            {
                 "company_name": company.name,
-                "total_investors": total_investors,
-                "average_bid": avg_bid,
-                "total_bids": len(bids)
-            })
+                "total_bid": output.total_bid,
+                "capital_raised": output.capital_raised,
+                "subscription_status": output.subscription_status,
+                "price": company.price,
+                "shares_offered": company.shares
+            }
+            for company, output in rows
+        ]
+    
+    def apply_bid_delta(self, db: Session, company_id: int, delta: int) -> None:
+        """Apply a change in one bid's shares to the company's calculated output.
+        
+        One single-row UPDATE on the write path, so live result views never aggregate the bid book.
+        Price and shares are read from the companies row by that same UPDATE, not from an object
+        loaded earlier in the request, so a concurrent company edit can't leave stale outputs.
+        """
+        total_bid = CalculatedOutput.total_bid + delta
+        result = db.execute(
+            update(CalculatedOutput).where(
+                CalculatedOutput.game_id == self.game_id,
+                CalculatedOutput.company_id == company_id,
+                Company.game_id == CalculatedOutput.game_id,
+                Company.id == CalculatedOutput.company_id
+            ).values(
+                total_bid=total_bid,
+                capital_raised=Company.price * case(
+                    (total_bid < Company.shares, total_bid), else_=Company.shares
+                ),
+                subscription_status=self._subscription_status_expr(total_bid, Company.shares),
+                calculated_at=func.now()
+            )
+        )
         
-        return summary
+        if result.rowcount == 0:
+            self._seed_output(db, company_id)
+    
+    def refresh_company_output(self, db: Session, company_id: int) -> None:
+        """Recompute the company's output after its price or shares changed."""
+        # The edit may still be pending in the session, and the UPDATE reads the stored row
+        db.flush()
+        self.apply_bid_delta(db, company_id, 0)
     
-    def calculate_market_statistics(self, db: Session) -> Dict:
-        total_companies = db.query(Company).count()
-        total_investors = db.query(func.count(func.distinct(Bid.investor_id))).scalar() or 0
-        total_bids = db.query(Bid).count()
+    def _seed_output(self, db: Session, company_id: int) -> None:
+        db.flush()
+        price, shares, total_bid = db.execute(
+            select(
+                Company.price,
+                Company.shares,
+                select(func.coalesce(func.sum(Bid.shares_bid), 0)).where(
+                    Bid.game_id == self.game_id,
+                    Bid.company_id == company_id
+                ).scalar_subquery()
+            ).where(Company.game_id == self.game_id, Company.id == company_id)
+        ).one()
         
-        total_capital_offered = db.query(func.sum(Company.price * Company.shares)).scalar() or 0
-        total_bid_value = db.query(func.sum(Bid.shares_bid * Company.price)).join(Company).scalar() or 0
+        self._upsert_outputs(db, [{
+            "game_id": self.game_id,
+            "company_id": company_id,
+            "total_bid": total_bid,
+            "capital_raised": price * min(total_bid, shares),
+            "subscription_status": self._determine_subscription_status(total_bid, shares)
+        }])
+    
+    def _aggregate_market_statistics(self, db: Session) -> Dict:
+        total_companies, total_investors, total_bids, total_capital_offered, total_bid_value = db.execute(
+            select(
+                select(func.count(Company.id)).where(Company.game_id == self.game_id).scalar_subquery(),
+                select(func.count(distinct(Bid.investor_id))).where(Bid.game_id == self.game_id).scalar_subquery(),
+                select(func.count(Bid.id)).where(Bid.game_id == self.game_id).scalar_subquery(),
+                select(func.coalesce(func.sum(Company.price * Company.shares), 0.0)).where(
+                    Company.game_id == self.game_id
+                ).scalar_subquery(),
+                select(func.coalesce(func.sum(Bid.shares_bid * Company.price), 0.0)).join(
+                    Company, and_(Company.game_id == Bid.game_id, Company.id == Bid.company_id)
+                ).where(Bid.game_id == self.game_id).scalar_subquery()
+            )
+        ).one()
         
         return {
             "total_companies": total_companies,
             "total_investors": total_investors,
             "total_bids": total_bids,
-            "total_capital_offered": total_capital_offered,
-            "total_bid_value": total_bid_value,
+            "total_capital_offered": float(total_capital_offered),
+            "total_bid_value": float(total_bid_value),
             "market_oversubscription": total_bid_value > total_capital_offered
         }
     
@@ -77,21 +172,26 @@ class CalculationEngine:
         else:
             return "Under-subscribed"
     
-    def _update_or_create_output(self, db: Session, company_id: int, total_bid: int, 
-                                capital_raised: float, subscription_status: str) -> None:
-        existing_output = db.query(CalculatedOutput).filter(
-            CalculatedOutput.company_id == company_id
-        ).first()
-        
-        if existing_output:
-            existing_output.total_bid = total_bid
-            existing_output.capital_raised = capital_raised
-            existing_output.subscription_status = subscription_status
-        else:
-            new_output = CalculatedOutput(
-                company_id=company_id,
-                total_bid=total_bid,
-                capital_raised=capital_raised,
-                subscription_status=subscription_status
+    def _subscription_status_expr(self, total_bid, shares_offered):
+        return case(
+            (total_bid > shares_offered, "Over-subscribed"),
+            (total_bid == shares_offered, "Fully-subscribed"),
+            else_="Under-subscribed"
+        )
+    
+    def _upsert_outputs(self, db: Session, outputs: List[Dict]) -> None:
+        # Chunked so a single statement stays under the driver's bind parameter limit
+        for start in range(0, len(outputs), UPSERT_BATCH_SIZE):
+            stmt = dialect_insert(db, CalculatedOutput).values(
+                outputs[start:start + UPSERT_BATCH_SIZE]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[CalculatedOutput.game_id, CalculatedOutput.company_id],
+                set_={
+                    "total_bid": stmt.excluded.total_bid,
+                    "capital_raised": stmt.excluded.capital_raised,
+                    "subscription_status": stmt.excluded.subscription_status,
+                    "calculated_at": func.now()
+                }
             )
-            db.add(new_output) 
\ No newline at end of file
+            db.execute(stmt)
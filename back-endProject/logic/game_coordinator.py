@@ -1,51 +1,81 @@
 from typing import List, Dict, Optional, Tuple
-from .approval_manager import ApprovalManager
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
+from .approval_manager import ApprovalManager, ApprovalKey
 from .calculation_engine import CalculationEngine
+from .book_snapshot import BookSnapshot
 from .validation_engine import ValidationEngine
 from .status_manager import StatusManager
-from ..db.session import get_session
-from config import ApprovalStatus
+from .result_archive import ResultArchive
+from db.session import use_session, read_only_session
+from db.upsert import upsert_bid
+from db.instrumentation import instrumented
+from db.concurrency import retry_on_conflict, CONFLICT_MESSAGE
+from db.changes import notify_change, COMPANIES, BIDS
+from config import Config, ApprovalStatus
 
 class GameCoordinator:
-    def __init__(self):
-        self.approval_manager = ApprovalManager()
-        self.calculation_engine = CalculationEngine()
-        self.validation_engine = ValidationEngine()
+    def __init__(self, game_id: Optional[int] = None):
+        self.game_id = game_id if game_id is not None else Config.game.game_id
+        self.approval_manager = ApprovalManager(self.game_id)
+        self.calculation_engine = CalculationEngine(self.game_id)
+        self.validation_engine = ValidationEngine(self.game_id)
         self.status_manager = StatusManager()
+        self.result_archive = ResultArchive(self.game_id)
     
-    def get_game_status(self) -> Dict:
+    @instrumented()
+    def get_game_status(self, db: Optional[Session] = None) -> Dict:
         """Get comprehensive game status including validation and approval state."""
-        with get_session() as db:
-            validation_summary = self.validation_engine.get_validation_summary()
-            market_stats = self.calculation_engine.calculate_market_statistics(db)
-            pending_approvals = self.approval_manager.get_pending_approvals()
-            
-            return {
-                "validation": validation_summary,
-                "market_statistics": market_stats,
-                "pending_approvals": pending_approvals,
-                "all_approved": self.approval_manager.check_all_approved(),
-                "game_ready": self._is_game_ready()
-            }
+        if db is not None:
+            return self._game_status(db)
+        
+        # One read-only snapshot, so every part of the status agrees with the others
+        with read_only_session() as db:
+            return self._game_status(db)
+    
+    def _game_status(self, db: Session) -> Dict:
+        validation_summary = self.validation_engine.get_validation_summary(db)
+        market_stats = self.calculation_engine.calculate_market_statistics(db)
+        pending_approvals = self.approval_manager.get_pending_approvals(db)
+        
+        all_approved = self.approval_manager.all_approved(pending_approvals)
+        is_valid, _ = self.validation_engine.validate_game_counts(
+            validation_summary["total_companies"], validation_summary["total_investors"]
+        )
+        
+        return {
+            "validation": validation_summary,
+            "market_statistics": market_stats,
+            "pending_approvals": pending_approvals,
+            "all_approved": all_approved,
+            "game_ready": is_valid and all_approved
+        }
     
+    @instrumented()
+    @retry_on_conflict(conflict_result=(False, CONFLICT_MESSAGE))
     def validate_and_update_company(self, company_id: int, price: Optional[float] = None, 
-                                  shares: Optional[int] = None) -> Tuple[bool, str]:
-        """Validate and update company data with proper error handling."""
+                                  shares: Optional[int] = None, version: Optional[int] = None,
+                                  db: Optional[Session] = None) -> Tuple[bool, str]:
+        """Validate and update company data; with version, only if nobody changed it since."""
         if price is None and shares is None:
             return False, "No changes specified"
         
         # Get current company data for validation
-        with get_session() as db:
-            from ..db.schema import Company
-            company = db.query(Company).filter(Company.id == company_id).first()
+        with use_session(db) as db:
+            from db.schema import Company
+            company = db.query(Company).filter(
+                Company.game_id == self.game_id, Company.id == company_id
+            ).first()
             if not company:
                 return False, "Company not found"
+            if version is not None and company.version != version:
+                return False, CONFLICT_MESSAGE
             
             new_price = price if price is not None else company.price
             new_shares = shares if shares is not None else company.shares
             
             is_valid, error_message = self.validation_engine.validate_company_data(
-                company.name, new_price, new_shares
+                company.name, new_price, new_shares, db, company_id=company_id
             )
             
             if not is_valid:
@@ -56,83 +86,115 @@ class GameCoordinator:
                 company.price = price
             if shares is not None:
                 company.shares = shares
+            # Always emit the versioned UPDATE, even for an unchanged value, so a concurrent edit is detected
+            flag_modified(company, "price")
+            
+            self.calculation_engine.refresh_company_output(db, company.id)
             
             # Reset approvals
-            self.approval_manager.set_approval_status(
-                f"company_{company_id}", "team1", ApprovalStatus.TBD
-            )
-            self.approval_manager.reset_team2_approvals()
+            self.approval_manager.reset_approval(ApprovalKey.for_company(company_id), "team1", db)
+            self.approval_manager.invalidate_dependents(ApprovalKey.for_company(company_id), "team2", db)
+            notify_change(db, self.game_id, COMPANIES)
             
             return True, "Company updated successfully"
     
-    def validate_and_update_bid(self, investor_id: int, company_id: int, shares: int) -> Tuple[bool, str]:
-        """Validate and update bid data with proper error handling."""
-        is_valid, error_message = self.validation_engine.validate_bid_data(
-            investor_id, company_id, shares
-        )
-        
-        if not is_valid:
-            return False, error_message
-        
-        with get_session() as db:
-            from ..db.schema import Bid
-            existing_bid = db.query(Bid).filter(
-                Bid.investor_id == investor_id,
-                Bid.company_id == company_id
-            ).first()
+    @instrumented()
+    def validate_and_update_bid(self, investor_id: int, company_id: int, shares: int,
+                                version: Optional[int] = None, db: Optional[Session] = None) -> Tuple[bool, str]:
+        """Validate and update bid data; with version, only if nobody changed the bid since."""
+        with use_session(db) as db:
+            is_valid, error_message = self.validation_engine.validate_bid_data(
+                investor_id, company_id, shares, db
+            )
+            
+            if not is_valid:
+                return False, error_message
             
-            if existing_bid:
-                existing_bid.shares_bid = shares
-            else:
-                new_bid = Bid(
-                    investor_id=investor_id,
-                    company_id=company_id,
-                    shares_bid=shares
-                )
-                db.add(new_bid)
+            previous_shares = upsert_bid(db, self.game_id, investor_id, company_id, shares, version)
+            if previous_shares is None:
+                return False, CONFLICT_MESSAGE
+            self.calculation_engine.apply_bid_delta(db, company_id, shares - previous_shares)
             
-            self.approval_manager.set_approval_status(
-                f"bid_{investor_id}_{company_id}", "team2", ApprovalStatus.TBD
-            )
+            self.approval_manager.reset_approval(ApprovalKey.for_bid(investor_id, company_id), "team2", db)
+            notify_change(db, self.game_id, BIDS)
             
             return True, "Bid updated successfully"
     
-    def approve_field(self, field_name: str, team: str) -> Tuple[bool, str]:
+    @instrumented()
+    def approve_field(self, field_name: str, team: str, db: Optional[Session] = None) -> Tuple[bool, str]:
         """Approve a specific field for a team."""
         is_valid, error_message = self.validation_engine.validate_approval_status("OK")
         
         if not is_valid:
             return False, error_message
         
-        success = self.approval_manager.set_approval_status(field_name, team, ApprovalStatus.OK)
-        if success:
+        with use_session(db) as db:
+            success = self.approval_manager.set_approval_status(field_name, team, ApprovalStatus.OK, db)
+            if not success:
+                return False, f"Failed to approve field '{field_name}' for {team}"
+            
+            # The approval that completes a round freezes its results
+            self.freeze_results(db)
             return True, f"Field '{field_name}' approved for {team}"
-        else:
-            return False, f"Failed to approve field '{field_name}' for {team}"
     
-    def get_simulation_results(self) -> Dict:
-        """Get complete simulation results if all data is approved."""
-        if not self.approval_manager.check_all_approved():
-            return {
-                "ready": False,
-                "message": "Cannot calculate results until all data is approved"
-            }
-        
-        with get_session() as db:
-            company_results = self.calculation_engine.calculate_company_outputs(db)
-            investor_summary = self.calculation_engine.calculate_investor_summary(db)
-            market_stats = self.calculation_engine.calculate_market_statistics(db)
+    @instrumented()
+    def get_simulation_results(self, db: Optional[Session] = None) -> Dict:
+        """Complete simulation results, once the current round has been frozen."""
+        with use_session(db) as db:
+            results = self.get_frozen_results(db)
+            if results is None:
+                return {
+                    "ready": False,
+                    "message": "Results are shown once all data is approved and the round is frozen"
+                }
             
-            return {
-                "ready": True,
-                "company_results": company_results,
-                "investor_summary": investor_summary,
-                "market_statistics": market_stats
-            }
+            return {"ready": True, **results}
     
-    def get_approval_summary(self) -> Dict:
+    @instrumented()
+    def get_frozen_results(self, db: Optional[Session] = None) -> Optional[Dict]:
+        """Results of the current round if it has been frozen; reads only, never freezes."""
+        with use_session(db) as db:
+            if not self.approval_manager.check_all_approved(db):
+                return None
+            return self.result_archive.find(db, self.result_archive.data_version(db))
+    
+    @instrumented()
+    def freeze_results(self, db: Optional[Session] = None) -> Optional[Dict]:
+        """Results of the current round, frozen on first use; None until all data is approved."""
+        with use_session(db) as db:
+            if not self.approval_manager.check_all_approved(db):
+                return None
+            
+            # Unchanged data since the last freeze: one keyed read, no recalculation
+            data_version = self.result_archive.data_version(db)
+            results = self.result_archive.find(db, data_version)
+            if results is not None:
+                return results
+            
+            # Freezing closes the round, so this is where its allocations are stored
+            snapshot = BookSnapshot.load(db, self.game_id)
+            allocated = self.calculation_engine.calculate_allocations(db, snapshot)
+            return self.result_archive.freeze(db, data_version, {
+                "company_results": self.calculation_engine.calculate_company_outputs(db, snapshot),
+                "investor_summary": self.calculation_engine.calculate_investor_summary(db, snapshot, allocated),
+                "market_statistics": self.calculation_engine.calculate_market_statistics(db, snapshot)
+            })
+    
+    @instrumented()
+    def get_round_results(self, round_number: int, db: Optional[Session] = None) -> Optional[Dict]:
+        """Frozen results of an earlier round, exactly as they were approved."""
+        with use_session(db) as db:
+            return self.result_archive.get_round(db, round_number)
+    
+    @instrumented()
+    def get_result_rounds(self, db: Optional[Session] = None) -> List[Dict]:
+        with use_session(db) as db:
+            return self.result_archive.list_rounds(db)
+    
+    @instrumented()
+    def get_approval_summary(self, db: Optional[Session] = None) -> Dict:
         """Get detailed approval summary with status information."""
-        pending_approvals = self.approval_manager.get_pending_approvals()
+        pending_approvals = self.approval_manager.get_pending_approvals(db)
         formatted_approvals = self.status_manager.format_approval_data(pending_approvals)
         
         team1_pending = sum(1 for a in formatted_approvals if a["team1_status"] == "TBD")
@@ -144,11 +206,6 @@ class GameCoordinator:
             "team1_pending": team1_pending,
             "team2_pending": team2_pending,
             "complete": complete,
-            "all_approved": self.approval_manager.check_all_approved(),
+            "all_approved": self.approval_manager.all_approved(pending_approvals),
             "approvals": formatted_approvals
         }
-    
-    def _is_game_ready(self) -> bool:
-        """Check if the game is ready to run simulation."""
-        is_valid, _ = self.validation_engine.validate_game_state()
-        return is_valid and self.approval_manager.check_all_approved() 
\ No newline at end of file
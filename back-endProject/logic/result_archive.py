@@ -0,0 +1,64 @@
+import json
+import zlib
+from typing import Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from db.schema import ResultSnapshot
+from db.upsert import dialect_insert
+from db.changes import get_change_sequences, notify_change, COMPANIES, INVESTORS, BIDS, RESULTS
+from config import Config
+
+# Everything the results are computed from; approvals only decide whether they may be shown
+RESULT_CHANNELS = (COMPANIES, INVESTORS, BIDS)
+
+class ResultArchive:
+    """Append-only store of frozen results, one compressed snapshot per approved round of a game."""
+    
+    def __init__(self, game_id: Optional[int] = None):
+        self.game_id = game_id if game_id is not None else Config.game.game_id
+    
+    def data_version(self, db: Session) -> str:
+        sequences = get_change_sequences(db, self.game_id, RESULT_CHANNELS)
+        return "-".join(f"{channel}.{sequences.get(channel, 0)}" for channel in RESULT_CHANNELS)
+    
+    def find(self, db: Session, data_version: str) -> Optional[Dict]:
+        """The latest round, if it was frozen from data_version; None if the data moved on since."""
+        row = db.query(ResultSnapshot.round, ResultSnapshot.data_version, ResultSnapshot.payload).filter(
+            ResultSnapshot.game_id == self.game_id
+        ).order_by(ResultSnapshot.round.desc()).first()
+        
+        if row is None or row.data_version != data_version:
+            return None
+        return self._decode(row.round, row.payload)
+    
+    def freeze(self, db: Session, data_version: str, results: Dict) -> Dict:
+        """Store results as the next round and return them with their round number."""
+        next_round = db.query(func.coalesce(func.max(ResultSnapshot.round), 0) + 1).filter(
+            ResultSnapshot.game_id == self.game_id
+        ).scalar()
+        
+        payload = zlib.compress(json.dumps(results, separators=(",", ":")).encode())
+        # A concurrent freeze of the same round wins; ours is then simply not stored
+        db.execute(dialect_insert(db, ResultSnapshot).values(
+            game_id=self.game_id, round=next_round, data_version=data_version, payload=payload
+        ).on_conflict_do_nothing(index_elements=[ResultSnapshot.game_id, ResultSnapshot.round]))
+        notify_change(db, self.game_id, RESULTS)
+        
+        return {"round": next_round, **results}
+    
+    def get_round(self, db: Session, round_number: int) -> Optional[Dict]:
+        payload = db.query(ResultSnapshot.payload).filter(
+            ResultSnapshot.game_id == self.game_id, ResultSnapshot.round == round_number
+        ).scalar()
+        return None if payload is None else self._decode(round_number, payload)
+    
+    def list_rounds(self, db: Session) -> List[Dict]:
+        return [
+            {"round": round_number, "created_at": created_at.isoformat() if created_at else None}
+            for round_number, created_at in db.query(ResultSnapshot.round, ResultSnapshot.created_at).filter(
+                ResultSnapshot.game_id == self.game_id
+            ).order_by(ResultSnapshot.round)
+        ]
+    
+    def _decode(self, round_number: int, payload: bytes) -> Dict:
+        return {"round": round_number, **json.loads(zlib.decompress(payload))}
@@ -63,7 +63,8 @@ class StatusManager:
                 "field_name": approval["field_name"],
                 "team1_status": self.status_to_string(team1_status),
                 "team2_status": self.status_to_string(team2_status),
-                "overall_status": self.get_overall_status(team1_status, team2_status)
+                "overall_status": self.get_overall_status(team1_status, team2_status),
+                "version": approval.get("version")
             })
         
         return formatted
@@ -1,78 +1,17 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from ..db.schema import ApprovalToggle, Company, Bid
-from ..db.session import get_session
+from db.schema import ApprovalToggle, Company, Bid
+from db.session import get_session
 from config import ApprovalStatus
-from ..logic.approval_manager import ApprovalManager
-from ..logic.status_manager import StatusManager
+from logic.approval_manager import ApprovalManager, FieldKey
+from logic.status_manager import StatusManager
 
-class ApprovalManager:
-    def __init__(self):
-        self.status_enum = ApprovalStatus
-    
-    def set_approval_status(self, field_name: str, team: str, status: ApprovalStatus) -> bool:
-        if team not in ["team1", "team2"]:
-            return False
-        
-        with get_session() as db:
-            toggle = db.query(ApprovalToggle).filter(
-                ApprovalToggle.field_name == field_name
-            ).first()
-            
-            if not toggle:
-                toggle = ApprovalToggle(
-                    field_name=field_name,
-                    team1_status=ApprovalStatus.TBD,
-                    team2_status=ApprovalStatus.TBD
-                )
-                db.add(toggle)
-            
-            if team == "team1":
-                toggle.team1_status = status
-            else:
-                toggle.team2_status = status
-            
-            return True
-    
-    def reset_team2_approvals(self) -> None:
-        with get_session() as db:
-            db.query(ApprovalToggle).update({
-                ApprovalToggle.team2_status: ApprovalStatus.TBD
-            })
-    
-    def check_all_approved(self) -> bool:
-        with get_session() as db:
-            toggles = db.query(ApprovalToggle).all()
-            return all(
-                toggle.team1_status == ApprovalStatus.OK and 
-                toggle.team2_status == ApprovalStatus.OK
-                for toggle in toggles
-            )
-    
-    def get_pending_approvals(self) -> List[Dict]:
-        with get_session() as db:
-            toggles = db.query(ApprovalToggle).all()
-            return [
-                {
-                    "field_name": toggle.field_name,
-                    "team1_status": toggle.team1_status.value,
-                    "team2_status": toggle.team2_status.value
-                }
-                for toggle in toggles
-            ]
-    
-    def create_company_approval(self, company_id: int) -> None:
-        field_name = f"company_{company_id}"
-        self.set_approval_status(field_name, "team1", ApprovalStatus.TBD)
-        self.set_approval_status(field_name, "team2", ApprovalStatus.TBD)
-    
-    def create_bid_approval(self, investor_id: int, company_id: int) -> None:
-        field_name = f"bid_{investor_id}_{company_id}"
-        self.set_approval_status(field_name, "team1", ApprovalStatus.TBD)
-        self.set_approval_status(field_name, "team2", ApprovalStatus.TBD)
-
-def set_toggle(field: str, team: str, status: str) -> bool:
+def set_toggle(field: FieldKey, team: str, status: str) -> bool:
     """Set approval toggle for a field."""
+    return set_toggles([field], team, status)
+
+def set_toggles(fields: List[FieldKey], team: str, status: str) -> bool:
+    """Set approval toggles for many fields in one statement."""
     manager = ApprovalManager()
     status_manager = StatusManager()
     
@@ -80,7 +19,7 @@ def set_toggle(field: str, team: str, status: str) -> bool:
     if status_enum is None:
         return False
     
-    return manager.set_approval_status(field, team, status_enum)
+    return manager.set_many(fields, team, status_enum)[0]
 
 def reset_team2_toggles() -> None:
     """Reset all Team 2 toggles to TBD."""
@@ -97,10 +36,10 @@ def get_pending_approvals() -> list:
     manager = ApprovalManager()
     return manager.get_pending_approvals()
 
-def get_field_status(field_name: str) -> dict:
+def get_field_status(field: FieldKey) -> dict:
     """Get status for a specific field."""
     manager = ApprovalManager()
-    return manager.get_field_status(field_name)
+    return manager.get_field_status(field)
 
 # Left this in from testing - might be useful later
 '''
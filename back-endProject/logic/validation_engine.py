@@ -1,15 +1,18 @@
 from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from ..db.schema import Company, Investor, Bid
-from ..db.session import get_session
+from sqlalchemy import func, select, exists, distinct, or_
+from db.schema import Company, Investor, Bid
+from db.session import use_session
 from config import Config, ApprovalStatus
 
 class ValidationEngine:
-    def __init__(self):
+    def __init__(self, game_id: Optional[int] = None):
         self.config = Config.game
+        self.game_id = game_id if game_id is not None else Config.game.game_id
     
-    def validate_company_data(self, name: str, price: float, shares: int) -> Tuple[bool, str]:
+    def validate_company_data(self, name: str, price: float, shares: int,
+                              db: Optional[Session] = None,
+                              company_id: Optional[int] = None) -> Tuple[bool, str]:
         if not name or len(name.strip()) == 0:
             return False, "Company name cannot be empty"
         
@@ -19,31 +22,39 @@ class ValidationEngine:
         if not self._validate_shares(shares):
             return False, f"Shares must be between 1 and {self.config.max_shares}"
         
-        if not self._validate_company_name_unique(name):
-            return False, "Company name must be unique"
+        with use_session(db) as session:
+            if not self._validate_company_name_unique(session, name, company_id):
+                return False, "Company name must be unique"
         
         return True, "Valid company data"
     
-    def validate_investor_data(self, name: str) -> Tuple[bool, str]:
+    def validate_investor_data(self, name: str, db: Optional[Session] = None) -> Tuple[bool, str]:
         if not name or len(name.strip()) == 0:
             return False, "Investor name cannot be empty"
         
-        if not self._validate_investor_name_unique(name):
-            return False, "Investor name must be unique"
+        with use_session(db) as session:
+            if not self._validate_investor_name_unique(session, name):
+                return False, "Investor name must be unique"
         
         return True, "Valid investor data"
     
-    def validate_bid_data(self, investor_id: int, company_id: int, shares: int) -> Tuple[bool, str]:
+    def validate_bid_data(self, investor_id: int, company_id: int, shares: int,
+                          db: Optional[Session] = None) -> Tuple[bool, str]:
         if shares < 0:
             return False, "Bid shares cannot be negative"
         
-        if not self._validate_investor_exists(investor_id):
+        with use_session(db) as session:
+            investor_exists, company_shares, existing_bids = self._load_bid_context(
+                session, investor_id, company_id
+            )
+        
+        if not investor_exists:
             return False, "Investor does not exist"
         
-        if not self._validate_company_exists(company_id):
+        if company_shares is None:
             return False, "Company does not exist"
         
-        if not self._validate_bid_within_limits(company_id, shares):
+        if not self._validate_bid_within_limits(company_shares, existing_bids, shares):
             return False, "Bid exceeds company share limits"
         
         return True, "Valid bid data"
@@ -55,37 +66,51 @@ class ValidationEngine:
         except KeyError:
             return False, "Invalid approval status. Use 'TBD' or 'OK'"
     
-    def validate_game_state(self) -> Tuple[bool, str]:
-        with get_session() as db:
-            company_count = db.query(Company).count()
-            investor_count = db.query(Investor).count()
-            
-            if company_count == 0:
-                return False, "No companies available for simulation"
-            
-            if investor_count == 0:
-                return False, "No investors available for simulation"
-            
-            if company_count > self.config.max_companies:
-                return False, f"Too many companies. Maximum allowed: {self.config.max_companies}"
-            
-            if investor_count > self.config.max_investors:
-                return False, f"Too many investors. Maximum allowed: {self.config.max_investors}"
-            
-            return True, "Valid game state"
+    def validate_game_state(self, db: Optional[Session] = None) -> Tuple[bool, str]:
+        with use_session(db) as db:
+            company_count, investor_count = db.execute(
+                select(
+                    select(func.count(Company.id)).where(Company.game_id == self.game_id).scalar_subquery(),
+                    select(func.count(Investor.id)).where(Investor.game_id == self.game_id).scalar_subquery()
+                )
+            ).one()
+        
+        return self.validate_game_counts(company_count, investor_count)
     
-    def get_validation_summary(self) -> Dict:
-        with get_session() as db:
-            companies = db.query(Company).all()
-            investors = db.query(Investor).all()
-            bids = db.query(Bid).all()
+    def validate_game_counts(self, company_count: int, investor_count: int) -> Tuple[bool, str]:
+        if company_count == 0:
+            return False, "No companies available for simulation"
+        
+        if investor_count == 0:
+            return False, "No investors available for simulation"
+        
+        if company_count > self.config.max_companies:
+            return False, f"Too many companies. Maximum allowed: {self.config.max_companies}"
+        
+        if investor_count > self.config.max_investors:
+            return False, f"Too many investors. Maximum allowed: {self.config.max_investors}"
+        
+        return True, "Valid game state"
+    
+    def get_validation_summary(self, db: Optional[Session] = None) -> Dict:
+        with use_session(db) as db:
+            # All five counts in one round trip
+            counts = db.execute(
+                select(
+                    select(func.count(Company.id)).where(Company.game_id == self.game_id).scalar_subquery(),
+                    select(func.count(Investor.id)).where(Investor.game_id == self.game_id).scalar_subquery(),
+                    select(func.count(Bid.id)).where(Bid.game_id == self.game_id).scalar_subquery(),
+                    select(func.count(distinct(Bid.company_id))).where(Bid.game_id == self.game_id).scalar_subquery(),
+                    select(func.count(distinct(Bid.investor_id))).where(Bid.game_id == self.game_id).scalar_subquery()
+                )
+            ).one()
             
             return {
-                "total_companies": len(companies),
-                "total_investors": len(investors),
-                "total_bids": len(bids),
-                "companies_with_bids": len(set(bid.company_id for bid in bids)),
-                "investors_with_bids": len(set(bid.investor_id for bid in bids)),
+                "total_companies": counts[0],
+                "total_investors": counts[1],
+                "total_bids": counts[2],
+                "companies_with_bids": counts[3],
+                "investors_with_bids": counts[4],
                 "validation_errors": self._get_validation_errors(db)
             }
     
@@ -95,46 +120,44 @@ class ValidationEngine:
     def _validate_shares(self, shares: int) -> bool:
         return 0 < shares <= self.config.max_shares
     
-    def _validate_company_name_unique(self, name: str) -> bool:
-        with get_session() as db:
-            existing = db.query(Company).filter(Company.name == name).first()
-            return existing is None
+    def _validate_company_name_unique(self, db: Session, name: str,
+                                      company_id: Optional[int] = None) -> bool:
+        query = db.query(Company.id).filter(Company.game_id == self.game_id, Company.name == name)
+        if company_id is not None:
+            query = query.filter(Company.id != company_id)
+        return query.first() is None
     
-    def _validate_investor_name_unique(self, name: str) -> bool:
-        with get_session() as db:
-            existing = db.query(Investor).filter(Investor.name == name).first()
-            return existing is None
+    def _validate_investor_name_unique(self, db: Session, name: str) -> bool:
+        existing = db.query(Investor.id).filter(Investor.game_id == self.game_id, Investor.name == name).first()
+        return existing is None
     
-    def _validate_investor_exists(self, investor_id: int) -> bool:
-        with get_session() as db:
-            investor = db.query(Investor).filter(Investor.id == investor_id).first()
-            return investor is not None
+    def _load_bid_context(self, db: Session, investor_id: int, company_id: int) -> Tuple[bool, Optional[int], int]:
+        # Investor existence, company size and current bid total in one round trip, all within this game
+        return db.execute(
+            select(
+                exists().where(Investor.game_id == self.game_id, Investor.id == investor_id),
+                select(Company.shares).where(
+                    Company.game_id == self.game_id, Company.id == company_id
+                ).scalar_subquery(),
+                select(func.coalesce(func.sum(Bid.shares_bid), 0)).where(
+                    Bid.game_id == self.game_id, Bid.company_id == company_id
+                ).scalar_subquery()
+            )
+        ).one()
     
-    def _validate_company_exists(self, company_id: int) -> bool:
-        with get_session() as db:
-            company = db.query(Company).filter(Company.id == company_id).first()
-            return company is not None
-    
-    def _validate_bid_within_limits(self, company_id: int, shares: int) -> bool:
-        with get_session() as db:
-            company = db.query(Company).filter(Company.id == company_id).first()
-            if not company:
-                return False
-            
-            existing_bids = db.query(func.sum(Bid.shares_bid)).filter(
-                Bid.company_id == company_id
-            ).scalar() or 0
-            
-            return existing_bids + shares <= company.shares * 2  # Allow some oversubscription
+    def _validate_bid_within_limits(self, company_shares: int, existing_bids: int, shares: int) -> bool:
+        return existing_bids + shares <= company_shares * 2  # Allow some oversubscription
     
     def _get_validation_errors(self, db: Session) -> List[str]:
         errors = []
         
-        companies = db.query(Company).all()
-        for company in companies:
-            if company.price <= 0:
-                errors.append(f"Company '{company.name}' has invalid price: ${company.price}")
-            if company.shares <= 0:
-                errors.append(f"Company '{company.name}' has invalid shares: {company.shares}")
+        invalid_companies = db.query(Company.name, Company.price, Company.shares).filter(
+            Company.game_id == self.game_id, or_(Company.price <= 0, Company.shares <= 0)
+        ).order_by(Company.id)
+        for name, price, shares in invalid_companies:
+            if price <= 0:
+                errors.append(f"Company '{name}' has invalid price: ${price}")
+            if shares <= 0:
+                errors.append(f"Company '{name}' has invalid shares: {shares}")
         
         return errors 
\ No newline at end of file
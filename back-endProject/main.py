@@ -1,11 +1,15 @@
+import os
 import sys
+import logging
 import argparse
-from sqlalchemy.orm import Session
-from db.schema import init_db, Company, Investor, SessionLocal
-from cli.team1_cli import main_loop as team1_loop
-from cli.team2_cli import main_loop as team2_loop
+from typing import TYPE_CHECKING
 from config import Config
-from utils.display import print_info, print_error, print_success
+from utils.display import print_info, print_error, print_success, print_warning
+
+# SQLAlchemy, the services and the CLIs are imported by the code path that needs them, so --help
+# and argument errors never load them; benchmarks/startup.py keeps this within budget
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
 
 class SimulationGame:
     def __init__(self):
@@ -14,16 +18,32 @@ class SimulationGame:
     def initialize_database(self):
         print_info("Initializing database...")
         try:
+            from db.schema import init_db
             init_db()
             print_success("Database initialized successfully!")
         except Exception as e:
             print_error(f"Failed to initialize database: {str(e)}")
             sys.exit(1)
     
+    def reset_database(self):
+        print_warning("Dropping every table; all games and their data are lost...")
+        try:
+            from db.schema import reset_db
+            reset_db()
+            print_success("Database reset successfully!")
+        except Exception as e:
+            print_error(f"Failed to reset database: {str(e)}")
+            sys.exit(1)
+    
     def seed_sample_data(self):
         print_info("Seeding sample data...")
         try:
+            from db.schema import SessionLocal
+            from services.game_service import GameService
             with SessionLocal() as db:
+                GameService().ensure_game(self.config.game.game_id, db)
+                db.commit()
+                
                 if self._has_data(db):
                     print_info("Sample data already exists, skipping...")
                     return
@@ -35,34 +55,70 @@ class SimulationGame:
             print_error(f"Failed to seed sample data: {str(e)}")
             sys.exit(1)
     
-    def _has_data(self, db: Session) -> bool:
-        company_count = db.query(Company).count()
-        investor_count = db.query(Investor).count()
+    def _has_data(self, db: "Session") -> bool:
+        from db.schema import Company, Investor
+        game_id = self.config.game.game_id
+        company_count = db.query(Company).filter(Company.game_id == game_id).count()
+        investor_count = db.query(Investor).filter(Investor.game_id == game_id).count()
         return company_count > 0 or investor_count > 0
     
-    def _create_sample_companies(self, db: Session):
-        for company_data in self.config.sample_companies:
-            company = Company(
+    def _create_sample_companies(self, db: "Session"):
+        from db.schema import Company
+        from db.changes import notify_change, COMPANIES
+        from logic.approval_manager import ApprovalManager, ApprovalKey
+        companies = [
+            Company(
+                game_id=self.config.game.game_id,
                 name=company_data["name"],
                 price=company_data["price"],
                 shares=company_data["shares"]
             )
-            db.add(company)
+            for company_data in self.config.sample_companies
+        ]
+        db.add_all(companies)
+        db.flush()
+        # Teams can only approve companies that have a toggle
+        ApprovalManager(self.config.game.game_id).create_approvals(
+            [ApprovalKey.for_company(company.id) for company in companies], db
+        )
+        # Running team screens and API clients only refresh on a change notification
+        notify_change(db, self.config.game.game_id, COMPANIES)
         db.commit()
     
-    def _create_sample_investors(self, db: Session):
+    def _create_sample_investors(self, db: "Session"):
+        from db.schema import Investor
+        from db.changes import notify_change, INVESTORS
         for investor_data in self.config.sample_investors:
-            investor = Investor(name=investor_data["name"])
+            investor = Investor(game_id=self.config.game.game_id, name=investor_data["name"])
             db.add(investor)
+        notify_change(db, self.config.game.game_id, INVESTORS)
         db.commit()
     
+    def import_scenario(self, companies: str = None, investors: str = None, bids: str = None):
+        print_info("Importing scenario...")
+        from services.import_service import ImportService
+        result = ImportService(self.config.game.game_id).import_scenario(companies, investors, bids)
+        if not result["success"]:
+            for error in result["errors"]:
+                print_error(error)
+            if result["error_count"] > len(result["errors"]):
+                print_error(f"... and {result['error_count'] - len(result['errors'])} more")
+            print_error("Nothing was imported.")
+            sys.exit(1)
+        
+        print_success(
+            f"Imported {result['companies']} companies, {result['investors']} investors "
+            f"and {result['bids']} bids ({result['approvals']} approvals created)."
+        )
+    
     def run_team_interface(self, team_number: int):
         print_info(f"Starting Team {team_number} interface...")
         try:
             if team_number == 1:
-                team1_loop()
+                from cli.team1_cli import main_loop
             else:
-                team2_loop()
+                from cli.team2_cli import main_loop
+            main_loop()
         except KeyboardInterrupt:
             print_info("\nInterface stopped by user.")
         except Exception as e:
@@ -78,6 +134,8 @@ Examples:
   python main.py --team 1    # Start Team 1 interface
   python main.py --team 2    # Start Team 2 interface
   python main.py --init      # Initialize database only
+  python main.py --reset-db  # Recreate every table after a schema change (deletes all data)
+  python main.py --import-companies c.csv --import-investors i.csv --import-bids b.jsonl
         """
     )
     
@@ -88,30 +146,74 @@ Examples:
         help="Team number to run (1 or 2)"
     )
     
+    parser.add_argument(
+        "--game",
+        type=int,
+        default=Config.game.game_id,
+        help="Game to play; each classroom session uses its own (default: GAME_ID or 1)"
+    )
+    
     parser.add_argument(
         "--init",
         action="store_true",
         help="Initialize database and seed sample data only"
     )
     
+    parser.add_argument(
+        "--reset-db",
+        action="store_true",
+        help="Drop and recreate every table, deleting all games, then seed sample data"
+    )
+    
+    parser.add_argument(
+        "--import-companies",
+        metavar="FILE",
+        help="Bulk-load companies (name, price, shares) from a CSV or .jsonl file"
+    )
+    
+    parser.add_argument(
+        "--import-investors",
+        metavar="FILE",
+        help="Bulk-load investors (name) from a CSV or .jsonl file"
+    )
+    
+    parser.add_argument(
+        "--import-bids",
+        metavar="FILE",
+        help="Bulk-load bids (investor, company, shares; names, not ids) from a CSV or .jsonl file"
+    )
+    
     args = parser.parse_args()
     
-    if not args.team and not args.init:
-        parser.error("Either --team or --init must be specified")
+    # DEBUG shows per-operation statement counts; WARNING still reports slow statements
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper())
+    
+    importing = args.import_companies or args.import_investors or args.import_bids
+    if not args.team and not args.init and not args.reset_db and not importing:
+        parser.error("Either --team, --init, --reset-db or an --import-* file must be specified")
+    
+    Config.game.game_id = args.game
     
     game = SimulationGame()
     
     try:
-        game.initialize_database()
+        if args.reset_db:
+            game.reset_database()
+        else:
+            game.initialize_database()
+        if importing:
+            game.import_scenario(args.import_companies, args.import_investors, args.import_bids)
+            return
+        
         game.seed_sample_data()
         
-        if args.init:
+        if args.init or args.reset_db:
             print_success("Database initialization complete!")
             return
         
         if args.team:
             game.run_team_interface(args.team)
-            
+    
     except KeyboardInterrupt:
         print_info("\nExiting...")
         sys.exit(0)
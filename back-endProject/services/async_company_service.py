@@ -0,0 +1,27 @@
+from typing import List, Dict, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from .company_service import CompanyService
+from db.async_session import run_in_session
+from db.concurrency import retry_on_conflict, CONFLICT_MESSAGE
+
+class AsyncCompanyService:
+    """CompanyService on AsyncSession; each call reuses the sync statements through run_sync."""
+    
+    def __init__(self, game_id: Optional[int] = None):
+        self.company_service = CompanyService(game_id)
+    
+    async def get_all_companies(self, db: Optional[AsyncSession] = None) -> List[Dict]:
+        return await run_in_session(db, self.company_service.get_all_companies)
+    
+    async def get_company_by_id(self, company_id: int, db: Optional[AsyncSession] = None) -> Optional[Dict]:
+        return await run_in_session(db, self.company_service.get_company_by_id, company_id)
+    
+    @retry_on_conflict(conflict_result=(False, CONFLICT_MESSAGE))
+    async def update_company(self, company_id: int, price: Optional[float] = None,
+                             shares: Optional[int] = None, version: Optional[int] = None,
+                             db: Optional[AsyncSession] = None) -> Tuple[bool, str]:
+        return await run_in_session(db, self.company_service.update_company, company_id, price, shares, version)
+    
+    async def create_company(self, name: str, price: float, shares: int,
+                             db: Optional[AsyncSession] = None) -> Optional[int]:
+        return await run_in_session(db, self.company_service.create_company, name, price, shares)
@@ -0,0 +1,38 @@
+from typing import List, Dict, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from .investor_service import InvestorService
+from db.async_session import run_in_session
+
+class AsyncInvestorService:
+    """InvestorService on AsyncSession; each call reuses the sync statements through run_sync."""
+    
+    def __init__(self, game_id: Optional[int] = None):
+        self.investor_service = InvestorService(game_id)
+    
+    async def get_all_investors_with_bids(self, db: Optional[AsyncSession] = None) -> List[Dict]:
+        return await run_in_session(db, self.investor_service.get_all_investors_with_bids)
+    
+    async def get_bid_matrix(self, db: Optional[AsyncSession] = None) -> Dict:
+        return await run_in_session(db, self.investor_service.get_bid_matrix)
+    
+    async def get_investor_by_id(self, investor_id: int, db: Optional[AsyncSession] = None) -> Optional[Dict]:
+        return await run_in_session(db, self.investor_service.get_investor_by_id, investor_id)
+    
+    async def update_bid(self, investor_id: int, company_id: int, shares: int, version: Optional[int] = None,
+                         db: Optional[AsyncSession] = None) -> Tuple[bool, str]:
+        return await run_in_session(
+            db, self.investor_service.update_bid, investor_id, company_id, shares, version
+        )
+    
+    async def create_investor(self, name: str, db: Optional[AsyncSession] = None) -> Optional[int]:
+        return await run_in_session(db, self.investor_service.create_investor, name)
+    
+    async def get_bid_status(self, investor_id: int, company_id: int,
+                             db: Optional[AsyncSession] = None) -> str:
+        return await run_in_session(db, self.investor_service.get_bid_status, investor_id, company_id)
+    
+    async def approve_bid(self, investor_id: int, company_id: int, db: Optional[AsyncSession] = None) -> bool:
+        return await run_in_session(db, self.investor_service.approve_bid, investor_id, company_id)
+    
+    async def approve_investor_bids(self, investor_id: int, db: Optional[AsyncSession] = None) -> bool:
+        return await run_in_session(db, self.investor_service.approve_investor_bids, investor_id)
@@ -1,101 +1,158 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
-from ..db.schema import Company, ApprovalToggle
-from ..db.session import get_session
-from ..logic.approval_manager import ApprovalManager
-from ..logic.validation_engine import ValidationEngine
-from ..logic.status_manager import StatusManager
-from config import Config, ApprovalStatus
+from sqlalchemy.orm.attributes import flag_modified
+from db.schema import Company, ApprovalToggle
+from db.session import use_session
+from db.instrumentation import instrumented
+from db.concurrency import retry_on_conflict, CONFLICT_MESSAGE
+from db.changes import notify_change, get_data_version, has_pending_changes, COMPANIES, APPROVALS
+from logic.approval_manager import ApprovalManager, ApprovalKey
+from logic.validation_engine import ValidationEngine
+from logic.status_manager import StatusManager
+from logic.calculation_engine import CalculationEngine
+from utils.read_cache import VersionedCache
+from config import Config, ApprovalStatus, ApprovalEntity
+
+CACHED_CHANNELS = [COMPANIES, APPROVALS]
+
+# Shared by every CompanyService in the process; entries expire when companies or approvals change
+company_cache = VersionedCache(Config.cache.read_cache_size)
 
 class CompanyService:
-    def __init__(self):
+    def __init__(self, game_id: Optional[int] = None):
         self.config = Config.game
-        self.approval_manager = ApprovalManager()
-        self.validation_engine = ValidationEngine()
+        self.game_id = game_id if game_id is not None else Config.game.game_id
+        self.approval_manager = ApprovalManager(self.game_id)
+        self.validation_engine = ValidationEngine(self.game_id)
         self.status_manager = StatusManager()
+        self.calculation_engine = CalculationEngine(self.game_id)
     
-    def get_all_companies(self) -> List[Dict]:
-        with get_session() as db:
-            companies = db.query(Company).all()
-            return [
-                {
-                    "id": company.id,
-                    "name": company.name,
-                    "price": company.price,
-                    "shares": company.shares,
-                    "status": self._get_company_status(company.id)
-                }
-                for company in companies
-            ]
+    @instrumented()
+    def get_all_companies(self, db: Optional[Session] = None) -> List[Dict]:
+        with use_session(db) as db:
+            use_cache = self._can_use_cache(db)
+            version = get_data_version(db, self.game_id, CACHED_CHANNELS)
+            key = ("all", self.game_id)
+            companies = company_cache.get(key, version) if use_cache else None
+            if companies is None:
+                companies = [self._company_row(*row) for row in self._company_rows(db).order_by(Company.id)]
+                if use_cache:
+                    company_cache.put(key, version, companies)
+            
+            # Callers get their own dicts so they can't alter cached rows
+            return [dict(company) for company in companies]
     
+    @instrumented()
+    @retry_on_conflict(conflict_result=(False, CONFLICT_MESSAGE))
     def update_company(self, company_id: int, price: Optional[float] = None, 
-                      shares: Optional[int] = None) -> bool:
-        if price is None and shares is None:
-            return False
-        
-        company = self.get_company_by_id(company_id)
-        if not company:
-            return False
-        
-        new_price = price if price is not None else company["price"]
-        new_shares = shares if shares is not None else company["shares"]
+                      shares: Optional[int] = None, version: Optional[int] = None,
+                      db: Optional[Session] = None) -> Tuple[bool, str]:
+        """Update price and/or shares; with version, only if the company is still at that version.
         
-        is_valid, error_message = self.validation_engine.validate_company_data(
-            company["name"], new_price, new_shares
-        )
-        
-        if not is_valid:
-            return False
+        The message is CONFLICT_MESSAGE only when someone else changed the company first.
+        """
+        if price is None and shares is None:
+            return False, "No changes specified"
         
-        with get_session() as db:
-            company_obj = db.query(Company).filter(Company.id == company_id).first()
+        with use_session(db) as db:
+            company_obj = db.query(Company).filter(
+                Company.game_id == self.game_id, Company.id == company_id
+            ).first()
             if not company_obj:
-                return False
+                return False, "Company not found"
+            if version is not None and company_obj.version != version:
+                return False, CONFLICT_MESSAGE
+            
+            new_price = price if price is not None else company_obj.price
+            new_shares = shares if shares is not None else company_obj.shares
+            
+            is_valid, error_message = self.validation_engine.validate_company_data(
+                company_obj.name, new_price, new_shares, db, company_id=company_id
+            )
+            
+            if not is_valid:
+                return False, error_message
             
             if price is not None:
                 company_obj.price = price
             if shares is not None:
                 company_obj.shares = shares
+            # Always emit the versioned UPDATE, even for an unchanged value, so a concurrent edit is detected
+            flag_modified(company_obj, "price")
             
-            self.approval_manager.set_approval_status(
-                f"company_{company_id}", "team1", ApprovalStatus.TBD
-            )
-            self.approval_manager.reset_team2_approvals()
+            self.calculation_engine.refresh_company_output(db, company_obj.id)
+            notify_change(db, self.game_id, COMPANIES)
+            
+            self.approval_manager.reset_approval(ApprovalKey.for_company(company_id), "team1", db)
+            self.approval_manager.invalidate_dependents(ApprovalKey.for_company(company_id), "team2", db)
             
-            return True
+            return True, "Company updated successfully"
     
-    def create_company(self, name: str, price: float, shares: int) -> Optional[int]:
-        is_valid, error_message = self.validation_engine.validate_company_data(name, price, shares)
-        
-        if not is_valid:
-            return None
-        
-        with get_session() as db:
-            company = Company(name=name, price=price, shares=shares)
+    @instrumented()
+    def create_company(self, name: str, price: float, shares: int,
+                       db: Optional[Session] = None) -> Optional[int]:
+        with use_session(db) as db:
+            is_valid, error_message = self.validation_engine.validate_company_data(name, price, shares, db)
+            
+            if not is_valid:
+                return None
+            
+            company = Company(game_id=self.game_id, name=name, price=price, shares=shares)
             db.add(company)
             db.flush()
             
-            self.approval_manager.create_company_approval(company.id)
+            self.calculation_engine.refresh_company_output(db, company.id)
+            self.approval_manager.create_company_approval(company.id, db)
+            notify_change(db, self.game_id, COMPANIES)
             
             return company.id
     
-    def get_company_by_id(self, company_id: int) -> Optional[Dict]:
-        with get_session() as db:
-            company = db.query(Company).filter(Company.id == company_id).first()
-            if not company:
-                return None
+    @instrumented()
+    def get_company_by_id(self, company_id: int, db: Optional[Session] = None) -> Optional[Dict]:
+        with use_session(db) as db:
+            use_cache = self._can_use_cache(db)
+            version = get_data_version(db, self.game_id, CACHED_CHANNELS)
+            key = ("company", self.game_id, company_id)
+            company = company_cache.get(key, version) if use_cache else None
+            if company is None:
+                row = self._company_rows(db).filter(Company.id == company_id).first()
+                if row is None:
+                    return None
+                company = self._company_row(*row)
+                if use_cache:
+                    company_cache.put(key, version, company)
             
-            return {
-                "id": company.id,
-                "name": company.name,
-                "price": company.price,
-                "shares": company.shares,
-                "status": self._get_company_status(company.id)
-            }
+            return dict(company)
+    
+    def _can_use_cache(self, db: Session) -> bool:
+        # A transaction that wrote companies or approvals reads data that may still roll back, at a
+        # version another writer could reuse; outside such a write, the version pins the rows read
+        return not has_pending_changes(db, self.game_id, CACHED_CHANNELS)
     
-    def _get_company_status(self, company_id: int) -> str:
-        field_status = self.approval_manager.get_field_status(f"company_{company_id}")
-        return self.status_manager.get_company_status_display(
-            field_status["team1_status"], 
-            field_status["team2_status"]
-        ) 
\ No newline at end of file
+    def _company_rows(self, db: Session):
+        # Companies with their own approval toggle, if any, in one outer join
+        return db.query(
+            Company.id, Company.name, Company.price, Company.shares, Company.version,
+            ApprovalToggle.team1_status, ApprovalToggle.team2_status
+        ).outerjoin(
+            ApprovalToggle, and_(
+                ApprovalToggle.game_id == Company.game_id,
+                ApprovalToggle.entity_type == ApprovalEntity.COMPANY.value,
+                ApprovalToggle.company_id == Company.id
+            )
+        ).filter(Company.game_id == self.game_id)
+    
+    def _company_row(self, company_id: int, name: str, price: float, shares: int, version: int,
+                     team1_status: Optional[int], team2_status: Optional[int]) -> Dict:
+        return {
+            "id": company_id,
+            "name": name,
+            "price": price,
+            "shares": shares,
+            "version": version,
+            "status": self.status_manager.get_company_status_display(
+                ApprovalStatus.TBD if team1_status is None else team1_status,
+                ApprovalStatus.TBD if team2_status is None else team2_status
+            )
+        } 
\ No newline at end of file
@@ -0,0 +1,47 @@
+from typing import List, Dict, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from db.schema import Game
+from db.session import use_session
+from db.partitions import create_game_partitions
+from db.instrumentation import instrumented
+
+class GameService:
+    @instrumented()
+    def create_game(self, name: str, db: Optional[Session] = None) -> Optional[int]:
+        if not name or len(name.strip()) == 0:
+            return None
+        
+        with use_session(db) as db:
+            if db.query(Game.id).filter(Game.name == name).first() is not None:
+                return None
+            
+            game = Game(name=name)
+            db.add(game)
+            db.flush()
+            create_game_partitions(db, game.id)
+            return game.id
+    
+    def ensure_game(self, game_id: int, db: Optional[Session] = None) -> None:
+        """Create the game row for game_id if it doesn't exist yet (e.g. the default game)."""
+        with use_session(db) as db:
+            if db.get(Game, game_id) is None:
+                db.add(Game(id=game_id, name=f"Game {game_id}"))
+                db.flush()
+                if db.get_bind().dialect.name == "postgresql":
+                    # An explicit id doesn't advance the SERIAL sequence, so create_game would reuse it
+                    db.execute(text(
+                        "SELECT setval(pg_get_serial_sequence('games', 'id'), (SELECT max(id) FROM games))"
+                    ))
+                create_game_partitions(db, game_id)
+    
+    def game_exists(self, game_id: int, db: Optional[Session] = None) -> bool:
+        with use_session(db) as db:
+            return db.get(Game, game_id) is not None
+    
+    def get_all_games(self, db: Optional[Session] = None) -> List[Dict]:
+        with use_session(db) as db:
+            return [
+                {"id": game_id, "name": name}
+                for game_id, name in db.query(Game.id, Game.name).order_by(Game.id)
+            ]
@@ -0,0 +1,205 @@
+import csv
+import json
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import exists, insert, literal, null, select, and_, func
+from sqlalchemy.orm import Session
+from db.schema import Company, Investor, Bid, ApprovalToggle
+from db.session import use_session
+from db.upsert import bulk_insert
+from db.instrumentation import instrumented
+from db.changes import notify_change, COMPANIES, INVESTORS, BIDS, APPROVALS
+from logic.calculation_engine import CalculationEngine
+from .game_service import GameService
+from config import Config, ApprovalStatus, ApprovalEntity
+
+# Enough to fix a file in one go without flooding the terminal
+MAX_REPORTED_ERRORS = 50
+
+JSON_LINES_SUFFIXES = (".jsonl", ".ndjson")
+
+class ImportService:
+    """Bulk-load a prepared scenario from CSV or JSON-lines files into one game.
+    
+    Companies have name, price and shares; investors have name and optionally priority_tier; bids
+    have investor, company (both by name) and shares. Files are streamed in chunks of
+    BULK_INSERT_ROWS. Every file is validated before anything is written, so a
+    scenario either loads completely or not at all.
+    """
+    
+    def __init__(self, game_id: Optional[int] = None):
+        self.config = Config.game
+        self.game_id = game_id if game_id is not None else Config.game.game_id
+        self.calculation_engine = CalculationEngine(self.game_id)
+    
+    @instrumented()
+    def import_scenario(self, companies: Optional[str] = None, investors: Optional[str] = None,
+                        bids: Optional[str] = None, db: Optional[Session] = None) -> Dict:
+        with use_session(db) as db:
+            GameService().ensure_game(self.game_id, db)
+            
+            errors = self._validate(db, companies, investors, bids)
+            if errors:
+                return {"success": False, "errors": errors[:MAX_REPORTED_ERRORS], "error_count": len(errors)}
+            
+            counts = {"companies": 0, "investors": 0, "bids": 0}
+            if companies:
+                counts["companies"] = bulk_insert(db, Company, ["game_id", "name", "price", "shares"], (
+                    (self.game_id, str(row["name"]).strip(), float(row["price"]), int(row["shares"]))
+                    for _, row in self._read_rows(companies)
+                ))
+            if investors:
+                counts["investors"] = bulk_insert(db, Investor, ["game_id", "name", "priority_tier"], (
+                    (self.game_id, str(row["name"]).strip(), int(row.get("priority_tier") or 0))
+                    for _, row in self._read_rows(investors)
+                ))
+            if bids:
+                company_ids = dict(db.query(Company.name, Company.id).filter(Company.game_id == self.game_id))
+                investor_ids = dict(db.query(Investor.name, Investor.id).filter(Investor.game_id == self.game_id))
+                counts["bids"] = bulk_insert(db, Bid, ["game_id", "investor_id", "company_id", "shares_bid"], (
+                    (self.game_id, investor_ids[str(row["investor"]).strip()],
+                     company_ids[str(row["company"]).strip()], int(row["shares"]))
+                    for _, row in self._read_rows(bids)
+                ))
+            
+            counts["approvals"] = self._create_missing_approvals(db)
+            if counts["companies"] or counts["bids"]:
+                # New rows only get new (TBD) toggles; approvals of existing data stay as they were
+                self.calculation_engine.calculate_company_outputs(db)
+            notify_change(db, self.game_id, COMPANIES, INVESTORS, BIDS, APPROVALS)
+            
+            return {"success": True, "errors": [], "error_count": 0, **counts}
+    
+    def _validate(self, db: Session, companies: Optional[str], investors: Optional[str],
+                  bids: Optional[str]) -> List[str]:
+        # One pass over each file against sets of what the game already holds; no per-row queries
+        errors: List[str] = []
+        company_shares = dict(db.query(Company.name, Company.shares).filter(Company.game_id == self.game_id))
+        investor_names = {name for name, in db.query(Investor.name).filter(Investor.game_id == self.game_id)}
+        
+        if companies:
+            for location, row in self._read_rows(companies, errors):
+                name = self._validate_name(errors, location, row, company_shares)
+                price = self._number(errors, location, row, "price", float)
+                shares = self._number(errors, location, row, "shares", int)
+                if price is not None and not self.config.min_price <= price <= self.config.max_price:
+                    errors.append(f"{location}: price must be between ${self.config.min_price} and ${self.config.max_price}")
+                if shares is not None and not 0 < shares <= self.config.max_shares:
+                    errors.append(f"{location}: shares must be between 1 and {self.config.max_shares}")
+                if name is not None:
+                    company_shares[name] = shares or 0
+        
+        if investors:
+            for location, row in self._read_rows(investors, errors):
+                name = self._validate_name(errors, location, row, investor_names)
+                if name is not None:
+                    investor_names.add(name)
+                if row.get("priority_tier") not in (None, ""):
+                    tier = self._number(errors, location, row, "priority_tier", int)
+                    if tier is not None and tier < 0:
+                        errors.append(f"{location}: priority_tier cannot be negative")
+        
+        if bids:
+            company_bids = self._existing_bid_totals(db)
+            bid_keys = {
+                key for key in db.query(Investor.name, Company.name).select_from(Bid).join(
+                    Investor, and_(Investor.game_id == Bid.game_id, Investor.id == Bid.investor_id)
+                ).join(
+                    Company, and_(Company.game_id == Bid.game_id, Company.id == Bid.company_id)
+                ).filter(Bid.game_id == self.game_id)
+            }
+            for location, row in self._read_rows(bids, errors):
+                investor = str(row.get("investor") or "").strip()
+                company = str(row.get("company") or "").strip()
+                shares = self._number(errors, location, row, "shares", int)
+                if investor not in investor_names:
+                    errors.append(f"{location}: unknown investor '{investor}'")
+                if company not in company_shares:
+                    errors.append(f"{location}: unknown company '{company}'")
+                if (investor, company) in bid_keys:
+                    errors.append(f"{location}: duplicate bid by '{investor}' on '{company}'")
+                bid_keys.add((investor, company))
+                if shares is not None and shares < 0:
+                    errors.append(f"{location}: bid shares cannot be negative")
+                elif shares is not None:
+                    company_bids[company] += shares
+            
+            for company, total in company_bids.items():
+                # Same oversubscription limit ValidationEngine applies to single bids
+                if company in company_shares and total > company_shares[company] * 2:
+                    errors.append(f"{bids}: bids on '{company}' total {total}, over the limit of {company_shares[company] * 2}")
+        
+        return errors
+    
+    def _validate_name(self, errors: List[str], location: str, row: Dict, existing) -> Optional[str]:
+        name = str(row.get("name") or "").strip()
+        if not name:
+            errors.append(f"{location}: name cannot be empty")
+            return None
+        if name in existing:
+            errors.append(f"{location}: name '{name}' must be unique")
+            return None
+        return name
+    
+    def _number(self, errors: List[str], location: str, row: Dict, column: str, kind) -> Optional[Any]:
+        try:
+            return kind(row[column])
+        except (KeyError, TypeError, ValueError):
+            errors.append(f"{location}: {column} must be a number")
+            return None
+    
+    def _existing_bid_totals(self, db: Session) -> Dict[str, int]:
+        totals = defaultdict(int)
+        totals.update(db.query(Company.name, func.sum(Bid.shares_bid)).join(
+            Bid, and_(Bid.game_id == Company.game_id, Bid.company_id == Company.id)
+        ).filter(Company.game_id == self.game_id).group_by(Company.name))
+        return totals
+    
+    def _read_rows(self, path: str, errors: Optional[List[str]] = None) -> Iterator[Tuple[str, Dict]]:
+        # Lines that are not JSON objects are reported to errors and skipped; the write pass only
+        # reads files that validated, so it passes none
+        with open(path, newline="", encoding="utf-8") as handle:
+            if path.lower().endswith(JSON_LINES_SUFFIXES):
+                for line_number, line in enumerate(handle, start=1):
+                    if not line.strip():
+                        continue
+                    location = f"{path}:{line_number}"
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        errors.append(f"{location}: invalid JSON ({e.msg})")
+                        continue
+                    if not isinstance(row, dict):
+                        errors.append(f"{location}: expected a JSON object, got {type(row).__name__}")
+                        continue
+                    yield location, row
+            else:
+                # Line 1 is the header
+                for line_number, row in enumerate(csv.DictReader(handle), start=2):
+                    yield f"{path}:{line_number}", row
+    
+    def _create_missing_approvals(self, db: Session) -> int:
+        # Toggles for every company and bid that lacks one, built by INSERT ... SELECT in the database
+        created = 0
+        for entity_type, model, company_id, investor_id, key_clause in (
+            (ApprovalEntity.COMPANY, Company, Company.id, null(), ApprovalToggle.company_id == Company.id),
+            (ApprovalEntity.BID, Bid, Bid.company_id, Bid.investor_id, and_(
+                ApprovalToggle.investor_id == Bid.investor_id, ApprovalToggle.company_id == Bid.company_id
+            )),
+        ):
+            missing = select(
+                model.game_id, literal(entity_type.value), company_id, investor_id,
+                literal(int(ApprovalStatus.TBD)), literal(int(ApprovalStatus.TBD))
+            ).where(
+                model.game_id == self.game_id,
+                ~exists().where(
+                    ApprovalToggle.game_id == model.game_id,
+                    ApprovalToggle.entity_type == entity_type.value,
+                    key_clause
+                )
+            )
+            result = db.execute(insert(ApprovalToggle).from_select(
+                ["game_id", "entity_type", "company_id", "investor_id", "team1_status", "team2_status"], missing
+            ))
+            created += max(result.rowcount, 0)
+        return created
@@ -1,110 +1,156 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
-from ..db.schema import Investor, Bid, Company, ApprovalToggle
-from ..db.session import get_session
-from ..logic.approval_manager import ApprovalManager
-from ..logic.validation_engine import ValidationEngine
-from ..logic.status_manager import StatusManager
+from db.schema import Investor, Bid, Company, ApprovalToggle
+from db.session import use_session
+from db.upsert import upsert_bid
+from db.instrumentation import instrumented
+from db.concurrency import CONFLICT_MESSAGE
+from db.changes import notify_change, INVESTORS, BIDS
+from logic.approval_manager import ApprovalManager, ApprovalKey
+from logic.validation_engine import ValidationEngine
+from logic.status_manager import StatusManager
+from logic.calculation_engine import CalculationEngine
 from config import Config, ApprovalStatus
 
 class InvestorService:
-    def __init__(self):
+    def __init__(self, game_id: Optional[int] = None):
         self.config = Config.game
-        self.approval_manager = ApprovalManager()
-        self.validation_engine = ValidationEngine()
+        self.game_id = game_id if game_id is not None else Config.game.game_id
+        self.approval_manager = ApprovalManager(self.game_id)
+        self.validation_engine = ValidationEngine(self.game_id)
         self.status_manager = StatusManager()
+        self.calculation_engine = CalculationEngine(self.game_id)
     
-    def get_all_investors_with_bids(self) -> List[Dict]:
-        with get_session() as db:
-            investors = db.query(Investor).all()
-            companies = db.query(Company).all()
-            
-            result = []
-            for investor in investors:
-                bids = db.query(Bid).filter(Bid.investor_id == investor.id).all()
-                bids_dict = {
-                    next(c.name for c in companies if c.id == b.company_id): b.shares_bid
-                    for b in bids
+    @instrumented()
+    def get_all_investors_with_bids(self, db: Optional[Session] = None) -> List[Dict]:
+        matrix = self.get_bid_matrix(db)
+        company_names = matrix["companies"]
+        
+        return [
+            {
+                "id": investor["id"],
+                "name": investor["name"],
+                "bids": {
+                    company_names[company_id]: shares_bid
+                    for company_id, shares_bid in investor["bids"].items()
                 }
-                
-                result.append({
-                    "id": investor.id,
-                    "name": investor.name,
-                    "bids": bids_dict
-                })
-            
-            return result
+            }
+            for investor in matrix["investors"]
+        ]
     
-    def update_bid(self, investor_id: int, company_id: int, shares: int) -> bool:
-        is_valid, error_message = self.validation_engine.validate_bid_data(
-            investor_id, company_id, shares
-        )
-        
-        if not is_valid:
-            return False
-        
-        with get_session() as db:
-            existing_bid = db.query(Bid).filter(
-                Bid.investor_id == investor_id,
-                Bid.company_id == company_id
-            ).first()
+    @instrumented()
+    def get_bid_matrix(self, db: Optional[Session] = None) -> Dict:
+        with use_session(db) as db:
+            company_names = dict(
+                db.query(Company.id, Company.name).filter(
+                    Company.game_id == self.game_id
+                ).order_by(Company.id).all()
+            )
+            rows = db.query(
+                Investor.id, Investor.name, Bid.company_id, Bid.shares_bid, Bid.version
+            ).outerjoin(
+                Bid, and_(Bid.game_id == Investor.game_id, Bid.investor_id == Investor.id)
+            ).filter(Investor.game_id == self.game_id).order_by(Investor.id, Bid.company_id).all()
             
-            if existing_bid:
-                existing_bid.shares_bid = shares
-            else:
-                new_bid = Bid(
-                    investor_id=investor_id,
-                    company_id=company_id,
-                    shares_bid=shares
+            investors = {}
+            for investor_id, investor_name, company_id, shares_bid, version in rows:
+                investor = investors.setdefault(
+                    investor_id, {"id": investor_id, "name": investor_name, "bids": {}, "versions": {}}
                 )
-                db.add(new_bid)
+                if company_id is not None:
+                    investor["bids"][company_id] = shares_bid
+                    # Sent back with a bid write so it only applies if nobody changed the bid since
+                    investor["versions"][company_id] = version
             
-            self.approval_manager.set_approval_status(
-                f"bid_{investor_id}_{company_id}", "team2", ApprovalStatus.TBD
+            return {
+                "companies": company_names,
+                "investors": list(investors.values())
+            }
+    
+    @instrumented()
+    def update_bid(self, investor_id: int, company_id: int, shares: int, version: Optional[int] = None,
+                   db: Optional[Session] = None) -> Tuple[bool, str]:
+        """Write a bid; with version (0 for a bid that doesn't exist yet), only if it is still at it.
+        
+        The message is CONFLICT_MESSAGE only when someone else changed the bid first.
+        """
+        with use_session(db) as db:
+            is_valid, error_message = self.validation_engine.validate_bid_data(
+                investor_id, company_id, shares, db
             )
             
-            return True
+            if not is_valid:
+                return False, error_message
+            
+            previous_shares = upsert_bid(db, self.game_id, investor_id, company_id, shares, version)
+            if previous_shares is None:
+                return False, CONFLICT_MESSAGE
+            self.calculation_engine.apply_bid_delta(db, company_id, shares - previous_shares)
+            
+            self.approval_manager.reset_approval(ApprovalKey.for_bid(investor_id, company_id), "team2", db)
+            notify_change(db, self.game_id, BIDS)
+            
+            return True, "Bid updated successfully"
     
-    def create_investor(self, name: str) -> Optional[int]:
-        is_valid, error_message = self.validation_engine.validate_investor_data(name)
-        
-        if not is_valid:
-            return None
-        
-        with get_session() as db:
-            investor = Investor(name=name)
+    @instrumented()
+    def create_investor(self, name: str, db: Optional[Session] = None) -> Optional[int]:
+        with use_session(db) as db:
+            is_valid, error_message = self.validation_engine.validate_investor_data(name, db)
+            
+            if not is_valid:
+                return None
+            
+            investor = Investor(game_id=self.game_id, name=name)
             db.add(investor)
             db.flush()
+            notify_change(db, self.game_id, INVESTORS)
             return investor.id
     
-    def get_investor_by_id(self, investor_id: int) -> Optional[Dict]:
-        with get_session() as db:
-            investor = db.query(Investor).filter(Investor.id == investor_id).first()
-            if not investor:
-                return None
+    @instrumented()
+    def get_investor_by_id(self, investor_id: int, db: Optional[Session] = None) -> Optional[Dict]:
+        with use_session(db) as db:
+            rows = db.query(
+                Investor.name, Company.name, Bid.shares_bid
+            ).outerjoin(
+                Bid, and_(Bid.game_id == Investor.game_id, Bid.investor_id == Investor.id)
+            ).outerjoin(
+                Company, and_(Company.game_id == Bid.game_id, Company.id == Bid.company_id)
+            ).filter(Investor.game_id == self.game_id, Investor.id == investor_id).all()
             
-            bids = db.query(Bid).filter(Bid.investor_id == investor_id).all()
-            companies = db.query(Company).all()
-            
-            bids_dict = {
-                next(c.name for c in companies if c.id == b.company_id): b.shares_bid
-                for b in bids
-            }
+            if not rows:
+                return None
             
             return {
-                "id": investor.id,
-                "name": investor.name,
-                "bids": bids_dict
+                "id": investor_id,
+                "name": rows[0][0],
+                "bids": {
+                    company_name: shares_bid
+                    for _, company_name, shares_bid in rows
+                    if company_name is not None
+                }
             }
     
-    def get_bid_status(self, investor_id: int, company_id: int) -> str:
-        field_status = self.approval_manager.get_field_status(f"bid_{investor_id}_{company_id}")
+    @instrumented()
+    def get_investor_allocations(self, investor_id: int, db: Optional[Session] = None) -> List[Dict]:
+        """Shares the investor received per company when the last round was closed."""
+        with use_session(db) as db:
+            return self.calculation_engine.get_investor_allocations(db, investor_id)
+    
+    @instrumented()
+    def get_bid_status(self, investor_id: int, company_id: int, db: Optional[Session] = None) -> str:
+        field_status = self.approval_manager.get_field_status(ApprovalKey.for_bid(investor_id, company_id), db)
         return self.status_manager.get_bid_status_display(
             field_status["team1_status"], 
             field_status["team2_status"]
         )
     
-    def approve_bid(self, investor_id: int, company_id: int) -> bool:
+    @instrumented()
+    def approve_bid(self, investor_id: int, company_id: int, db: Optional[Session] = None) -> bool:
         return self.approval_manager.set_approval_status(
-            f"bid_{investor_id}_{company_id}", "team2", ApprovalStatus.OK
-        ) 
\ No newline at end of file
+            ApprovalKey.for_bid(investor_id, company_id), "team2", ApprovalStatus.OK, db
+        )
+    
+    @instrumented()
+    def approve_investor_bids(self, investor_id: int, db: Optional[Session] = None) -> bool:
+        return self.approval_manager.set_investor_bids(investor_id, "team2", ApprovalStatus.OK, db)
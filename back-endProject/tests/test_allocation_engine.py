@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+from sqlalchemy import func, select
+from db.schema import Allocation, Company, Investor, Bid
+from logic.allocation_engine import AllocationEngine
+from logic.book_snapshot import BookSnapshot
+from logic.calculation_engine import CalculationEngine
+from config import Config
+
+def _snapshot(shares, bids, tiers=()):
+    """One company per entry in shares, ids from 1; bids are (investor_id, company_id, shares_bid)."""
+    companies = [(i, f"Company {i}", 10.0, offered) for i, offered in enumerate(shares, start=1)]
+    return BookSnapshot.from_rows(companies, bids, tiers)
+
+def _allocate(snapshot, lot_size=1):
+    return AllocationEngine(game_id=1, lot_size=lot_size).allocate(snapshot).tolist()
+
+def test_undersubscribed_bids_are_filled_in_full():
+    assert _allocate(_snapshot([100], [(1, 1, 30), (2, 1, 70)])) == [30, 70]
+
+def test_oversubscribed_offering_is_shared_pro_rata():
+    assert _allocate(_snapshot([100], [(1, 1, 100), (2, 1, 50), (3, 1, 50)])) == [50, 25, 25]
+
+def test_leftover_shares_go_to_largest_remainders_then_lower_investor_id():
+    # Quotas of 10/3 each: one share left over, and the remainders tie
+    assert _allocate(_snapshot([10], [(3, 1, 10), (1, 1, 10), (2, 1, 10)])) == [3, 4, 3]
+    # Quotas of 70/11 and 40/11 round down to 6 and 3; the larger remainder beats the lower id
+    assert _allocate(_snapshot([10], [(1, 1, 7), (2, 1, 4)])) == [6, 4]
+
+def test_companies_are_allocated_independently():
+    bids = [(1, 1, 200), (2, 1, 200), (1, 2, 10), (2, 2, 20)]
+    assert _allocate(_snapshot([100, 50], bids)) == [50, 50, 10, 20]
+
+def test_earlier_tiers_are_filled_before_later_ones():
+    # Investor 2 is in tier -1 and is served first, investor 3 in tier 1 only gets what is left
+    snapshot = _snapshot([100], [(1, 1, 60), (2, 1, 80), (3, 1, 50)], tiers=[(2, -1), (3, 1)])
+    assert _allocate(snapshot) == [20, 80, 0]
+
+def test_tier_that_does_not_fit_is_shared_pro_rata():
+    snapshot = _snapshot([100], [(1, 1, 40), (2, 1, 90), (3, 1, 30)], tiers=[(1, -1)])
+    assert _allocate(snapshot) == [40, 45, 15]
+
+def test_fills_are_whole_lots():
+    # 5 lots between three bids of 3 lots: quotas of 5/3 lots, leftovers to investors 1 and 2
+    assert _allocate(_snapshot([50], [(1, 1, 30), (2, 1, 30), (3, 1, 30)]), lot_size=10) == [20, 20, 10]
+    # Partial lots are neither requested nor offered
+    assert _allocate(_snapshot([100], [(1, 1, 35), (2, 1, 49)]), lot_size=10) == [30, 40]
+    assert _allocate(_snapshot([25], [(1, 1, 20), (2, 1, 20)]), lot_size=10) == [10, 10]
+
+def test_empty_book_allocates_nothing():
+    assert _allocate(_snapshot([100], [])) == []
+
+@pytest.mark.parametrize("lot_size", [1, 5])
+def test_random_books_hand_out_every_available_lot(lot_size):
+    rng = np.random.default_rng(lot_size)
+    shares = rng.integers(1, 1000, size=20)
+    bids = [
+        (investor_id, company_id, int(rng.integers(1, 300)))
+        for investor_id in range(1, 60) for company_id in range(1, 21) if rng.random() < 0.5
+    ]
+    tiers = [(investor_id, int(rng.integers(-1, 2))) for investor_id in range(1, 60, 3)]
+    snapshot = _snapshot(shares.tolist(), bids, tiers)
+    
+    allocated = np.array(_allocate(snapshot, lot_size))
+    requested = snapshot.bid_shares // lot_size * lot_size
+    assert (allocated % lot_size == 0).all()
+    assert (allocated >= 0).all() and (allocated <= requested).all()
+    
+    filled = np.bincount(snapshot.bid_company_index, weights=allocated, minlength=snapshot.num_companies)
+    demand = np.bincount(snapshot.bid_company_index, weights=requested, minlength=snapshot.num_companies)
+    assert filled.tolist() == np.minimum(demand, shares // lot_size * lot_size).tolist()
+
+def test_investor_summary_reports_fills():
+    snapshot = _snapshot([100], [(1, 1, 100), (2, 1, 100)])
+    summary = snapshot.investor_summary(AllocationEngine(game_id=1).allocate(snapshot))
+    assert summary == [{
+        "company_name": "Company 1",
+        "total_investors": 2,
+        "average_bid": 100.0,
+        "total_bids": 2,
+        "shares_allocated": 100,
+        "investors_allocated": 2,
+        "fill_ratio": 0.5
+    }]
+
+def _seed_book(db):
+    game_id = Config.game.game_id
+    company = Company(game_id=game_id, name="TechCorp", price=10.0, shares=100)
+    investors = [Investor(game_id=game_id, name=name) for name in ("Angel Fund", "Growth Capital")]
+    db.add_all([company, *investors])
+    db.flush()
+    db.add_all([
+        Bid(game_id=game_id, investor_id=investor.id, company_id=company.id, shares_bid=100)
+        for investor in investors
+    ])
+    db.commit()
+    return investors
+
+def test_investor_summary_does_not_store_allocations(db):
+    _seed_book(db)
+    summary = CalculationEngine().calculate_investor_summary(db)
+    
+    assert summary[0]["shares_allocated"] == 100
+    assert db.scalar(select(func.count(Allocation.id))) == 0
+
+def test_calculate_allocations_replaces_stored_fills(db):
+    investors = _seed_book(db)
+    engine = CalculationEngine()
+    engine.calculate_allocations(db)
+    engine.calculate_allocations(db)
+    
+    assert db.scalar(select(func.count(Allocation.id))) == 2
+    assert engine.get_investor_allocations(db, investors[0].id) == [
+        {"company_name": "TechCorp", "shares_allocated": 50}
+    ]
@@ -0,0 +1,166 @@
+import pytest
+from starlette.testclient import TestClient
+from config import ApprovalStatus
+from api.app import app, known_games, response_cache
+from db.async_session import configure_async_engine
+from logic.approval_manager import ApprovalManager
+from services.company_service import CompanyService, company_cache
+from services.investor_service import InvestorService
+
+GAME = "/api/games/1"
+
+@pytest.fixture
+def client(db):
+    company_id = CompanyService().create_company("TechCorp", 10.0, 1000, db=db)
+    investor_id = InvestorService().create_investor("Angel Fund", db=db)
+    db.commit()
+    # Change sequences start over with each test's tables, so bodies cached under an ETag would be stale
+    response_cache.clear()
+    known_games.clear()
+    with TestClient(app) as client:
+        client.ids = {"company_id": company_id, "investor_id": investor_id}
+        yield client
+        # Close pooled aiosqlite connections on the app's event loop before the tables are dropped
+        client.portal.call(configure_async_engine)
+
+def test_get_carries_an_etag_and_matching_request_gets_304(client):
+    response = client.get(f"{GAME}/companies")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    
+    cached = client.get(f"{GAME}/companies", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag and cached.content == b""
+    assert client.get(f"{GAME}/companies", headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+
+def test_write_changes_the_etag_of_views_that_depend_on_it(client):
+    companies = client.get(f"{GAME}/companies").headers["etag"]
+    bids = client.get(f"{GAME}/bids").headers["etag"]
+    
+    response = client.put(f"{GAME}/companies/{client.ids['company_id']}", json={"price": 12})
+    assert response.status_code == 200, response.text
+    
+    changed = client.get(f"{GAME}/companies", headers={"If-None-Match": companies})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != companies
+    assert changed.json()[0]["price"] == 12.0
+    # The bid matrix shows company names only, but depends on the companies channel too
+    assert client.get(f"{GAME}/bids", headers={"If-None-Match": bids}).status_code == 200
+    
+    approvals = client.get(f"{GAME}/approvals")
+    response = client.put(f"{GAME}/bids", json={**client.ids, "shares": 100})
+    assert response.status_code == 200, response.text
+    assert client.get(f"{GAME}/approvals", headers={"If-None-Match": approvals.headers["etag"]}).status_code == 200
+
+def test_live_outputs_follow_bid_writes(client):
+    first = client.get(f"{GAME}/outputs")
+    assert first.json()[0]["total_bid"] == 0
+    
+    assert client.put(f"{GAME}/bids", json={**client.ids, "shares": 100}).status_code == 200
+    response = client.get(f"{GAME}/outputs", headers={"If-None-Match": first.headers["etag"]})
+    assert response.status_code == 200
+    assert response.json()[0]["total_bid"] == 100
+
+def test_api_reads_use_the_company_cache(client):
+    client.get(f"{GAME}/companies")
+    hits = company_cache.hits
+    
+    # The overview is a different response, but its company list is read at the same version
+    assert client.get(f"{GAME}/overview").json()["companies"] == client.get(f"{GAME}/companies").json()
+    assert company_cache.hits == hits + 1
+
+def test_write_at_a_stale_version_is_409(client):
+    assert client.put(f"{GAME}/bids", json={**client.ids, "shares": 100, "version": 0}).status_code == 200
+    (investor,) = client.get(f"{GAME}/bids").json()["investors"]
+    version = investor["versions"][str(client.ids["company_id"])]
+    
+    assert client.put(f"{GAME}/bids", json={**client.ids, "shares": 50, "version": version}).status_code == 200
+    response = client.put(f"{GAME}/bids", json={**client.ids, "shares": 20, "version": version})
+    assert response.status_code == 409
+    
+    field = f"company_{client.ids['company_id']}"
+    (approval,) = [row for row in client.get(f"{GAME}/approvals").json()["approvals"] if row["field_name"] == field]
+    approve = {"field_names": [field], "team": "team1", "versions": [approval["version"]]}
+    assert client.post(f"{GAME}/approvals", json=approve).status_code == 200
+    assert client.post(f"{GAME}/approvals", json=approve).status_code == 409
+
+def test_results_are_read_with_get_and_frozen_with_post(client):
+    field = f"company_{client.ids['company_id']}"
+    assert client.post(f"{GAME}/results").status_code == 409
+    for team in ("team1", "team2"):
+        # Approved outside the API, so nothing has frozen the round yet
+        assert ApprovalManager().set_many([field], team, ApprovalStatus.OK)[0]
+    
+    assert client.get(f"{GAME}/results").status_code == 404
+    assert client.get(f"{GAME}/results/rounds").json() == []
+    
+    frozen = client.post(f"{GAME}/results")
+    assert frozen.status_code == 200 and frozen.json()["round"] == 1
+    assert client.get(f"{GAME}/results").json() == frozen.json()
+    assert client.post(f"{GAME}/results").json()["round"] == 1
+
+def test_cross_origin_requests_from_the_frontend(client):
+    origin = "http://localhost:5173"
+    preflight = client.options(f"{GAME}/companies", headers={
+        "Origin": origin, "Access-Control-Request-Method": "GET", "Access-Control-Request-Headers": "If-None-Match"
+    })
+    assert preflight.status_code == 200
+    assert preflight.headers["access-control-allow-origin"] == origin
+    
+    response = client.get(f"{GAME}/companies", headers={"Origin": origin})
+    assert response.headers["access-control-allow-origin"] == origin
+    assert "etag" in response.headers["access-control-expose-headers"].lower()
+    assert "access-control-allow-origin" not in client.get(
+        f"{GAME}/companies", headers={"Origin": "http://elsewhere.example"}
+    ).headers
+
+def test_new_games_get_ids_after_the_default_game(client):
+    response = client.post("/api/games", json={"name": "Second round"})
+    assert response.status_code == 201, response.text
+    assert response.json()["game_id"] == 2
+    assert client.get("/api/games/2/companies").json() == []
+
+def test_unknown_game_is_404(client):
+    assert client.get("/api/games/999/companies").status_code == 404
+    assert client.put("/api/games/999/bids", json={"investor_id": 1, "company_id": 1, "shares": 1}).status_code == 404
+
+@pytest.mark.parametrize("payload, message", [
+    ({"price": "abc"}, "price must be a number"),
+    ({"shares": 10.5}, "shares must be an integer"),
+    ({"shares": True}, "shares must be an integer"),
+    ({"price": 12, "version": "1"}, "version must be an integer"),
+])
+def test_company_update_with_wrong_types_is_400(client, payload, message):
+    response = client.put(f"{GAME}/companies/{client.ids['company_id']}", json=payload)
+    assert (response.status_code, response.text) == (400, message)
+
+def test_bid_update_with_wrong_types_is_400(client):
+    response = client.put(f"{GAME}/bids", json={**client.ids, "investor_id": "1", "shares": 5})
+    assert (response.status_code, response.text) == (400, "investor_id must be an integer")
+
+def test_stale_company_version_is_409(client):
+    company = client.get(f"{GAME}/companies").json()[0]
+    url = f"{GAME}/companies/{company['id']}"
+    assert client.put(url, json={"price": 12, "version": company["version"]}).status_code == 200
+    assert client.put(url, json={"price": 13, "version": company["version"]}).status_code == 409
+    # Invalid input is a 400, never a conflict
+    assert client.put(url, json={"price": 5000}).status_code == 400
+
+@pytest.mark.parametrize("payload, message", [
+    ({"field_names": ["company_999"], "team": "team1"}, "Unknown fields: company_999"),
+    ({"field_names": ["bogus", "company_1"], "team": "team1"}, "Unknown fields: bogus"),
+    ({"field_names": ["company_1"], "team": "team3"}, "Invalid team. Use 'team1' or 'team2'"),
+    ({"field_names": ["company_1"], "team": "team1", "status": "MAYBE"}, "Invalid approval status. Use 'TBD' or 'OK'"),
+])
+def test_approval_errors_name_the_actual_problem(client, payload, message):
+    response = client.post(f"{GAME}/approvals", json=payload)
+    assert response.status_code == 400
+    assert response.json() == {"success": False, "message": message}
+
+def test_approvals_update_existing_fields(client):
+    label = f"company_{client.ids['company_id']}"
+    response = client.post(f"{GAME}/approvals", json={"field_names": [label], "team": "team1"})
+    assert response.json() == {"success": True, "message": "Approvals updated"}
+    
+    approval = next(a for a in client.get(f"{GAME}/approvals").json()["approvals"] if a["field_name"] == label)
+    assert approval["team1_status"] == "OK"
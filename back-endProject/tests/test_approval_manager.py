@@ -0,0 +1,91 @@
+from sqlalchemy import func, select, update
+from db.schema import ApprovalToggle
+from logic.approval_manager import ApprovalManager, ApprovalKey
+from services.company_service import CompanyService
+from services.investor_service import InvestorService
+from config import ApprovalStatus
+
+def _toggles(db):
+    return db.scalar(select(func.count(ApprovalToggle.id)))
+
+def _company(db):
+    company_id = CompanyService().create_company("TechCorp", 10.0, 1000, db=db)
+    db.commit()
+    return company_id
+
+def test_set_many_updates_existing_toggles(db):
+    company_id = _company(db)
+    manager = ApprovalManager()
+    
+    assert manager.set_many([f"company_{company_id}"], "team1", ApprovalStatus.OK, db) == (True, "Approvals updated")
+    assert manager.get_field_status(ApprovalKey.for_company(company_id), db) == {
+        "team1_status": ApprovalStatus.OK, "team2_status": ApprovalStatus.TBD
+    }
+
+def test_set_many_rejects_fields_without_a_toggle(db):
+    company_id = _company(db)
+    manager = ApprovalManager()
+    
+    assert manager.set_many([f"company_{company_id}", "company_999"], "team1", ApprovalStatus.OK, db) == (
+        False, "Unknown fields: company_999"
+    )
+    assert manager.set_many(["bid_1_999"], "team2", ApprovalStatus.OK, db) == (False, "Unknown fields: bid_1_999")
+    assert manager.set_many(["nonsense"], "team2", ApprovalStatus.OK, db) == (False, "Unknown fields: nonsense")
+    
+    # Nothing was created, and the valid field in the rejected batch was left alone
+    assert _toggles(db) == 1
+    assert manager.get_field_status(ApprovalKey.for_company(company_id), db)["team1_status"] == ApprovalStatus.TBD
+    assert manager.unknown_fields([f"company_{company_id}", "company_999", "nonsense"], db) == [
+        "company_999", "nonsense"
+    ]
+
+def test_writing_a_bid_creates_its_toggle(db):
+    company_id = _company(db)
+    investor_id = InvestorService().create_investor("Angel Fund", db=db)
+    
+    assert InvestorService().update_bid(investor_id, company_id, 100, db=db)[0]
+    assert _toggles(db) == 2
+    assert ApprovalManager().set_many([f"bid_{investor_id}_{company_id}"], "team2", ApprovalStatus.OK, db)[0]
+
+def _statuses(db):
+    return {
+        approval["field_name"]: (approval["team1_status"], approval["team2_status"])
+        for approval in ApprovalManager().get_pending_approvals(db)
+    }
+
+def test_edits_reset_only_the_approvals_that_depend_on_them(db):
+    companies, investors = CompanyService(), InvestorService()
+    edited = companies.create_company("TechCorp", 10.0, 1000, db=db)
+    other = companies.create_company("BioMed", 15.0, 750, db=db)
+    first, second = (investors.create_investor(name, db=db) for name in ("Angel Fund", "Seed Capital"))
+    for investor_id, company_id in ((first, edited), (second, edited), (first, other)):
+        assert investors.update_bid(investor_id, company_id, 100, db=db)[0]
+    manager = ApprovalManager()
+    for team in ("team1", "team2"):
+        assert manager.set_many(list(_statuses(db)), team, ApprovalStatus.OK, db)[0]
+    
+    assert companies.update_company(edited, price=12.0, db=db)[0]
+    assert _statuses(db) == {
+        f"company_{edited}": ("TBD", "TBD"),
+        f"company_{other}": ("OK", "OK"),
+        f"bid_{first}_{edited}": ("OK", "TBD"),
+        f"bid_{second}_{edited}": ("OK", "TBD"),
+        f"bid_{first}_{other}": ("OK", "OK")
+    }
+    # Already at TBD, so nothing is written again
+    assert manager.invalidate_dependents(ApprovalKey.for_company(edited), "team2", db) == 0
+    
+    assert investors.update_bid(first, other, 50, db=db)[0]
+    assert _statuses(db)[f"bid_{first}_{other}"] == ("OK", "TBD")
+    assert _statuses(db)[f"company_{other}"] == ("OK", "OK")
+
+def test_bulk_status_writes_stamp_updated_at(db):
+    company_id = _company(db)
+    investor_id = InvestorService().create_investor("Angel Fund", db=db)
+    assert InvestorService().update_bid(investor_id, company_id, 100, db=db)[0]
+    manager = ApprovalManager()
+    db.execute(update(ApprovalToggle).values(updated_at=None))
+    
+    manager.set_investor_bids(investor_id, "team2", ApprovalStatus.OK, db)
+    assert manager.invalidate_dependents(ApprovalKey.for_company(company_id), "team2", db) == 1
+    assert db.scalar(select(func.count(ApprovalToggle.id)).where(ApprovalToggle.updated_at.is_(None))) == 1
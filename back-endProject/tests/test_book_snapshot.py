@@ -0,0 +1,94 @@
+from db.instrumentation import track_operation
+from db.schema import Bid, Company, Investor
+from logic.book_snapshot import BookSnapshot
+from logic.calculation_engine import CalculationEngine
+from services.game_service import GameService
+from config import Config
+
+def test_rows_become_columns_in_company_order():
+    snapshot = BookSnapshot.from_rows(
+        [(7, "Later", 2.0, 50), (3, "Earlier", 10.0, 100)],
+        [(1, 7, 20), (2, 3, 150), (1, 3, 30)],
+        tiers=[(2, -1)]
+    )
+    
+    assert snapshot.company_ids.tolist() == [3, 7]
+    assert snapshot.company_names == ("Earlier", "Later")
+    assert (snapshot.prices.tolist(), snapshot.shares.tolist()) == ([10.0, 2.0], [100, 50])
+    # Bids keep their order; each points at its company's position and its investor's tier
+    assert snapshot.bid_company_index.tolist() == [1, 0, 0]
+    assert snapshot.bid_tier.tolist() == [0, -1, 0]
+    assert (snapshot.num_companies, snapshot.num_bids) == (2, 3)
+
+def test_empty_book_has_empty_columns():
+    snapshot = BookSnapshot.from_rows([(1, "TechCorp", 10.0, 100)], [])
+    
+    assert snapshot.num_bids == 0
+    assert snapshot.total_bid.tolist() == [0] and snapshot.bid_count.tolist() == [0]
+    assert snapshot.investor_summary() == []
+    assert snapshot.company_outputs()[0]["subscription_status"] == "Under-subscribed"
+
+def test_company_outputs_and_statistics():
+    snapshot = BookSnapshot.from_rows(
+        [(1, "Over", 10.0, 100), (2, "Full", 5.0, 40), (3, "Under", 1.0, 1000)],
+        [(1, 1, 80), (2, 1, 80), (1, 2, 40), (1, 3, 10), (2, 3, 5)]
+    )
+    
+    outputs = snapshot.company_outputs()
+    assert [output["subscription_status"] for output in outputs] == [
+        "Over-subscribed", "Fully-subscribed", "Under-subscribed"
+    ]
+    assert [output["total_bid"] for output in outputs] == [160, 40, 15]
+    assert [output["capital_raised"] for output in outputs] == [1000.0, 200.0, 15.0]
+    assert snapshot.investor_summary()[0] == {
+        "company_name": "Over", "total_investors": 2, "average_bid": 80.0, "total_bids": 2
+    }
+    assert snapshot.market_statistics() == {
+        "total_companies": 3,
+        "total_investors": 2,
+        "total_bids": 5,
+        "total_capital_offered": 2200.0,
+        "total_bid_value": 1815.0,
+        "market_oversubscription": False
+    }
+
+def _seed_game(db, game_id, companies):
+    investor = Investor(game_id=game_id, name="Angel Fund", priority_tier=1)
+    rows = [Company(game_id=game_id, name=f"Company {i}", price=10.0, shares=100) for i in range(companies)]
+    db.add_all([investor, *rows])
+    db.flush()
+    db.add_all([
+        Bid(game_id=game_id, investor_id=investor.id, company_id=company.id, shares_bid=10 * (i + 1))
+        for i, company in enumerate(rows)
+    ])
+    db.commit()
+    return investor, rows
+
+def test_load_reads_one_game_with_one_query_per_table(db):
+    investor, companies = _seed_game(db, Config.game.game_id, 25)
+    other_game = GameService().create_game("Other", db)
+    _seed_game(db, other_game, 3)
+    
+    with track_operation("load") as stats:
+        snapshot = BookSnapshot.load(db, Config.game.game_id)
+    
+    assert stats.statements == 3
+    assert snapshot.company_ids.tolist() == [company.id for company in companies]
+    assert snapshot.total_bid.tolist() == [10 * (i + 1) for i in range(25)]
+    assert (snapshot.tiered_investor_ids.tolist(), snapshot.investor_tiers.tolist()) == ([investor.id], [1])
+
+def test_calculations_on_a_given_snapshot_read_nothing(db):
+    _seed_game(db, Config.game.game_id, 25)
+    engine = CalculationEngine()
+    snapshot = BookSnapshot.load(db, Config.game.game_id)
+    
+    with track_operation("calculate") as stats:
+        outputs = engine.calculate_company_outputs(db, snapshot)
+        summary = engine.calculate_investor_summary(db, snapshot)
+        statistics = engine.calculate_market_statistics(db, snapshot)
+    
+    # The only statement is the one batched upsert of the outputs, whatever the number of companies
+    (statement,) = stats.statement_counts
+    assert statement.startswith("INSERT INTO calculated_outputs") and stats.statements == 1
+    assert len(outputs) == len(summary) == 25
+    assert statistics["total_bids"] == 25
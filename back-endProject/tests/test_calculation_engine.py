@@ -0,0 +1,80 @@
+import numpy as np
+from sqlalchemy import func, select, update
+from db.schema import CalculatedOutput, Company
+from db.session import get_session
+from logic.book_snapshot import BookSnapshot
+from logic.calculation_engine import CalculationEngine
+from logic.game_coordinator import GameCoordinator
+from services.company_service import CompanyService
+from services.investor_service import InvestorService
+from config import Config
+
+def _recomputed(db):
+    # Sessions don't autoflush, and company edits are still pending ORM changes
+    db.flush()
+    outputs = BookSnapshot.load(db, Config.game.game_id).company_outputs()
+    for output in outputs:
+        del output["company_id"]
+    return outputs
+
+def test_maintained_outputs_match_a_full_recompute_after_every_write(db):
+    companies, investors = CompanyService(), InvestorService()
+    coordinator, engine = GameCoordinator(), CalculationEngine()
+    company_ids = [companies.create_company(f"Company {i}", 10.0 + i, 100 * (i + 1), db=db) for i in range(3)]
+    investor_ids = [investors.create_investor(f"Investor {i}", db=db) for i in range(4)]
+    
+    # Writes the validation rejects (e.g. over the bid limit) must leave the outputs as they were too
+    rng = np.random.default_rng(0)
+    for step in range(60):
+        company_id = int(rng.choice(company_ids))
+        if step % 10 == 9:
+            # Price and share changes move capital raised and subscription status, not the bid total
+            companies.update_company(
+                company_id, price=float(rng.integers(1, 50)), shares=int(rng.integers(50, 400)), db=db
+            )
+        elif step % 2:
+            investors.update_bid(int(rng.choice(investor_ids)), company_id, int(rng.integers(0, 120)), db=db)
+        else:
+            coordinator.validate_and_update_bid(
+                int(rng.choice(investor_ids)), company_id, int(rng.integers(0, 120)), db=db
+            )
+        assert engine.get_company_outputs(db) == _recomputed(db)
+    assert any(output["total_bid"] for output in _recomputed(db))
+
+def test_outputs_report_subscription_status(db):
+    company_id = CompanyService().create_company("TechCorp", 10.0, 100, db=db)
+    investor_ids = [InvestorService().create_investor(name, db=db) for name in ("A", "B")]
+    engine = CalculationEngine()
+    
+    def output():
+        (row,) = engine.get_company_outputs(db)
+        return row["total_bid"], row["capital_raised"], row["subscription_status"]
+    
+    assert output() == (0, 0.0, "Under-subscribed")
+    InvestorService().update_bid(investor_ids[0], company_id, 100, db=db)
+    assert output() == (100, 1000.0, "Fully-subscribed")
+    InvestorService().update_bid(investor_ids[1], company_id, 60, db=db)
+    assert output() == (160, 1000.0, "Over-subscribed")
+    InvestorService().update_bid(investor_ids[0], company_id, 10, db=db)
+    assert output() == (70, 700.0, "Under-subscribed")
+
+def test_bid_writes_use_the_stored_company_row(db):
+    company_id = CompanyService().create_company("TechCorp", 10.0, 100, db=db)
+    investor_id = InvestorService().create_investor("Angel Fund", db=db)
+    db.commit()
+    # Loaded before someone else reprices the company
+    company = db.get(Company, company_id)
+    with get_session() as other:
+        other.execute(update(Company).where(Company.id == company_id).values(price=20.0, shares=50))
+    
+    CalculationEngine().apply_bid_delta(db, company.id, 80)
+    (row,) = CalculationEngine().get_company_outputs(db)
+    assert (row["total_bid"], row["capital_raised"], row["subscription_status"]) == (80, 1000.0, "Over-subscribed")
+
+def test_companies_without_an_output_row_are_backfilled(db):
+    # Written outside the services, as main.py --init seeds them
+    db.add(Company(game_id=Config.game.game_id, name="Seeded", price=5.0, shares=10))
+    db.flush()
+    
+    assert CalculationEngine().get_company_outputs(db) == _recomputed(db)
+    assert db.scalar(select(func.count(CalculatedOutput.id))) == 1
@@ -0,0 +1,50 @@
+import pytest
+from config import Config
+from db.changes import ChangeListener, get_change_sequences, notify_change, BIDS, COMPANIES, INVESTORS
+from main import SimulationGame
+from services.game_service import GameService
+
+GAME = Config.game.game_id
+
+@pytest.fixture
+def listener(db):
+    listener = ChangeListener([COMPANIES, INVESTORS], GAME)
+    # The first poll always reports a change, so a screen draws itself once
+    assert listener.poll()
+    yield listener
+    listener.close()
+
+def test_listener_reports_committed_changes_once(db, listener):
+    assert not listener.poll()
+    
+    notify_change(db, GAME, COMPANIES)
+    assert not listener.poll()
+    db.commit()
+    
+    assert listener.poll()
+    assert not listener.poll()
+
+def test_listener_ignores_other_channels_and_games(db, listener):
+    other = GameService().create_game("Other", db)
+    notify_change(db, GAME, BIDS)
+    notify_change(db, other, COMPANIES)
+    db.commit()
+    
+    assert not listener.poll()
+
+def test_listener_on_every_game_sees_each_of_them(db):
+    other = GameService().create_game("Other", db)
+    db.commit()
+    listener = ChangeListener([COMPANIES])
+    assert listener.poll()
+    
+    notify_change(db, other, COMPANIES)
+    db.commit()
+    assert listener.poll()
+    listener.close()
+
+def test_seeding_sample_data_notifies_listeners(db, listener):
+    SimulationGame().seed_sample_data()
+    
+    assert listener.poll()
+    assert get_change_sequences(db, GAME, [COMPANIES, INVESTORS]) == {COMPANIES: 1, INVESTORS: 1}
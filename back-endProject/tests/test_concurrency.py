@@ -0,0 +1,109 @@
+import pytest
+from sqlalchemy.orm.exc import StaleDataError
+from db.concurrency import retry_on_conflict, CONFLICT_MESSAGE
+from db.schema import Company, SessionLocal
+from logic.approval_manager import ApprovalManager
+from logic.game_coordinator import GameCoordinator
+from services.company_service import CompanyService
+from services.investor_service import InvestorService
+from config import ApprovalStatus
+
+@pytest.fixture
+def company_id(db):
+    company_id = CompanyService().create_company("TechCorp", 10.0, 1000, db=db)
+    db.commit()
+    return company_id
+
+def _company(company_id):
+    with SessionLocal() as session:
+        return session.get(Company, company_id)
+
+def test_update_at_the_read_version_succeeds(company_id):
+    version = CompanyService().get_company_by_id(company_id)["version"]
+    
+    assert CompanyService().update_company(company_id, price=12.0, version=version) == (
+        True, "Company updated successfully"
+    )
+    assert _company(company_id).version == version + 1
+
+def test_update_at_a_stale_version_is_a_conflict(company_id):
+    service = CompanyService()
+    version = service.get_company_by_id(company_id)["version"]
+    assert service.update_company(company_id, price=12.0, version=version)[0]
+    
+    assert service.update_company(company_id, price=20.0, version=version) == (False, CONFLICT_MESSAGE)
+    assert GameCoordinator().validate_and_update_company(company_id, shares=10, version=version) == (
+        False, CONFLICT_MESSAGE
+    )
+    assert _company(company_id).price == 12.0
+
+def test_invalid_updates_are_not_conflicts(company_id):
+    service = CompanyService()
+    
+    assert service.update_company(company_id, price=-1.0) == (False, "Price must be between $1.0 and $1000.0")
+    assert service.update_company(999, price=12.0) == (False, "Company not found")
+    assert service.update_company(company_id) == (False, "No changes specified")
+
+def _bid_version(investor_id, company_id):
+    (investor,) = [row for row in InvestorService().get_bid_matrix()["investors"] if row["id"] == investor_id]
+    return investor["versions"].get(company_id, 0)
+
+def test_bid_writes_compare_the_read_version(company_id):
+    service = InvestorService()
+    investor_id = service.create_investor("Angel Fund")
+    
+    assert service.update_bid(investor_id, company_id, 100, version=0) == (True, "Bid updated successfully")
+    version = _bid_version(investor_id, company_id)
+    assert service.update_bid(investor_id, company_id, 200, version=version)[0]
+    
+    # Both the version read before the last write and "doesn't exist yet" are stale now
+    assert service.update_bid(investor_id, company_id, 300, version=version) == (False, CONFLICT_MESSAGE)
+    assert GameCoordinator().validate_and_update_bid(investor_id, company_id, 300, version=0) == (
+        False, CONFLICT_MESSAGE
+    )
+    assert _bid_version(investor_id, company_id) == version + 1
+    assert InvestorService().get_investor_by_id(investor_id)["bids"] == {"TechCorp": 200}
+
+def test_approval_writes_compare_the_read_versions(company_id):
+    manager = ApprovalManager()
+    field = f"company_{company_id}"
+    (approval,) = manager.get_pending_approvals()
+    
+    assert manager.set_many([field], "team1", ApprovalStatus.OK, versions=[approval["version"]])[0]
+    assert manager.set_many([field], "team2", ApprovalStatus.OK, versions=[approval["version"]]) == (
+        False, CONFLICT_MESSAGE
+    )
+    assert manager.get_field_status(field)["team2_status"] == ApprovalStatus.TBD
+
+def test_concurrent_write_to_a_read_row_raises_stale_data(company_id):
+    with SessionLocal() as first, SessionLocal() as second:
+        mine = first.get(Company, company_id)
+        theirs = second.get(Company, company_id)
+        theirs.price = 11.0
+        second.commit()
+        
+        mine.price = 12.0
+        with pytest.raises(StaleDataError):
+            first.commit()
+    
+    assert _company(company_id).price == 11.0
+
+def test_retry_on_conflict_reruns_then_gives_up():
+    calls = []
+    
+    @retry_on_conflict(conflict_result="conflict", attempts=3)
+    def write(succeed_on: int, db=None):
+        calls.append(db)
+        if len(calls) < succeed_on:
+            raise StaleDataError()
+        return "written"
+    
+    assert write(2) == "written" and len(calls) == 2
+    calls.clear()
+    assert write(5) == "conflict" and len(calls) == 3
+    
+    # Inside the caller's session the error is the caller's to handle
+    calls.clear()
+    with pytest.raises(StaleDataError):
+        write(2, db=object())
+    assert len(calls) == 1
@@ -0,0 +1,78 @@
+import io
+import os
+from utils.display import ANSI_ESCAPE, DisplayFormatter
+from utils import screen
+from utils.screen import LiveScreen
+
+COMPANIES = [
+    {"id": 1, "name": "TechCorp", "price": 10.0, "shares": 1000, "status": "OK"},
+    {"id": 2, "name": "BioFirm", "price": 15.75, "shares": 500, "status": "TBD"},
+    {"id": 3, "name": "Retail", "price": 8.5, "shares": 25000}
+]
+INVESTORS = [
+    {"name": "Alice", "bids": {"TechCorp": 100, "BioFirm": 50}},
+    {"name": "Bob", "bids": {"TechCorp": 2500}}
+]
+APPROVALS = [
+    {"field_name": "TechCorp_price", "team1_status": "OK", "team2_status": "TBD"},
+    {"field_name": "TechCorp_shares", "team1_status": "OK", "team2_status": "OK"}
+]
+
+def _assert_company_parity(formatter, companies):
+    assert formatter.render_company_table(companies) == formatter.format_company_table(companies).splitlines()
+
+def test_company_table_matches_tabulate_across_updates():
+    formatter = DisplayFormatter()
+    _assert_company_parity(formatter, COMPANIES)
+    
+    # A wider value widens its column, a dropped row narrows it back, a new row is formatted on its own
+    edited = [dict(COMPANIES[0], shares=1234567), *COMPANIES[1:]]
+    _assert_company_parity(formatter, edited)
+    _assert_company_parity(formatter, COMPANIES[:2])
+    _assert_company_parity(formatter, COMPANIES + [{"id": 4, "name": "A much longer company name", "price": 1.0,
+                                                    "shares": 10, "status": "OK"}])
+    _assert_company_parity(formatter, COMPANIES)
+
+def test_investor_table_matches_tabulate_across_updates():
+    formatter = DisplayFormatter()
+    for investors in (INVESTORS, [INVESTORS[0], dict(INVESTORS[1], bids={"TechCorp": 7, "Retail": 30})],
+                      INVESTORS[:1]):
+        assert formatter.render_investor_table(investors) == formatter.format_investor_table(investors).splitlines()
+
+def test_approval_table_matches_tabulate_across_updates():
+    formatter = DisplayFormatter()
+    for approvals in (APPROVALS, [dict(APPROVALS[0], team2_status="OK"), APPROVALS[1]], APPROVALS[1:]):
+        assert formatter.render_approval_status(approvals) == formatter.format_approval_status(approvals).splitlines()
+
+class _Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+def test_screen_prints_plain_frames_when_not_a_terminal():
+    stream = io.StringIO()
+    live = LiveScreen(stream)
+    lines = DisplayFormatter().render_company_table(COMPANIES)
+    live.render(lines)
+    live.render(lines)
+    
+    # Every frame is printed in full, with the colors stripped
+    frame = ANSI_ESCAPE.sub("", DisplayFormatter().format_company_table(COMPANIES)) + "\n"
+    assert stream.getvalue() == frame * 2
+    assert "\033" not in stream.getvalue()
+
+def test_screen_rewrites_only_changed_lines_on_a_terminal(monkeypatch):
+    monkeypatch.setattr(screen.shutil, "get_terminal_size", lambda: os.terminal_size((120, 40)))
+    stream = _Terminal()
+    live = LiveScreen(stream)
+    live.render(["header", "first", "second"])
+    stream.seek(0)
+    stream.truncate()
+    
+    live.render(["header", "first", "changed"])
+    assert stream.getvalue() == "\0337\033[3;1Hchanged\033[K\0338"
+
+def test_screen_falls_back_to_full_frames_when_the_panel_does_not_fit(monkeypatch):
+    monkeypatch.setattr(screen.shutil, "get_terminal_size", lambda: os.terminal_size((10, 40)))
+    stream = _Terminal()
+    LiveScreen(stream).render(["a line wider than ten columns"])
+    assert stream.getvalue() == "a line wider than ten columns\n"
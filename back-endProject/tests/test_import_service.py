@@ -0,0 +1,75 @@
+import json
+from sqlalchemy import func, select
+from db.schema import Company, Investor, Bid, ApprovalToggle
+from services.import_service import ImportService
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+def _jsonl(path, rows):
+    return _write(path, "".join(json.dumps(row) + "\n" for row in rows))
+
+def _count(db, model):
+    return db.scalar(select(func.count(model.id)))
+
+def test_imports_csv_and_json_lines(db, tmp_path):
+    companies = _write(tmp_path / "companies.csv", "name,price,shares\nTechCorp,10,1000\nBioMed,15.5,750\n")
+    investors = _jsonl(tmp_path / "investors.jsonl", [{"name": "Angel Fund"}, {"name": "Growth", "priority_tier": 1}])
+    bids = _jsonl(tmp_path / "bids.ndjson", [
+        {"investor": "Angel Fund", "company": "TechCorp", "shares": 400},
+        {"investor": "Growth", "company": "BioMed", "shares": 100}
+    ])
+    
+    result = ImportService().import_scenario(companies, investors, bids, db=db)
+    
+    assert result["success"], result["errors"]
+    assert (result["companies"], result["investors"], result["bids"], result["approvals"]) == (2, 2, 2, 4)
+    assert db.scalar(select(Investor.priority_tier).where(Investor.name == "Growth")) == 1
+    assert _count(db, ApprovalToggle) == 4
+
+def test_malformed_json_lines_are_reported_by_line(db, tmp_path):
+    companies = _write(tmp_path / "companies.jsonl", "\n".join([
+        json.dumps({"name": "TechCorp", "price": 10, "shares": 100}),
+        "",
+        '{"name": "BioMed", "price": 15,',
+        "[1, 2, 3]",
+        '"TechCorp"',
+        json.dumps({"name": "GreenEnergy", "price": "abc", "shares": 100})
+    ]) + "\n")
+    
+    result = ImportService().import_scenario(companies=companies, db=db)
+    
+    assert not result["success"]
+    assert result["errors"][0].startswith(f"{companies}:3: invalid JSON (")
+    assert result["errors"][1:] == [
+        f"{companies}:4: expected a JSON object, got list",
+        f"{companies}:5: expected a JSON object, got str",
+        f"{companies}:6: price must be a number"
+    ]
+    assert _count(db, Company) == 0
+
+def test_invalid_rows_reject_the_whole_scenario(db, tmp_path):
+    companies = _write(tmp_path / "companies.csv", "name,price,shares\nTechCorp,10,100\nTechCorp,10,100\n")
+    investors = _write(tmp_path / "investors.csv", "name\nAngel Fund\n")
+    bids = _write(tmp_path / "bids.csv", "investor,company,shares\nAngel Fund,TechCorp,50\nNobody,Missing,-1\n")
+    
+    result = ImportService().import_scenario(companies, investors, bids, db=db)
+    
+    assert not result["success"]
+    assert result["errors"] == [
+        f"{companies}:3: name 'TechCorp' must be unique",
+        f"{bids}:3: unknown investor 'Nobody'",
+        f"{bids}:3: unknown company 'Missing'",
+        f"{bids}:3: bid shares cannot be negative"
+    ]
+    assert (_count(db, Company), _count(db, Investor), _count(db, Bid)) == (0, 0, 0)
+
+def test_bids_over_the_oversubscription_limit_are_rejected(db, tmp_path):
+    companies = _write(tmp_path / "companies.csv", "name,price,shares\nTechCorp,10,100\n")
+    investors = _write(tmp_path / "investors.csv", "name\nA\nB\n")
+    bids = _write(tmp_path / "bids.csv", "investor,company,shares\nA,TechCorp,150\nB,TechCorp,51\n")
+    
+    result = ImportService().import_scenario(companies, investors, bids, db=db)
+    
+    assert result["errors"] == [f"{bids}: bids on 'TechCorp' total 201, over the limit of 200"]
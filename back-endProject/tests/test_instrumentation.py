@@ -0,0 +1,26 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from db.instrumentation import track_operation
+
+def test_statements_are_counted_toward_open_operations(engine):
+    with engine.connect() as connection:
+        with track_operation("outer") as outer:
+            connection.execute(text("SELECT 1"))
+            with track_operation("inner") as inner:
+                connection.execute(text("SELECT 2"))
+    
+    assert (outer.statements, inner.statements) == (2, 1)
+    assert outer.db_time_ms >= inner.db_time_ms > 0
+
+def test_failed_statement_leaves_no_timing_state(engine):
+    with engine.connect() as connection:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                connection.execute(text("SELECT * FROM missing_table"))
+        
+        with track_operation("after failures") as stats:
+            connection.execute(text("SELECT 1"))
+        
+        assert stats.statements == 1
+        assert not any("start" in key for key in connection.info)
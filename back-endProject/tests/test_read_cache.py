@@ -0,0 +1,71 @@
+import pytest
+from db.schema import SessionLocal
+from services.company_service import CompanyService, company_cache
+from utils.read_cache import VersionedCache
+
+def test_least_recently_used_entry_is_evicted():
+    cache = VersionedCache(2)
+    cache.put("a", 1, "A")
+    cache.put("b", 1, "B")
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a", 1) == "A"
+    cache.put("c", 1, "C")
+    
+    assert len(cache) == 2
+    assert cache.get("b", 1) is None
+    assert (cache.get("a", 1), cache.get("c", 1)) == ("A", "C")
+
+def test_entry_is_only_returned_at_its_version():
+    cache = VersionedCache(2)
+    cache.put("a", 1, "old")
+    
+    assert cache.get("a", 2) is None
+    cache.put("a", 2, "new")
+    assert cache.get("a", 2) == "new"
+    assert cache.get("a", 1) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_zero_size_cache_keeps_nothing():
+    cache = VersionedCache(0)
+    cache.put("a", 1, "A")
+    assert len(cache) == 0 and cache.get("a", 1) is None
+
+@pytest.fixture
+def company_id(db):
+    company_id = CompanyService().create_company("TechCorp", 10.0, 1000, db=db)
+    db.commit()
+    company_cache.clear()
+    return company_id
+
+def test_reads_on_a_caller_session_use_the_cache(db, company_id):
+    service = CompanyService()
+    first = service.get_all_companies(db)
+    hits = company_cache.hits
+    
+    assert service.get_all_companies(db) == first
+    assert service.get_all_companies() == first
+    assert company_cache.hits == hits + 2
+
+def test_a_committed_edit_changes_the_version(db, company_id):
+    service = CompanyService()
+    service.get_company_by_id(company_id, db)
+    
+    assert service.update_company(company_id, price=12.0, db=db)[0]
+    db.commit()
+    assert service.get_company_by_id(company_id, db)["price"] == 12.0
+    assert service.get_company_by_id(company_id)["price"] == 12.0
+
+def test_uncommitted_edits_stay_out_of_the_cache(db, company_id):
+    service = CompanyService()
+    assert service.update_company(company_id, price=12.0, db=db)[0]
+    entries = len(company_cache)
+    
+    assert service.get_company_by_id(company_id, db)["price"] == 12.0
+    assert len(company_cache) == entries
+    db.rollback()
+    
+    # After the rollback the session may use the cache again, and no reader sees the rolled-back price
+    with SessionLocal() as other:
+        assert service.get_company_by_id(company_id, other)["price"] == 10.0
+    assert service.get_company_by_id(company_id, db)["price"] == 10.0
+    assert len(company_cache) == entries + 1
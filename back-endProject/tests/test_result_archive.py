@@ -0,0 +1,88 @@
+import json
+import zlib
+import pytest
+from sqlalchemy import func, select
+from db.schema import ResultSnapshot
+from logic.allocation_engine import AllocationEngine
+from logic.approval_manager import ApprovalManager
+from logic.book_snapshot import BookSnapshot
+from logic.game_coordinator import GameCoordinator
+from services.company_service import CompanyService
+from services.investor_service import InvestorService
+from config import ApprovalStatus, Config
+
+def _approve_all(db):
+    manager = ApprovalManager()
+    fields = [approval["field_name"] for approval in manager.get_pending_approvals(db)]
+    for team in ("team1", "team2"):
+        assert manager.set_many(fields, team, ApprovalStatus.OK, db)[0]
+
+def _fills(db, investor_id):
+    return GameCoordinator().calculation_engine.get_investor_allocations(db, investor_id)
+
+@pytest.fixture
+def game(db):
+    # One oversubscribed offering, so the fills differ from the bids
+    company_id = CompanyService().create_company("TechCorp", 10.0, 100, db=db)
+    investor_ids = [InvestorService().create_investor(name, db=db) for name in ("A", "B")]
+    for investor_id, shares in zip(investor_ids, (120, 40)):
+        assert InvestorService().update_bid(investor_id, company_id, shares, db=db)[0]
+    _approve_all(db)
+    return company_id, investor_ids
+
+def test_nothing_is_frozen_until_everything_is_approved(db, game):
+    company_id, investor_ids = game
+    assert InvestorService().update_bid(investor_ids[1], company_id, 30, db=db)[0]
+    
+    assert GameCoordinator().freeze_results(db) is None
+    assert db.scalar(select(func.count(ResultSnapshot.id))) == 0
+
+def test_freezing_is_idempotent(db, game):
+    coordinator = GameCoordinator()
+    first = coordinator.freeze_results(db)
+    
+    assert first["round"] == 1
+    assert coordinator.freeze_results(db) == first
+    assert coordinator.get_frozen_results(db) == first
+    assert db.scalar(select(func.count(ResultSnapshot.id))) == 1
+
+def test_snapshot_matches_the_live_allocation(db, game):
+    _, investor_ids = game
+    frozen = GameCoordinator().freeze_results(db)
+    
+    snapshot = BookSnapshot.load(db, Config.game.game_id)
+    allocated = AllocationEngine().allocate(snapshot)
+    assert frozen["investor_summary"] == snapshot.investor_summary(allocated)
+    assert frozen["market_statistics"] == snapshot.market_statistics()
+    assert [_fills(db, investor_id) for investor_id in investor_ids] == [
+        [{"company_name": "TechCorp", "shares_allocated": 75}],
+        [{"company_name": "TechCorp", "shares_allocated": 25}]
+    ]
+
+def test_payload_is_compressed_json_of_the_results(db, game):
+    frozen = GameCoordinator().freeze_results(db)
+    
+    payload = db.scalar(select(ResultSnapshot.payload))
+    assert json.loads(zlib.decompress(payload)) == {key: value for key, value in frozen.items() if key != "round"}
+    assert GameCoordinator().get_round_results(1, db) == frozen
+
+def test_a_new_round_does_not_see_the_old_fills(db, game):
+    company_id, investor_ids = game
+    coordinator = GameCoordinator()
+    first = coordinator.freeze_results(db)
+    
+    # The changed bid goes back to TBD, so the frozen round no longer counts as current
+    assert InvestorService().update_bid(investor_ids[1], company_id, 30, db=db)[0]
+    assert coordinator.get_frozen_results(db) is None
+    _approve_all(db)
+    second = coordinator.freeze_results(db)
+    
+    assert second["round"] == 2
+    (summary,) = second["investor_summary"]
+    assert (summary["shares_allocated"], summary["fill_ratio"]) == (100, 100 / 150)
+    assert [_fills(db, investor_id) for investor_id in investor_ids] == [
+        [{"company_name": "TechCorp", "shares_allocated": 80}],
+        [{"company_name": "TechCorp", "shares_allocated": 20}]
+    ]
+    assert coordinator.get_round_results(1, db) == first
+    assert [entry["round"] for entry in coordinator.get_result_rounds(db)] == [1, 2]
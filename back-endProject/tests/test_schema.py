@@ -0,0 +1,32 @@
+import pytest
+from sqlalchemy import inspect, text
+from db.schema import init_db, reset_db
+
+def _columns(engine, table):
+    return {column["name"] for column in inspect(engine).get_columns(table)}
+
+def test_init_db_adds_columns_with_defaults_to_existing_tables(engine):
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO games (id, name) VALUES (1, 'Game 1')"))
+        connection.execute(text("INSERT INTO investors (game_id, name) VALUES (1, 'Angel Fund')"))
+        connection.execute(text("ALTER TABLE investors DROP COLUMN priority_tier"))
+    
+    init_db()
+    
+    assert "priority_tier" in _columns(engine, "investors")
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT name, priority_tier FROM investors")).all() == [("Angel Fund", 0)]
+
+def test_init_db_refuses_columns_it_cannot_add_and_reset_db_recreates(engine):
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE calculated_outputs DROP COLUMN subscription_status"))
+        connection.execute(text("ALTER TABLE investors DROP COLUMN priority_tier"))
+    
+    with pytest.raises(RuntimeError, match=r"calculated_outputs\.subscription_status.*--reset-db"):
+        init_db()
+    # Nothing is half-migrated
+    assert "priority_tier" not in _columns(engine, "investors")
+    
+    reset_db()
+    assert "subscription_status" in _columns(engine, "calculated_outputs")
+    assert "priority_tier" in _columns(engine, "investors")
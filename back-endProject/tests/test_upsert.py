@@ -0,0 +1,45 @@
+import threading
+import time
+from sqlalchemy import select
+from db.schema import Bid
+from db.upsert import upsert_bid
+from logic.calculation_engine import CalculationEngine
+from services.company_service import CompanyService
+from services.investor_service import InvestorService
+from config import Config
+
+def _bid(db, investor_id, company_id):
+    return db.execute(select(Bid.shares_bid, Bid.version).where(
+        Bid.investor_id == investor_id, Bid.company_id == company_id
+    )).one()
+
+def test_upsert_bid_returns_the_shares_it_replaced(db):
+    game_id = Config.game.game_id
+    company_id = CompanyService().create_company("TechCorp", 10.0, 1000, db=db)
+    investor_id = InvestorService().create_investor("Angel Fund", db=db)
+    
+    assert upsert_bid(db, game_id, investor_id, company_id, 100) == 0
+    assert _bid(db, investor_id, company_id) == (100, 1)
+    
+    assert upsert_bid(db, game_id, investor_id, company_id, 250) == 100
+    assert upsert_bid(db, game_id, investor_id, company_id, 0) == 250
+    assert _bid(db, investor_id, company_id) == (0, 3)
+    assert len(db.execute(select(Bid.id)).all()) == 1
+
+def test_concurrent_bid_writes_keep_the_output_total(db):
+    company_id = CompanyService().create_company("TechCorp", 10.0, 1000, db=db)
+    investor_id = InvestorService().create_investor("Angel Fund", db=db)
+    InvestorService().update_bid(investor_id, company_id, 100, db=db)
+    db.commit()
+    
+    # The second writer starts while the first holds its uncommitted change
+    InvestorService().update_bid(investor_id, company_id, 200, db=db)
+    writer = threading.Thread(target=InvestorService().update_bid, args=(investor_id, company_id, 50))
+    writer.start()
+    time.sleep(0.3)
+    db.commit()
+    writer.join()
+    
+    db.expire_all()
+    (output,) = CalculationEngine().get_company_outputs(db)
+    assert _bid(db, investor_id, company_id)[0] == output["total_bid"] == 50
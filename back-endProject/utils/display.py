@@ -1,7 +1,90 @@
-from typing import List, Dict, Optional
-from tabulate import tabulate
+import re
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
 from config import Config
 
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+
+def visible_width(text: str) -> int:
+    return len(ANSI_ESCAPE.sub("", text))
+
+class TableRenderer:
+    """Grid table (tabulate's "grid" layout) that keeps its formatted rows and column widths between renders.
+    
+    Rows are given as (key, row) pairs, the key holding everything the row shows. Only rows with a key
+    not seen last time are formatted, and column widths are kept as per-column width counts, so
+    adding or dropping a row costs that row alone. Cached lines are rebuilt only when a width moves.
+    """
+    
+    def __init__(self, format_row: Callable[[Any], Sequence[Any]],
+                 right_aligned: Callable[[int], bool] = lambda column: False):
+        self.format_row = format_row
+        self.right_aligned = right_aligned
+        self._reset([])
+    
+    def render(self, headers: List[str], rows: Iterable[Tuple[Hashable, Any]]) -> List[str]:
+        if headers != self.headers:
+            self._reset(headers)
+        
+        rows = list(rows)
+        for key, row in rows:
+            if key not in self._cells:
+                self._cells[key] = [str(cell) for cell in self.format_row(row)]
+        
+        current = Counter(key for key, _ in rows)
+        for key in current.keys() | self._counts.keys():
+            change = current[key] - self._counts[key]
+            if change:
+                self._add_widths(self._cells[key], change)
+            if not current[key]:
+                del self._cells[key]
+                self._lines.pop(key, None)
+        self._counts = current
+        
+        widths = [max(counts) for counts in self._width_counts]
+        if widths != self.widths:
+            self.widths = widths
+            self._lines.clear()
+        
+        separator = self._border("-")
+        lines = [separator, self._line(self.headers), self._border("=")]
+        for key, _ in rows:
+            line = self._lines.get(key)
+            if line is None:
+                line = self._lines[key] = self._line(self._cells[key])
+            lines.append(line)
+            lines.append(separator)
+        return lines
+    
+    def _reset(self, headers: List[str]) -> None:
+        self.headers = list(headers)
+        self._cells: Dict[Hashable, List[str]] = {}
+        self._lines: Dict[Hashable, str] = {}
+        self._counts: Counter = Counter()
+        # Headers get two spaces of padding, as tabulate gives them
+        self._width_counts = [Counter({visible_width(header) + 2: 1}) for header in self.headers]
+        self.widths = [max(counts) for counts in self._width_counts]
+    
+    def _add_widths(self, cells: List[str], times: int) -> None:
+        for counts, cell in zip(self._width_counts, cells):
+            width = visible_width(cell)
+            counts[width] += times
+            if counts[width] <= 0:
+                del counts[width]
+    
+    def _border(self, fill: str) -> str:
+        return "+" + "+".join(fill * (width + 2) for width in self.widths) + "+"
+    
+    def _line(self, cells: Sequence[str]) -> str:
+        parts = []
+        for column, (cell, width) in enumerate(zip(cells, self.widths)):
+            padding = " " * (width - visible_width(cell))
+            parts.append(padding + cell if self.right_aligned(column) else cell + padding)
+        return "| " + " | ".join(parts) + " |"
+
+COMPANY_HEADERS = ["ID", "Company", "Price", "Shares", "Status"]
+APPROVAL_HEADERS = ["Field", "Team 1", "Team 2", "Overall Status"]
+
 class DisplayFormatter:
     def __init__(self):
         self.config = Config.display
@@ -12,45 +95,25 @@ class DisplayFormatter:
             "blue": "\033[94m",
             "reset": "\033[0m"
         }
+        # Numeric columns are right-aligned, as tabulate does: ID, shares and every bid column
+        self.company_renderer = TableRenderer(self._company_row, right_aligned=lambda column: column in (0, 3))
+        self.investor_renderer = TableRenderer(self._investor_row, right_aligned=lambda column: column > 0)
+        self.approval_renderer = TableRenderer(self._approval_row)
     
     def format_company_table(self, companies: List[Dict]) -> str:
         if not companies:
             return "No company data available"
         
-        headers = ["ID", "Company", "Price", "Shares", "Status"]
-        rows = []
-        
-        for company in companies:
-            status = company.get("status", "TBD")
-            status_color = self._get_status_color(status)
-            
-            rows.append([
-                company.get("id", ""),
-                self._truncate_text(company["name"]),
-                f"${company['price']:.2f}",
-                f"{company['shares']:,}",
-                f"{status_color}{status}{self.colors['reset']}"
-            ])
-        
-        return tabulate(rows, headers=headers, tablefmt=self.config.table_format)
+        rows = [self._company_row(company) for company in companies]
+        return self._tabulate(rows, COMPANY_HEADERS)
     
-    def format_investor_table(self, investors: List[Dict]) -> str:
+    def format_investor_table(self, investors: List[Dict], companies: Optional[List[str]] = None) -> str:
         if not investors:
             return "No investor data available"
         
-        companies = list(investors[0]["bids"].keys()) if investors[0]["bids"] else []
-        headers = ["Investor"] + companies
-        
-        rows = []
-        for investor in investors:
-            row = [self._truncate_text(investor["name"])]
-            row.extend([
-                f"{investor['bids'].get(company, 0):,}" 
-                for company in companies
-            ])
-            rows.append(row)
-        
-        return tabulate(rows, headers=headers, tablefmt=self.config.table_format)
+        companies = self._bid_columns(investors, companies)
+        rows = [self._investor_row(self._investor_key(investor, companies)) for investor in investors]
+        return self._tabulate(rows, ["Investor"] + companies)
     
     def format_results_table(self, results: List[Dict]) -> str:
         if not results:
@@ -78,31 +141,88 @@ class DisplayFormatter:
                 f"{result['shares_offered']:,}"
             ])
         
-        return tabulate(rows, headers=headers, tablefmt=self.config.table_format)
+        return self._tabulate(rows, headers)
     
     def format_approval_status(self, approvals: List[Dict]) -> str:
         if not approvals:
             return "No approval data available"
         
-        headers = ["Field", "Team 1", "Team 2", "Overall Status"]
-        rows = []
+        rows = [self._approval_row(approval) for approval in approvals]
+        return self._tabulate(rows, APPROVAL_HEADERS)
+    
+    def render_company_table(self, companies: List[Dict]) -> List[str]:
+        """format_company_table() as lines, through a render cache that lives as long as the formatter."""
+        if not companies or self.config.table_format != "grid":
+            return self.format_company_table(companies).splitlines()
         
-        for approval in approvals:
-            team1_color = self._get_status_color(approval["team1_status"])
-            team2_color = self._get_status_color(approval["team2_status"])
-            
-            overall_status = "Complete" if (
-                approval["team1_status"] == "OK" and approval["team2_status"] == "OK"
-            ) else "Pending"
-            overall_color = self._get_status_color(overall_status)
-            
-            rows.append([
-                self._truncate_text(approval["field_name"]),
-                f"{team1_color}{approval['team1_status']}{self.colors['reset']}",
-                f"{team2_color}{approval['team2_status']}{self.colors['reset']}",
-                f"{overall_color}{overall_status}{self.colors['reset']}"
-            ])
+        return self.company_renderer.render(COMPANY_HEADERS, (
+            ((company.get("id", ""), company["name"], company["price"], company["shares"],
+              company.get("status", "TBD")), company)
+            for company in companies
+        ))
+    
+    def render_investor_table(self, investors: List[Dict], companies: Optional[List[str]] = None) -> List[str]:
+        if not investors or self.config.table_format != "grid":
+            return self.format_investor_table(investors, companies).splitlines()
+        
+        companies = self._bid_columns(investors, companies)
+        keys = (self._investor_key(investor, companies) for investor in investors)
+        return self.investor_renderer.render(["Investor"] + companies, ((key, key) for key in keys))
+    
+    def render_approval_status(self, approvals: List[Dict]) -> List[str]:
+        if not approvals or self.config.table_format != "grid":
+            return self.format_approval_status(approvals).splitlines()
+        
+        return self.approval_renderer.render(APPROVAL_HEADERS, (
+            ((approval["field_name"], approval["team1_status"], approval["team2_status"]), approval)
+            for approval in approvals
+        ))
+    
+    def _company_row(self, company: Dict) -> List:
+        status = company.get("status", "TBD")
+        status_color = self._get_status_color(status)
         
+        return [
+            company.get("id", ""),
+            self._truncate_text(company["name"]),
+            f"${company['price']:.2f}",
+            f"{company['shares']:,}",
+            f"{status_color}{status}{self.colors['reset']}"
+        ]
+    
+    def _bid_columns(self, investors: List[Dict], companies: Optional[List[str]]) -> List[str]:
+        if companies is None:
+            # Union of every investor's bid columns, in first-seen order
+            companies = list(dict.fromkeys(
+                company for investor in investors for company in investor["bids"]
+            ))
+        return companies
+    
+    def _investor_key(self, investor: Dict, companies: List[str]) -> Tuple:
+        return (investor["name"],) + tuple(investor["bids"].get(company, 0) for company in companies)
+    
+    def _investor_row(self, key: Tuple) -> List[str]:
+        return [self._truncate_text(key[0])] + [f"{shares:,}" for shares in key[1:]]
+    
+    def _approval_row(self, approval: Dict) -> List[str]:
+        team1_color = self._get_status_color(approval["team1_status"])
+        team2_color = self._get_status_color(approval["team2_status"])
+        
+        overall_status = "Complete" if (
+            approval["team1_status"] == "OK" and approval["team2_status"] == "OK"
+        ) else "Pending"
+        overall_color = self._get_status_color(overall_status)
+        
+        return [
+            self._truncate_text(approval["field_name"]),
+            f"{team1_color}{approval['team1_status']}{self.colors['reset']}",
+            f"{team2_color}{approval['team2_status']}{self.colors['reset']}",
+            f"{overall_color}{overall_status}{self.colors['reset']}"
+        ]
+    
+    def _tabulate(self, rows: List[List], headers: List[str]) -> str:
+        # Deferred so that importing the print helpers (main.py --help) does not load tabulate
+        from tabulate import tabulate
         return tabulate(rows, headers=headers, tablefmt=self.config.table_format)
     
     def _truncate_text(self, text: str) -> str:
@@ -145,12 +265,21 @@ formatter = DisplayFormatter()
 def format_company_table(companies: List[Dict]) -> str:
     return formatter.format_company_table(companies)
 
-def format_investor_table(investors: List[Dict]) -> str:
-    return formatter.format_investor_table(investors)
+def format_investor_table(investors: List[Dict], companies: Optional[List[str]] = None) -> str:
+    return formatter.format_investor_table(investors, companies)
 
 def format_results_table(results: List[Dict]) -> str:
     return formatter.format_results_table(results)
 
+def render_company_table(companies: List[Dict]) -> List[str]:
+    return formatter.render_company_table(companies)
+
+def render_investor_table(investors: List[Dict], companies: Optional[List[str]] = None) -> List[str]:
+    return formatter.render_investor_table(investors, companies)
+
+def render_approval_status(approvals: List[Dict]) -> List[str]:
+    return formatter.render_approval_status(approvals)
+
 def format_approval_status(approvals: List[Dict]) -> str:
     return formatter.format_approval_status(approvals)
 
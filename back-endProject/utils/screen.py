@@ -0,0 +1,63 @@
+import shutil
+import sys
+from typing import List, Optional, TextIO
+from .display import ANSI_ESCAPE, visible_width
+
+# Rows kept free below the panel for the menu, prompt and messages
+MIN_SCROLL_ROWS = 12
+
+class LiveScreen:
+    """Panel pinned to the top of the terminal, repainted line by line as it changes.
+    
+    On a terminal the panel sits above a scroll region that holds menus, prompts and messages, and
+    each render rewrites, by cursor addressing, only the lines that differ from the last frame.
+    When output is not a terminal, or the panel does not fit the window, every frame is printed
+    in full as before, without colors if output is not a terminal.
+    """
+    
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream or sys.stdout
+        self.interactive = self.stream.isatty()
+        self._frame: Optional[List[str]] = None
+        self._size = None
+    
+    def render(self, lines: List[str]) -> None:
+        if not self.interactive:
+            self._write("\n".join(ANSI_ESCAPE.sub("", line) for line in lines) + "\n")
+            return
+        
+        size = shutil.get_terminal_size()
+        if len(lines) + MIN_SCROLL_ROWS > size.lines or max(map(visible_width, lines), default=0) > size.columns:
+            # Lines that scroll or wrap would leave row addressing pointing at the wrong rows
+            self.close()
+            self._write("\n".join(lines) + "\n")
+            return
+        
+        if self._frame is None or size != self._size or len(lines) != len(self._frame):
+            self._repaint(lines, size)
+        else:
+            changed = "".join(
+                f"\033[{row};1H{line}\033[K"
+                for row, (line, previous) in enumerate(zip(lines, self._frame), start=1)
+                if line != previous
+            )
+            if changed:
+                # Save the cursor, rewrite the changed rows, then go back to the prompt
+                self._write(f"\0337{changed}\0338")
+        self._frame = list(lines)
+    
+    def close(self) -> None:
+        """Give the whole window back to normal scrolling output."""
+        if self._frame is not None:
+            self._write(f"\033[r\033[{self._size.lines};1H\n")
+            self._frame = None
+    
+    def _repaint(self, lines: List[str], size) -> None:
+        # The panel's height decides where the scroll region starts, so a new height clears the screen
+        panel = "".join(f"\033[{row};1H{line}\033[K" for row, line in enumerate(lines, start=1))
+        self._write(f"\033[2J{panel}\033[{len(lines) + 1};{size.lines}r\033[{len(lines) + 1};1H")
+        self._size = size
+    
+    def _write(self, text: str) -> None:
+        self.stream.write(text)
+        self.stream.flush()